@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
      # 3rd
     "rest_framework",
     'corsheaders',
@@ -58,6 +59,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    "intercorrencias.middleware.PrazoChamadasExternasMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -103,6 +105,12 @@ DATABASES = {
     }
 }
 
+# Cache compartilhado entre workers/instâncias: guarda o L2 dos caches de tokens e
+# unidades, os token-buckets de autenticação, os locks do SingleFlight e o estado
+# dos circuit breakers. Em produção deve ser um Redis (CACHE_URL=redis://host:6379/1);
+# o padrão em memória só vale para um processo (desenvolvimento e testes).
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -165,8 +173,30 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Proxies reversos confiáveis à frente da aplicação. Com 0 o cliente é o
+    # REMOTE_ADDR; com N, o N-ésimo endereço a partir do fim do X-Forwarded-For.
+    # Nunca deixar None: o X-Forwarded-For inteiro (forjável) viraria a chave
+    # dos limites por cliente.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
+# Paginação por cursor das listagens (intercorrencias/api/pagination.py)
+INTERCORRENCIAS_PAGE_SIZE = env.int("INTERCORRENCIAS_PAGE_SIZE", default=50)
+INTERCORRENCIAS_MAX_PAGE_SIZE = env.int("INTERCORRENCIAS_MAX_PAGE_SIZE", default=200)
+
+# Candidatas a duplicata (Intercorrencia.candidatas_a_duplicata)
+INTERCORRENCIAS_DUPLICATAS_JANELA_DIAS = env.int("INTERCORRENCIAS_DUPLICATAS_JANELA_DIAS", default=3)
+INTERCORRENCIAS_DUPLICATAS_LIMITE = env.int("INTERCORRENCIAS_DUPLICATAS_LIMITE", default=10)
+
+# Exportação em CSV (intercorrencias/api/exportacao.py): linhas lidas do banco por lote
+INTERCORRENCIAS_EXPORTACAO_CHUNK_SIZE = env.int("INTERCORRENCIAS_EXPORTACAO_CHUNK_SIZE", default=2000)
+
+# Feed de alterações (intercorrencias/api/alteracoes.py): folga para transações ainda abertas
+INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS = env.int("INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS", default=30)
+
+# Criação em lote (intercorrencias/api/formulario.py): máximo de intercorrências por requisição
+INTERCORRENCIAS_LOTE_MAXIMO = env.int("INTERCORRENCIAS_LOTE_MAXIMO", default=100)
+
 # OpenAPI / Swagger
 SPECTACULAR_SETTINGS = {
     "TITLE": "API - Intercorrências Escolares",
@@ -184,7 +214,50 @@ CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 # Variáveis de ambiente (coloque em .env e leia com django-environ se quiser)
 AUTH_VERIFY_URL = os.getenv("AUTH_VERIFY_URL", "https://servico-auth/api/token/verify/")
 AUTH_ME_URL     = os.getenv("AUTH_ME_URL",     "https://servico-auth/api/me")
-UNIDADES_BASE_URL = os.getenv("UNIDADES_BASE_URL", "https://servico-auth/api/unidades") 
+UNIDADES_BASE_URL = os.getenv("UNIDADES_BASE_URL", "https://servico-auth/api/unidades")
+
+# Cache de unidades: frescas por UNIDADES_CACHE_TTL, 404 por UNIDADES_CACHE_NEGATIVE_TTL;
+# depois disso são servidas vencidas (e revalidadas) até UNIDADES_CACHE_STALE_TTL
+UNIDADES_CACHE_TTL = env.int("UNIDADES_CACHE_TTL", default=60 * 60 * 12)
+UNIDADES_CACHE_NEGATIVE_TTL = env.int("UNIDADES_CACHE_NEGATIVE_TTL", default=60 * 10)
+UNIDADES_CACHE_STALE_TTL = env.int("UNIDADES_CACHE_STALE_TTL", default=60 * 60 * 24 * 7)
+UNIDADES_CACHE_L1_TTL = env.int("UNIDADES_CACHE_L1_TTL", default=300)
+UNIDADES_CACHE_MAXSIZE = env.int("UNIDADES_CACHE_MAXSIZE", default=4096)
+# Consultas em lote: códigos fora do cache são buscados em blocos paralelos
+UNIDADES_BATCH_CHUNK_SIZE = env.int("UNIDADES_BATCH_CHUNK_SIZE", default=100)
+UNIDADES_BATCH_MAX_WORKERS = env.int("UNIDADES_BATCH_MAX_WORKERS", default=4)
+
+# Verificação do JWT: "remote" (POST em AUTH_VERIFY_URL) ou "local" (chave pública/JWKS em cache)
+AUTH_VERIFY_MODE = env("AUTH_VERIFY_MODE", default="remote")
+AUTH_JWT_ALGORITHMS = env.list("AUTH_JWT_ALGORITHMS", default=["HS256", "RS256"])
+AUTH_JWKS_URL = os.getenv("AUTH_JWKS_URL", "")
+AUTH_JWKS_REFRESH_SECONDS = env.int("AUTH_JWKS_REFRESH_SECONDS", default=300)
+AUTH_REVOCATION_URL = os.getenv("AUTH_REVOCATION_URL", "")
+AUTH_REVOCATION_REFRESH_SECONDS = env.int("AUTH_REVOCATION_REFRESH_SECONDS", default=60)
+AUTH_REMOTE_FALLBACK = env.bool("AUTH_REMOTE_FALLBACK", default=True)
+# Cache de tokens verificados: TTL = exp do token, limitado ao teto abaixo
+AUTH_TOKEN_CACHE_MAX_TTL = env.int("AUTH_TOKEN_CACHE_MAX_TTL", default=60)
+AUTH_TOKEN_CACHE_MAXSIZE = env.int("AUTH_TOKEN_CACHE_MAXSIZE", default=2048)
+# Tokens recusados ficam em cache negativo por alguns segundos
+AUTH_NEGATIVE_CACHE_TTL = env.int("AUTH_NEGATIVE_CACHE_TTL", default=30)
+# Token-bucket de verificações por cliente (rajada máxima e reposição por segundo)
+AUTH_VERIFY_RATE_BURST = env.int("AUTH_VERIFY_RATE_BURST", default=20)
+AUTH_VERIFY_RATE_PER_SECOND = env.float("AUTH_VERIFY_RATE_PER_SECOND", default=1.0)
+
+# Cliente HTTP compartilhado (intercorrencias/services/http_client.py)
+HTTP_POOL_CONNECTIONS = env.int("HTTP_POOL_CONNECTIONS", default=10)  # hosts distintos em cache
+HTTP_POOL_MAXSIZE = env.int("HTTP_POOL_MAXSIZE", default=20)  # conexões keep-alive por host
+HTTP_CONNECT_TIMEOUT = env.float("HTTP_CONNECT_TIMEOUT", default=1.0)
+HTTP_READ_TIMEOUT = env.float("HTTP_READ_TIMEOUT", default=3.0)
+HTTP_GET_RETRIES = env.int("HTTP_GET_RETRIES", default=2)
+HTTP_RETRY_BACKOFF = env.float("HTTP_RETRY_BACKOFF", default=0.2)
+HTTP_RETRY_BACKOFF_MAX = env.float("HTTP_RETRY_BACKOFF_MAX", default=1.0)
+# Orçamento de tempo (s) compartilhado por todas as chamadas externas de uma requisição
+OUTBOUND_REQUEST_BUDGET = env.float("OUTBOUND_REQUEST_BUDGET", default=5.0)
+# Circuit breaker dos serviços externos (estado compartilhado via cache)
+CIRCUIT_BREAKER_FAILURES = env.int("CIRCUIT_BREAKER_FAILURES", default=5)
+CIRCUIT_BREAKER_WINDOW = env.int("CIRCUIT_BREAKER_WINDOW", default=30)
+CIRCUIT_BREAKER_OPEN_SECONDS = env.int("CIRCUIT_BREAKER_OPEN_SECONDS", default=30)
 
 ADMIN_URL = env("DJANGO_ADMIN_URL", default="api-intercorrencias/v1/admin/")
 
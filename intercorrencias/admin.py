@@ -4,6 +4,7 @@ from .models.declarante import Declarante
 from .models.envolvido import Envolvido
 from .models.intercorrencia import Intercorrencia
 from .models.tipos_ocorrencia import TipoOcorrencia
+from .models.unidade import Unidade
 from django import forms
 
 from intercorrencias.choices.info_agressor_choices import (
@@ -106,4 +107,11 @@ class DeclaranteAdmin(admin.ModelAdmin):
 class EnvolvidoAdmin(admin.ModelAdmin):
     list_display = ("perfil_dos_envolvidos", "ativo")
     search_fields = ("perfil_dos_envolvidos",)
-    list_filter = ("ativo",)
\ No newline at end of file
+    list_filter = ("ativo",)
+
+@admin.register(Unidade)
+class UnidadeAdmin(admin.ModelAdmin):
+    list_display = ("codigo_eol", "nome", "dre_codigo_eol", "tipo", "atualizado_em")
+    search_fields = ("codigo_eol", "nome")
+    list_filter = ("tipo", "dre_codigo_eol")
+    readonly_fields = ("uuid", "criado_em", "atualizado_em")
@@ -0,0 +1,145 @@
+import base64
+import heapq
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from intercorrencias.api.exportacao import em_lotes
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.saida_de_escopo import SaidaDeEscopo
+
+CONTENT_TYPE = "application/x-ndjson"
+
+# Colunas do registro completo; a busca textual é derivada das narrativas
+CAMPOS = tuple(campo.attname for campo in Intercorrencia._meta.concrete_fields if campo.name != "busca_texto")
+
+# Marcas do cursor: "i" para intercorrências (atualizado_em, id), "s" para saídas de escopo (registrado_em, id)
+MARCAS = ("i", "s")
+
+
+def codificar_cursor(posicao: dict) -> str:
+    marcas = {
+        chave: [momento.isoformat(), pk] if momento is not None else None
+        for chave, (momento, pk) in posicao.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(marcas).encode()).decode()
+
+
+def decodificar_cursor(cursor: str) -> dict:
+    try:
+        marcas = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return {
+            chave: (datetime.fromisoformat(marcas[chave][0]), int(marcas[chave][1])) if marcas[chave] else (None, 0)
+            for chave in MARCAS
+        }
+    except (TypeError, ValueError, KeyError, IndexError, UnicodeDecodeError):
+        raise ValidationError({"detail": "Cursor inválido."})
+
+
+def posicao_inicial(params) -> dict:
+    """
+    Ponto de partida do feed: `cursor` (devolvido em cada linha) retoma de onde
+    parou; `desde` (data e hora ISO) lê o que mudou depois desse instante; sem
+    nenhum dos dois, o feed começa do primeiro registro (carga completa).
+    """
+    cursor = params.get("cursor")
+    if cursor:
+        return decodificar_cursor(cursor)
+
+    desde = params.get("desde")
+    if not desde:
+        return {chave: (None, 0) for chave in MARCAS}
+    try:
+        momento = parse_datetime(desde)
+    except ValueError:
+        momento = None
+    if momento is None:
+        raise ValidationError({"detail": "desde deve ser uma data e hora ISO."})
+    if timezone.is_naive(momento):
+        momento = timezone.make_aware(momento)
+    return {chave: (momento, 0) for chave in MARCAS}
+
+
+def _depois(campo_momento: str, marca) -> Q:
+    momento, pk = marca
+    if momento is None:
+        return Q()
+    return Q(**{f"{campo_momento}__gt": momento}) | Q(**{campo_momento: momento, "id__gt": pk})
+
+
+def _tipos_por_intercorrencia(ids) -> dict[int, list[str]]:
+    through = Intercorrencia.tipos_ocorrencia.through
+    consulta = through.objects.filter(intercorrencia_id__in=ids).values_list("intercorrencia_id", "tipoocorrencia__uuid")
+    tipos = defaultdict(list)
+    for intercorrencia_id, uuid in consulta:
+        tipos[intercorrencia_id].append(str(uuid))
+    return tipos
+
+
+def _eventos_de_intercorrencias(queryset, chunk_size):
+    linhas = queryset.values(*CAMPOS).iterator(chunk_size=chunk_size)
+    for lote in em_lotes(linhas, chunk_size):
+        tipos = _tipos_por_intercorrencia([linha["id"] for linha in lote])
+        for linha in lote:
+            linha["tipos_ocorrencia"] = tipos.get(linha["id"], [])
+            yield linha["atualizado_em"], "i", linha["id"], {"tipo": "intercorrencia", "dados": linha}
+
+
+def _eventos_de_saidas(queryset, chunk_size):
+    linhas = queryset.values("id", "intercorrencia_uuid", "motivo", "registrado_em").iterator(chunk_size=chunk_size)
+    for linha in linhas:
+        yield linha["registrado_em"], "s", linha["id"], {
+            "tipo": "saida_de_escopo",
+            "uuid": linha["intercorrencia_uuid"],
+            "motivo": linha["motivo"],
+            "registrado_em": linha["registrado_em"],
+        }
+
+
+def linhas_ndjson(intercorrencias, saidas, posicao: dict, chunk_size: int | None = None):
+    """
+    Gera o feed em NDJSON, um registro por linha, em ordem de (momento, id):
+    intercorrências por atualizado_em e saídas de escopo por registrado_em,
+    intercaladas para que uma saída nunca apareça antes da alteração que a
+    precede. Cada linha traz o `cursor` para retomar logo depois dela.
+
+    Só entram registros com mais de INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS:
+    uma transação ainda aberta pode gravar um atualizado_em anterior à marca
+    já entregue e, sem a folga, essa alteração seria pulada.
+    """
+    chunk_size = chunk_size or settings.INTERCORRENCIAS_EXPORTACAO_CHUNK_SIZE
+    limite = timezone.now() - timedelta(seconds=settings.INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS)
+    posicao = dict(posicao)
+
+    intercorrencias = (
+        intercorrencias.filter(_depois("atualizado_em", posicao["i"]), atualizado_em__lte=limite)
+        .order_by("atualizado_em", "id")
+    )
+    saidas = (
+        saidas.filter(_depois("registrado_em", posicao["s"]), registrado_em__lte=limite)
+        .order_by("registrado_em", "id")
+    )
+
+    eventos = heapq.merge(
+        _eventos_de_intercorrencias(intercorrencias, chunk_size),
+        _eventos_de_saidas(saidas, chunk_size),
+        key=lambda evento: evento[0],
+    )
+    for momento, marca, pk, registro in eventos:
+        posicao[marca] = (momento, pk)
+        registro["cursor"] = codificar_cursor(posicao)
+        yield json.dumps(registro, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def resposta_ndjson(intercorrencias, saidas, params) -> StreamingHttpResponse:
+    """Valida o ponto de partida antes de abrir o streaming (erros viram 400, não um corpo truncado)."""
+    posicao = posicao_inicial(params)
+    return StreamingHttpResponse(linhas_ndjson(intercorrencias, saidas, posicao), content_type=CONTENT_TYPE)
@@ -0,0 +1,117 @@
+import csv
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.services import unidades_service
+from intercorrencias.services.unidades_loader import UnidadesLoader
+
+# (coluna lida do banco, cabeçalho do arquivo); nomes de unidade/DRE e tipos são completados por lote
+COLUNAS = (
+    ("protocolo_da_intercorrencia", "Protocolo"),
+    ("status", "Status"),
+    ("data_ocorrencia", "Data da ocorrência"),
+    ("unidade_codigo_eol", "Código EOL da unidade"),
+    ("nome_unidade", "Unidade"),
+    ("dre_codigo_eol", "Código EOL da DRE"),
+    ("nome_dre", "DRE"),
+    ("tipos_ocorrencia", "Tipos de ocorrência"),
+    ("sobre_furto_roubo_invasao_depredacao", "Furto, roubo, invasão ou depredação"),
+    ("descricao_ocorrencia", "Descrição da ocorrência"),
+    ("user_username", "Registrado por"),
+    ("criado_em", "Criado em"),
+    ("atualizado_em", "Atualizado em"),
+)
+CAMPOS_DO_BANCO = ("id",) + tuple(
+    campo for campo, _ in COLUNAS if campo not in ("nome_unidade", "nome_dre", "tipos_ocorrencia")
+)
+
+_STATUS = dict(Intercorrencia.STATUS_CHOICES)
+
+
+class _Eco:
+    """Pseudo-arquivo para o csv.writer: devolve a linha formatada em vez de gravá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def em_lotes(linhas, tamanho):
+    while lote := list(islice(linhas, tamanho)):
+        yield lote
+
+
+def _tipos_por_intercorrencia(ids) -> dict[int, list[str]]:
+    through = Intercorrencia.tipos_ocorrencia.through
+    consulta = (
+        through.objects.filter(intercorrencia_id__in=ids)
+        .order_by("tipoocorrencia__nome")
+        .values_list("intercorrencia_id", "tipoocorrencia__nome")
+    )
+    tipos = defaultdict(list)
+    for intercorrencia_id, nome in consulta:
+        tipos[intercorrencia_id].append(nome)
+    return tipos
+
+
+def _nomes_de_unidades(lote) -> dict[str, str | None]:
+    # Loader novo a cada lote: a memória não cresce com o tamanho da exportação
+    codigos = {codigo for linha in lote for codigo in (linha["unidade_codigo_eol"], linha["dre_codigo_eol"]) if codigo}
+    loader = UnidadesLoader()
+    loader.registrar(*codigos)
+    try:
+        loader.carregar()
+    except unidades_service.ExternalServiceError:
+        return {}  # os nomes ficam em branco
+    return {codigo: (loader.get(codigo) or {}).get("nome") for codigo in codigos}
+
+
+def _formatar(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return "Sim" if valor else "Não"
+    if hasattr(valor, "isoformat"):
+        return timezone.localtime(valor).strftime("%d/%m/%Y %H:%M")
+    return valor
+
+
+def linhas_csv(queryset, chunk_size: int | None = None):
+    """
+    Gera o CSV linha a linha. As intercorrências são lidas com `.iterator()`
+    (cursor no servidor) em lotes de INTERCORRENCIAS_EXPORTACAO_CHUNK_SIZE;
+    para cada lote, tipos de ocorrência e nomes de unidade/DRE vêm em uma
+    consulta e um lote do serviço de unidades.
+    """
+    chunk_size = chunk_size or settings.INTERCORRENCIAS_EXPORTACAO_CHUNK_SIZE
+    writer = csv.writer(_Eco(), delimiter=";")
+
+    # BOM: o Excel abre o arquivo como UTF-8 (acentos)
+    yield "\ufeff" + writer.writerow([titulo for _, titulo in COLUNAS])
+
+    linhas = (
+        queryset.order_by("-criado_em", "-id")
+        .values(*CAMPOS_DO_BANCO)
+        .iterator(chunk_size=chunk_size)
+    )
+    for lote in em_lotes(linhas, chunk_size):
+        tipos = _tipos_por_intercorrencia([linha["id"] for linha in lote])
+        unidades = _nomes_de_unidades(lote)
+        for linha in lote:
+            linha["status"] = _STATUS.get(linha["status"], linha["status"])
+            linha["nome_unidade"] = unidades.get(linha["unidade_codigo_eol"])
+            linha["nome_dre"] = unidades.get(linha["dre_codigo_eol"])
+            linha["tipos_ocorrencia"] = ", ".join(tipos.get(linha["id"], []))
+            yield writer.writerow([_formatar(linha[campo]) for campo, _ in COLUNAS])
+
+
+def resposta_csv(queryset, prefixo: str = "intercorrencias") -> StreamingHttpResponse:
+    """Resposta em streaming: o arquivo é enviado à medida que os lotes são lidos."""
+    nome_arquivo = f"{prefixo}-{timezone.localdate():%Y%m%d}.csv"
+    response = StreamingHttpResponse(linhas_csv(queryset), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}"'
+    return response
@@ -0,0 +1,140 @@
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.choices.info_agressor_choices import MotivoOcorrencia
+
+
+class IntercorrenciaFiltroBackend(BaseFilterBackend):
+    """
+    Filtros das listagens de intercorrências (diretor, DRE e GIPE), aplicados
+    no banco e só nas ações de ACOES (listagem e exportação). Parâmetros repetíveis combinam em OU; filtros
+    diferentes combinam em E.
+
+    - status: um ou mais valores de STATUS_CHOICES
+    - data_ocorrencia_inicio / data_ocorrencia_fim: data (AAAA-MM-DD, fim inclusivo) ou data e hora ISO
+    - unidade_codigo_eol: um ou mais códigos EOL
+    - tipos_ocorrencia: UUIDs; basta um deles estar na intercorrência
+    - sobre_furto_roubo_invasao_depredacao: true/false
+    - motivacao_ocorrencia: valores de MotivoOcorrencia; basta um deles estar presente
+    - search: busca textual em português nas narrativas (`busca_texto`), com a
+      sintaxe de buscador (aspas, "or", "-termo"); os resultados passam a vir
+      ordenados por relevância (anotação RELEVANCIA, usada pela paginação)
+
+    Cada filtro tem índice correspondente (ver `Intercorrencia.Meta.indexes`).
+    """
+
+    RELEVANCIA = "relevancia"
+    ACOES = ("list", "exportar")
+
+    VERDADEIROS = {"true", "1"}
+    FALSOS = {"false", "0"}
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) not in self.ACOES:
+            return queryset
+
+        params = request.query_params
+
+        status = params.getlist("status")
+        if status:
+            self._validar_escolhas("Status", status, {valor for valor, _ in Intercorrencia.STATUS_CHOICES})
+            queryset = queryset.filter(status__in=status)
+
+        inicio = params.get("data_ocorrencia_inicio")
+        if inicio:
+            data_hora, _ = self._data_hora(inicio, "data_ocorrencia_inicio")
+            queryset = queryset.filter(data_ocorrencia__gte=data_hora)
+
+        fim = params.get("data_ocorrencia_fim")
+        if fim:
+            data_hora, so_data = self._data_hora(fim, "data_ocorrencia_fim")
+            if so_data:
+                # Data sem hora: inclui o dia inteiro, sem aplicar função sobre a coluna
+                queryset = queryset.filter(data_ocorrencia__lt=data_hora + timedelta(days=1))
+            else:
+                queryset = queryset.filter(data_ocorrencia__lte=data_hora)
+
+        unidades = params.getlist("unidade_codigo_eol")
+        if unidades:
+            queryset = queryset.filter(unidade_codigo_eol__in=unidades)
+
+        tipos = params.getlist("tipos_ocorrencia")
+        if tipos:
+            try:
+                tipos = [uuid.UUID(tipo) for tipo in tipos]
+            except ValueError:
+                raise ValidationError({"detail": "tipos_ocorrencia deve conter UUIDs válidos."})
+            # Semi-join pela tabela intermediária: não duplica linhas
+            through = Intercorrencia.tipos_ocorrencia.through
+            com_tipo = through.objects.filter(tipoocorrencia__uuid__in=tipos).values("intercorrencia_id")
+            queryset = queryset.filter(pk__in=com_tipo)
+
+        furto_roubo = params.get("sobre_furto_roubo_invasao_depredacao")
+        if furto_roubo:
+            valor = furto_roubo.lower()
+            if valor not in self.VERDADEIROS | self.FALSOS:
+                raise ValidationError({"detail": "sobre_furto_roubo_invasao_depredacao deve ser true ou false."})
+            queryset = queryset.filter(sobre_furto_roubo_invasao_depredacao=valor in self.VERDADEIROS)
+
+        motivacoes = params.getlist("motivacao_ocorrencia")
+        if motivacoes:
+            self._validar_escolhas("Motivação", motivacoes, set(MotivoOcorrencia.values))
+            queryset = queryset.filter(motivacao_ocorrencia__overlap=motivacoes)
+
+        termos = params.get("search", "").strip()
+        if termos:
+            consulta = SearchQuery(termos, config="portuguese", search_type="websearch")
+            # ts_rank devolve real (float4): convertido para float8, o valor guardado
+            # no cursor é exatamente o comparado na página seguinte
+            queryset = queryset.filter(busca_texto=consulta).annotate(
+                **{self.RELEVANCIA: Cast(SearchRank(F("busca_texto"), consulta), FloatField())}
+            )
+
+        return queryset
+
+    def _validar_escolhas(self, rotulo: str, valores: list[str], validos: set[str]):
+        invalidos = sorted(set(valores) - validos)
+        if invalidos:
+            raise ValidationError({"detail": f"{rotulo} inválido: {', '.join(invalidos)}."})
+
+    def _data_hora(self, valor: str, parametro: str) -> tuple[datetime, bool]:
+        """Converte o parâmetro em datetime aware; o bool indica se veio só a data."""
+        try:
+            # parse_datetime também aceita "AAAA-MM-DD": a data pura é testada antes
+            data = parse_date(valor)
+            if data is not None:
+                data_hora, so_data = datetime.combine(data, time.min), True
+            else:
+                data_hora, so_data = parse_datetime(valor), False
+        except ValueError:
+            data_hora = None
+        if data_hora is None:
+            raise ValidationError({"detail": f"{parametro} deve ser uma data (AAAA-MM-DD) ou data e hora ISO."})
+        if timezone.is_naive(data_hora):
+            data_hora = timezone.make_aware(data_hora)
+        return data_hora, so_data
+
+    def get_schema_operation_parameters(self, view):
+        def parametro(nome, descricao, schema):
+            return {"name": nome, "required": False, "in": "query", "description": descricao, "schema": schema}
+
+        texto = {"type": "string"}
+        return [
+            parametro("status", "Status (pode repetir).", {"type": "string", "enum": [v for v, _ in Intercorrencia.STATUS_CHOICES]}),
+            parametro("data_ocorrencia_inicio", "Ocorridas a partir desta data/hora.", texto),
+            parametro("data_ocorrencia_fim", "Ocorridas até esta data (inclusive) ou data/hora.", texto),
+            parametro("unidade_codigo_eol", "Código EOL da unidade (pode repetir).", texto),
+            parametro("tipos_ocorrencia", "UUID do tipo de ocorrência (pode repetir).", {"type": "string", "format": "uuid"}),
+            parametro("sobre_furto_roubo_invasao_depredacao", "Furto/roubo/invasão/depredação.", {"type": "boolean"}),
+            parametro("motivacao_ocorrencia", "Motivação (pode repetir).", {"type": "string", "enum": list(MotivoOcorrencia.values)}),
+            parametro("search", "Busca textual nas narrativas; resultados ordenados por relevância.", texto),
+        ]
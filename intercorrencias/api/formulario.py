@@ -0,0 +1,195 @@
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from intercorrencias.models.declarante import Declarante
+from intercorrencias.models.envolvido import Envolvido
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.tipos_ocorrencia import TipoOcorrencia
+from intercorrencias.services import unidades_service
+from intercorrencias.services.unidades_loader import get_loader
+from intercorrencias.api.serializers.intercorrencia_serializer import (
+    OBJETOS_POR_UUID,
+    IntercorrenciaSecaoInicialSerializer,
+    IntercorrenciaFurtoRouboSerializer,
+    IntercorrenciaNaoFurtoRouboSerializer,
+    IntercorrenciaSecaoFinalSerializer,
+    IntercorrenciaInfoAgressorSerializer,
+    IntercorrenciaConclusaoDaUeSerializer,
+)
+
+# Campos do formulário que referenciam outros modelos pelo uuid
+CAMPOS_RELACIONADOS = {
+    "tipos_ocorrencia": TipoOcorrencia,
+    "declarante": Declarante,
+    "envolvido": Envolvido,
+}
+
+
+def _mensagem(exc: ValidationError):
+    detalhe = exc.detail
+    if isinstance(detalhe, dict) and "detail" in detalhe:
+        return detalhe["detail"]
+    return detalhe
+
+
+def validar_formulario(dados: dict, context: dict, instance=None, enviar_para_dre=False) -> dict:
+    """
+    Valida o formulário completo com os serializers de cada seção, na ordem do
+    fluxo do diretor: seção inicial, furto/roubo ou não furto/roubo, seção
+    final, informações do agressor/vítima (quando houver) e, com
+    `enviar_para_dre`, a conclusão da UE. Devolve os dados validados de todas
+    as seções, já com as regras de limpeza aplicadas.
+
+    Numa intercorrência existente, o tipo (furto/roubo ou não) informado no
+    formulário é aplicado à instância antes das seções seguintes, que o conferem.
+    """
+    validados = {}
+
+    def _secao(serializer_class):
+        serializer = serializer_class(instance, data=dados, context=context)
+        serializer.is_valid(raise_exception=True)
+        validados.update(serializer.validated_data)
+        return serializer
+
+    inicial = _secao(IntercorrenciaSecaoInicialSerializer)
+    sobre_furto_roubo = validados.get("sobre_furto_roubo_invasao_depredacao", False)
+    if instance is not None:
+        instance.sobre_furto_roubo_invasao_depredacao = sobre_furto_roubo
+
+    if sobre_furto_roubo:
+        _secao(IntercorrenciaFurtoRouboSerializer)
+    else:
+        _secao(IntercorrenciaNaoFurtoRouboSerializer)
+    _secao(IntercorrenciaSecaoFinalSerializer)
+    if not sobre_furto_roubo and validados["tem_info_agressor_ou_vitima"] == "sim":
+        _secao(IntercorrenciaInfoAgressorSerializer)
+    if enviar_para_dre:
+        _secao(IntercorrenciaConclusaoDaUeSerializer)
+
+    return inicial._aplicar_regras_de_limpeza(instance or Intercorrencia(), validados, sobre_furto_roubo)
+
+
+def gravar_formulario(dados, request, instance=None, enviar_para_dre=False) -> Intercorrencia:
+    """
+    Grava o formulário completo do diretor de uma vez: valida todas as seções
+    (validar_formulario), grava numa única instrução (INSERT, ou UPDATE só com
+    as colunas alteradas) junto dos tipos de ocorrência e, com
+    `enviar_para_dre`, conclui e envia para a DRE — tudo na mesma transação.
+    """
+    dados = dados.copy()
+    if instance is None:
+        dados["unidade_codigo_eol"] = request.user.unidade_codigo_eol
+    else:
+        dados["unidade_codigo_eol"] = instance.unidade_codigo_eol
+        dados.setdefault("dre_codigo_eol", instance.dre_codigo_eol)
+
+    # Unidade e DRE num único lote: servem à validação e aos nomes da resposta
+    context = {"request": request}
+    get_loader(context).registrar(dados["unidade_codigo_eol"], dados.get("dre_codigo_eol"))
+    validados = validar_formulario(dados, context, instance, enviar_para_dre)
+    tipos = validados.pop("tipos_ocorrencia")
+
+    if instance is None:
+        instance = Intercorrencia(user_username=request.user.username, status="em_preenchimento_diretor")
+    for campo, valor in validados.items():
+        setattr(instance, campo, valor)
+
+    with transaction.atomic():
+        if enviar_para_dre:
+            instance.status = "enviado_para_dre"
+            instance.finalizado_diretor_em = timezone.now()
+            instance.finalizado_diretor_por = request.user.username
+            # Número reservado na mesma transação, relendo a linha bloqueada (como em enviar-para-dre)
+            protocolo_atual = None
+            if instance.pk:
+                protocolo_atual = (
+                    Intercorrencia.objects.select_for_update()
+                    .filter(pk=instance.pk)
+                    .values_list("protocolo_da_intercorrencia", flat=True)
+                    .get()
+                )
+            instance.protocolo_da_intercorrencia = protocolo_atual or Intercorrencia.gerar_protocolo()
+        instance.save()
+        instance.tipos_ocorrencia.set(tipos)
+    return instance
+
+
+def _uuids(valores):
+    for valor in valores:
+        try:
+            yield uuid.UUID(str(valor))
+        except ValueError:
+            continue  # o campo acusa o valor inválido na validação do item
+
+
+def _objetos_por_uuid(itens) -> dict:
+    """Uma consulta por modelo para os uuids referenciados em todos os itens."""
+    objetos = {}
+    for campo, modelo in CAMPOS_RELACIONADOS.items():
+        valores = []
+        for item in itens:
+            valor = item.get(campo)
+            valores.extend(valor if isinstance(valor, list) else [valor])
+        uuids = set(_uuids(valor for valor in valores if valor))
+        objetos[modelo] = {obj.uuid: obj for obj in modelo.objects.filter(uuid__in=uuids)}
+    return objetos
+
+
+def criar_em_lote(itens: list, request):
+    """
+    Cria várias intercorrências completas (registros feitos offline ou em papel)
+    na unidade do usuário. Os itens são validados juntos: as unidades/DREs vão
+    ao serviço de Unidades num único lote e tipos de ocorrência, declarantes e
+    envolvidos são buscados numa consulta por modelo. Os válidos são gravados
+    com um `bulk_create` e uma inserção em lote na tabela de tipos (M2M).
+
+    Devolve (criadas, erros): [(índice, intercorrência)] e [{"indice", "detail"}];
+    um item inválido não impede a gravação dos demais.
+    """
+    unidade = request.user.unidade_codigo_eol
+    validos = {
+        indice: {**item, "unidade_codigo_eol": unidade}
+        for indice, item in enumerate(itens)
+        if isinstance(item, dict)
+    }
+    context = {"request": request, OBJETOS_POR_UUID: _objetos_por_uuid(validos.values())}
+
+    unidades = get_loader(context)
+    unidades.registrar(unidade, *(item.get("dre_codigo_eol") for item in validos.values()))
+    try:
+        unidades.carregar()
+    except unidades_service.ExternalServiceError:
+        pass  # a falha fica memorizada no loader e cada item a recebe na validação
+
+    novas, erros = [], []
+    for indice in range(len(itens)):
+        if indice not in validos:
+            erros.append({"indice": indice, "detail": "Cada intercorrência deve ser um objeto."})
+            continue
+        try:
+            dados = validar_formulario(validos[indice], context)
+        except ValidationError as exc:
+            erros.append({"indice": indice, "detail": _mensagem(exc)})
+            continue
+
+        tipos = {tipo.pk for tipo in dados.pop("tipos_ocorrencia")}
+        intercorrencia = Intercorrencia(
+            **dados,
+            user_username=request.user.username,
+            status="em_preenchimento_diretor",
+        )
+        novas.append((indice, intercorrencia, tipos))
+
+    through = Intercorrencia.tipos_ocorrencia.through
+    with transaction.atomic():
+        Intercorrencia.objects.bulk_create([intercorrencia for _, intercorrencia, _ in novas])
+        through.objects.bulk_create([
+            through(intercorrencia_id=intercorrencia.pk, tipoocorrencia_id=tipo)
+            for _, intercorrencia, tipos in novas
+            for tipo in tipos
+        ])
+
+    return [(indice, intercorrencia) for indice, intercorrencia, _ in novas], erros
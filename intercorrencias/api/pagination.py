@@ -0,0 +1,160 @@
+import json
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+
+
+class IntercorrenciaCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre (criado_em, id), na mesma ordem do
+    `Meta.ordering` do modelo: mais recentes primeiro.
+
+    Cada página é um `WHERE (criado_em, id) < (cursor)` + `LIMIT`, atendido
+    pelos índices compostos (..., criado_em DESC, id DESC); o custo não depende
+    da profundidade da página. O tamanho vem de INTERCORRENCIAS_PAGE_SIZE e
+    pode ser alterado por `?page_size=` até INTERCORRENCIAS_MAX_PAGE_SIZE.
+
+    Com `?search=`, a ordenação (e o cursor) passa a ser (relevância, criado_em, id).
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Cursor inválido."
+
+    def get_page_size(self, request) -> int:
+        padrao = settings.INTERCORRENCIAS_PAGE_SIZE
+        try:
+            pedido = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return padrao
+        if pedido <= 0:
+            return padrao
+        return min(pedido, settings.INTERCORRENCIAS_MAX_PAGE_SIZE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self._decodificar(request.query_params.get(self.cursor_query_param))
+        campos = self._campos(queryset)
+        self._campos_cursor = campos
+
+        if cursor is None:
+            retrocede = False
+            qs = queryset.order_by(*[f"-{campo}" for campo in campos])
+        else:
+            valores, retrocede = cursor
+            if len(valores) != len(campos):
+                raise NotFound(self.invalid_cursor_message)
+            if retrocede:
+                qs = queryset.order_by(*campos).filter(self._apos(campos, valores, "gt"))
+            else:
+                qs = queryset.order_by(*[f"-{campo}" for campo in campos]).filter(self._apos(campos, valores, "lt"))
+
+        # Um registro a mais indica se existe página seguinte nessa direção
+        registros = list(qs[:page_size + 1])
+        ha_mais = len(registros) > page_size
+        registros = registros[:page_size]
+        if retrocede:
+            registros.reverse()
+
+        primeiro = registros[0] if registros else None
+        ultimo = registros[-1] if registros else None
+        if retrocede:
+            self._proximo = ultimo if cursor is not None and ultimo else None
+            self._anterior = primeiro if ha_mais else None
+        else:
+            self._proximo = ultimo if ha_mais else None
+            self._anterior = primeiro if cursor is not None and primeiro else None
+
+        return registros
+
+    def get_next_link(self):
+        if self._proximo is None:
+            return None
+        return self._link(self._proximo, retrocede=False)
+
+    def get_previous_link(self):
+        if self._anterior is None:
+            return None
+        return self._link(self._anterior, retrocede=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor de paginação (valor de `next`/`previous`).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Quantidade de registros por página.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def _campos(self, queryset) -> tuple[str, ...]:
+        # Com busca textual, a relevância vem antes de (criado_em, id) na ordenação
+        if IntercorrenciaFiltroBackend.RELEVANCIA in queryset.query.annotations:
+            return (IntercorrenciaFiltroBackend.RELEVANCIA, "criado_em", "id")
+        return ("criado_em", "id")
+
+    def _apos(self, campos, valores, lookup: str) -> Q:
+        """
+        Condição de keyset (a, b, c) < (x, y, z) expandida em
+        a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z), mais o limite
+        redundante a <= x, que deixa o índice restringir a faixa varrida.
+        """
+        condicao, iguais = Q(), {}
+        for campo, valor in zip(campos, valores):
+            condicao |= Q(**iguais, **{f"{campo}__{lookup}": valor})
+            iguais[campo] = valor
+        return condicao & Q(**{f"{campos[0]}__{lookup}e": valores[0]})
+
+    def _link(self, obj, retrocede: bool) -> str:
+        # Aceita instâncias e linhas de `.values()` (listagens compactas)
+        valores = [obj[campo] if isinstance(obj, dict) else getattr(obj, campo) for campo in self._campos_cursor]
+        posicao = {"v": [valor.isoformat() if isinstance(valor, datetime) else valor for valor in valores], "r": int(retrocede)}
+        cursor = base64.urlsafe_b64encode(json.dumps(posicao).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def _decodificar(self, cursor: str | None):
+        if not cursor:
+            return None
+        try:
+            posicao = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            *anteriores, criado_em, pk = posicao["v"]
+            valores = [float(v) for v in anteriores] + [datetime.fromisoformat(criado_em), int(pk)]
+            return valores, bool(posicao.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
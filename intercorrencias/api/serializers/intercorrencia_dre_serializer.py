@@ -2,6 +2,7 @@ import logging
 from rest_framework import serializers
 
 from intercorrencias.services import unidades_service
+from intercorrencias.services.unidades_loader import get_loader
 from intercorrencias.models.intercorrencia import Intercorrencia
 from intercorrencias.api.serializers.intercorrencia_serializer import IntercorrenciaSerializer
 
@@ -89,10 +90,12 @@ class IntercorrenciaConclusaoDaDreSerializer(IntercorrenciaSerializer):
     responsavel_cpf = serializers.SerializerMethodField()
     responsavel_email = serializers.SerializerMethodField()
 
+    campos_unidade_exibidos = ("dre_codigo_eol",)
+
     def get_nome_dre(self, obj):
-        """Obtém o nome da DRE via serviço externo."""
+        """Obtém o nome da DRE via loader de unidades da requisição."""
         try:
-            dre = unidades_service.get_unidade(obj.dre_codigo_eol)
+            dre = get_loader(self.context).get(obj.dre_codigo_eol)
             return dre.get("nome")
         except unidades_service.ExternalServiceError:
             return None
@@ -0,0 +1,114 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from intercorrencias.services import unidades_service
+from intercorrencias.services.unidades_loader import get_loader
+from intercorrencias.models.intercorrencia import Intercorrencia
+
+
+class IntercorrenciaListagemListSerializer(serializers.ListSerializer):
+    """
+    Completa a página de uma vez: tipos de ocorrência numa única consulta
+    à tabela intermediária e nomes de unidade/DRE num único lote do loader.
+    """
+
+    def to_representation(self, data):
+        linhas = list(data)
+
+        tipos = defaultdict(list)
+        ids = [linha["id"] for linha in linhas]
+        if ids:
+            through = Intercorrencia.tipos_ocorrencia.through
+            consulta = (
+                through.objects.filter(intercorrencia_id__in=ids)
+                .order_by("tipoocorrencia__nome")
+                .values_list("intercorrencia_id", "tipoocorrencia__uuid", "tipoocorrencia__nome")
+            )
+            for intercorrencia_id, uuid, nome in consulta:
+                tipos[intercorrencia_id].append({"uuid": str(uuid), "nome": nome})
+
+        unidades = get_loader(self.context)
+        for linha in linhas:
+            unidades.registrar(linha["unidade_codigo_eol"], linha["dre_codigo_eol"])
+            linha["tipos_ocorrencia"] = tipos.get(linha["id"], [])
+        try:
+            unidades.carregar()
+        except unidades_service.ExternalServiceError:
+            pass  # os nomes ficam None
+
+        return [self.child.to_representation(linha) for linha in linhas]
+
+
+class IntercorrenciaListagemSerializer(serializers.BaseSerializer):
+    """
+    Representação compacta das listagens (diretor, DRE e GIPE).
+
+    Trabalha sobre as linhas de `.values(*CAMPOS)` e monta o dicionário
+    diretamente, sem um campo DRF por coluna. O detalhe continua com os
+    serializers completos de cada perfil.
+    """
+
+    CAMPOS = (
+        "id",
+        "uuid",
+        "protocolo_da_intercorrencia",
+        "status",
+        "data_ocorrencia",
+        "unidade_codigo_eol",
+        "dre_codigo_eol",
+        "sobre_furto_roubo_invasao_depredacao",
+        "user_username",
+        "criado_em",
+        "atualizado_em",
+    )
+
+    _status_display = dict(Intercorrencia.STATUS_CHOICES)
+    _data_hora = serializers.DateTimeField()
+
+    class Meta:
+        list_serializer_class = IntercorrenciaListagemListSerializer
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs["child"] = cls(context=kwargs.get("context", {}))
+        return cls.Meta.list_serializer_class(*args, **kwargs)
+
+    def _nome(self, codigo):
+        if not codigo:
+            return None
+        try:
+            return (get_loader(self.context).get(codigo) or {}).get("nome")
+        except unidades_service.ExternalServiceError:
+            return None
+
+    def to_representation(self, linha):
+        status = linha["status"]
+        data_hora = self._data_hora.to_representation
+        return {
+            "id": linha["id"],
+            "uuid": str(linha["uuid"]),
+            "protocolo_da_intercorrencia": linha["protocolo_da_intercorrencia"],
+            "status": status,
+            "status_display": self._status_display.get(status, status),
+            "status_extra": Intercorrencia.STATUS_EXTRA_LABELS.get(status),
+            "data_ocorrencia": data_hora(linha["data_ocorrencia"]) if linha["data_ocorrencia"] else None,
+            "unidade_codigo_eol": linha["unidade_codigo_eol"],
+            "nome_unidade": self._nome(linha["unidade_codigo_eol"]),
+            "dre_codigo_eol": linha["dre_codigo_eol"],
+            "nome_dre": self._nome(linha["dre_codigo_eol"]),
+            "sobre_furto_roubo_invasao_depredacao": linha["sobre_furto_roubo_invasao_depredacao"],
+            "tipos_ocorrencia": linha.get("tipos_ocorrencia", []),
+            "user_username": linha["user_username"],
+            "criado_em": data_hora(linha["criado_em"]),
+            "atualizado_em": data_hora(linha["atualizado_em"]),
+        }
+
+
+class IntercorrenciaDuplicataSerializer(IntercorrenciaListagemSerializer):
+    """Representação compacta acrescida da `similaridade` (0 a 1) com a intercorrência consultada."""
+
+    CAMPOS = IntercorrenciaListagemSerializer.CAMPOS + ("similaridade",)
+
+    def to_representation(self, linha):
+        return {**super().to_representation(linha), "similaridade": round(linha["similaridade"], 3)}
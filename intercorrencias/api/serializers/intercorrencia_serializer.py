@@ -1,4 +1,9 @@
+import uuid
+
+from django.db import transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.utils import model_meta
 
 from config.settings import (
     CODIGO_PERFIL_DIRETOR,
@@ -7,6 +12,7 @@ from config.settings import (
     CODIGO_PERFIL_GIPE,
 )
 from intercorrencias.services import unidades_service
+from intercorrencias.services.unidades_loader import get_loader
 from intercorrencias.models.envolvido import Envolvido
 from intercorrencias.models.declarante import Declarante
 from intercorrencias.models.intercorrencia import Intercorrencia
@@ -28,11 +34,42 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Chave do contexto com objetos já buscados ({modelo: {uuid: objeto}}), preenchida no envio em lote
+OBJETOS_POR_UUID = "objetos_por_uuid"
+
+
+class RelacionadoPorUuidField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField por `uuid`. Quando o contexto traz os objetos do modelo já
+    carregados (OBJETOS_POR_UUID), resolve a partir deles, sem consulta por item.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("slug_field", "uuid")
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        carregados = self.context.get(OBJETOS_POR_UUID, {}).get(self.get_queryset().model)
+        if carregados is None:
+            return super().to_internal_value(data)
+        try:
+            chave = uuid.UUID(str(data))
+        except ValueError:
+            self.fail("invalid")
+        if chave not in carregados:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
+        return carregados[chave]
+
+
 class IntercorrenciaSerializer(serializers.ModelSerializer):
 
     status_display = serializers.CharField(source="get_status_display", read_only=True)
     status_extra = serializers.SerializerMethodField()
 
+    # Campos de código EOL cujos nomes aparecem na resposta: são carregados no
+    # mesmo lote da validação da unidade.
+    campos_unidade_exibidos: tuple[str, ...] = ()
+
     def get_status_extra(self, obj):
         return obj.STATUS_EXTRA_LABELS.get(obj.status)
     
@@ -58,12 +95,59 @@ class IntercorrenciaSerializer(serializers.ModelSerializer):
             "estado",
         ]
 
-    def _limpar_campos_agressor_vitima(self, instance, campos):
-        """Limpa os campos de agressor/vítima na instância"""
-        for campo in campos:
-            if campo in ["idade_pessoa_agressora", "notificado_conselho_tutelar", "acompanhado_naapa"]:
-                setattr(instance, campo, None)
-        instance.save(update_fields=campos)
+    # Valor gravado ao limpar cada campo de agressor/vítima; os demais mantêm o valor atual
+    VALORES_LIMPOS_AGRESSOR_VITIMA = {
+        "idade_pessoa_agressora": None,
+        "notificado_conselho_tutelar": None,
+        "acompanhado_naapa": None,
+    }
+
+    def _aplicar_regras_de_limpeza(self, instance, validated_data, sobre_furto_roubo):
+        """
+        Regras de limpeza das seções, aplicadas sobre validated_data (antes de gravar):
+        - furto/roubo: sem tem_info_agressor_ou_vitima nem informações de agressor/vítima
+        - não furto/roubo: sem smart_sampa_situacao; sem informações de agressor/vítima
+          quando tem_info_agressor_ou_vitima não for "sim"
+        Campos não aplicáveis enviados no payload são descartados e os valores limpos
+        entram no próprio validated_data, para irem na mesma gravação.
+        """
+        if sobre_furto_roubo:
+            validated_data["tem_info_agressor_ou_vitima"] = ""
+            sem_info_agressor = True
+        else:
+            validated_data["smart_sampa_situacao"] = ""
+            tem_info = validated_data.get("tem_info_agressor_ou_vitima", instance.tem_info_agressor_ou_vitima)
+            sem_info_agressor = tem_info != "sim"
+
+        if sem_info_agressor:
+            for campo in self._get_campos_agressor_vitima():
+                validated_data.pop(campo, None)
+            validated_data.update(self.VALORES_LIMPOS_AGRESSOR_VITIMA)
+        return validated_data
+
+    def _gravar_alteracoes(self, instance, validated_data):
+        """
+        Aplica validated_data e grava numa única instrução UPDATE, só com as colunas
+        alteradas (ver ModeloBase.save). Os relacionamentos M2M vão na mesma
+        transação: se algo falhar, nada é gravado.
+        """
+        relacoes = model_meta.get_field_info(instance).relations
+        muitos_para_muitos = {
+            campo: validated_data.pop(campo)
+            for campo in list(validated_data)
+            if campo in relacoes and relacoes[campo].to_many
+        }
+        for campo, valor in validated_data.items():
+            setattr(instance, campo, valor)
+
+        with transaction.atomic():
+            instance.save()
+            for campo, valor in muitos_para_muitos.items():
+                getattr(instance, campo).set(valor)
+        return instance
+
+    # Campos de código EOL conferidos no serviço de Unidades quando mudam
+    CAMPOS_DE_UNIDADE = ("unidade_codigo_eol", "dre_codigo_eol")
 
     def validate(self, attrs):
         """
@@ -72,24 +156,31 @@ class IntercorrenciaSerializer(serializers.ModelSerializer):
         - dre existe?
         - a DRE informada corresponde à DRE da unidade?
         - A unidade pertence ao usuário?
+        Em atualizações, as três primeiras só são feitas quando a unidade ou a DRE
+        do payload diferem do que está gravado; os campos ausentes do payload
+        assumem o valor gravado.
         """
-        codigo_unidade = attrs.get("unidade_codigo_eol")
-        codigo_dre = attrs.get("dre_codigo_eol")
+        codigo_unidade = self._valor_atual(attrs, "unidade_codigo_eol")
+        codigo_dre = self._valor_atual(attrs, "dre_codigo_eol")
         request = self.context.get("request")
-        
-        try:
-            u = unidades_service.get_unidade(codigo_unidade)
-        except unidades_service.ExternalServiceError as e:
-            raise serializers.ValidationError({"detail": str(e)})
 
-        if not u or u.get("codigo_eol") != codigo_unidade:
-            raise serializers.ValidationError({"detail": "Unidade não encontrada."})
+        unidades = get_loader(self.context)
+        unidades.registrar(*self._codigos_exibidos(attrs))
+        if self._unidade_alterada(attrs):
+            unidades.registrar(codigo_unidade)
+            try:
+                u = unidades.get(codigo_unidade)
+            except unidades_service.ExternalServiceError as e:
+                raise serializers.ValidationError({"detail": str(e)})
 
-        dre_da_unidade = u.get("dre_codigo_eol") or u.get("dre", {}).get("codigo_eol")
-        if codigo_dre and dre_da_unidade and (codigo_dre != dre_da_unidade):
-            raise serializers.ValidationError(
-                {"detail": "DRE informada não corresponde à DRE da unidade."}
-            )
+            if not u or u.get("codigo_eol") != codigo_unidade:
+                raise serializers.ValidationError({"detail": "Unidade não encontrada."})
+
+            dre_da_unidade = u.get("dre_codigo_eol") or u.get("dre", {}).get("codigo_eol")
+            if codigo_dre and dre_da_unidade and (codigo_dre != dre_da_unidade):
+                raise serializers.ValidationError(
+                    {"detail": "DRE informada não corresponde à DRE da unidade."}
+                )
 
         user_unidade = getattr(request.user, "unidade_codigo_eol", None)
         is_gipe_user = getattr(request.user, "cargo_codigo", None) == int(CODIGO_PERFIL_GIPE)
@@ -100,6 +191,26 @@ class IntercorrenciaSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def _valor_atual(self, attrs, campo):
+        if campo in attrs:
+            return attrs[campo]
+        return getattr(self.instance, campo, None)
+
+    def _unidade_alterada(self, attrs):
+        """Criação, ou atualização cuja unidade/DRE do payload difere da gravada."""
+        if self.instance is None:
+            return True
+        return any(
+            campo in attrs and attrs[campo] != getattr(self.instance, campo, None)
+            for campo in self.CAMPOS_DE_UNIDADE
+        )
+
+    def _codigos_exibidos(self, attrs):
+        return [
+            self._valor_atual(attrs, campo)
+            for campo in self.campos_unidade_exibidos
+        ]
+
     def is_valid(self, raise_exception=False):
 
         valid = super().is_valid(raise_exception=False)
@@ -147,9 +258,8 @@ class IntercorrenciaSecaoInicialSerializer(IntercorrenciaSerializer):
 class IntercorrenciaFurtoRouboSerializer(IntercorrenciaSerializer):
     """Serializer para furto/roubo/invasão/depredação - Diretor"""
 
-    tipos_ocorrencia = serializers.SlugRelatedField(
+    tipos_ocorrencia = RelacionadoPorUuidField(
         many=True,
-        slug_field="uuid",
         queryset=TipoOcorrencia.objects.all(),
         required=True,
         write_only=True,
@@ -193,41 +303,15 @@ class IntercorrenciaFurtoRouboSerializer(IntercorrenciaSerializer):
         return attrs
     
     def update(self, instance, validated_data):
-        """
-        Garante que campos não aplicáveis sejam limpos quando é furto/roubo.
-        Segue padrão de 2 etapas:
-        - ETAPA 1: Remove campos não aplicáveis do validated_data ANTES do update
-        - ETAPA 2: Limpa campos na instância APÓS o update
-        """
-        
-        # ETAPA 1: Remove campos não aplicáveis do validated_data ANTES do update
-        # Furto/roubo não possui envolvido nem informações de agressor/vítima
-        validated_data.pop("tem_info_agressor_ou_vitima", None)
-        
-        campos_agressor_vitima = self._get_campos_agressor_vitima()
-        
-        # Remove também todos os campos de agressor/vítima
-        for campo in campos_agressor_vitima:
-            validated_data.pop(campo, None)
-        
-        # Atualiza a instância com os dados validados
-        instance = super().update(instance, validated_data)
-        
-        # ETAPA 2: Limpa campos na instância APÓS o update
-        instance.tem_info_agressor_ou_vitima = ""
-        instance.save(update_fields=["tem_info_agressor_ou_vitima"])
-        
-        # Limpa todos os campos de agressor/vítima
-        self._limpar_campos_agressor_vitima(instance, campos_agressor_vitima)
-
-        return instance 
+        """Furto/roubo: grava a seção e limpa agressor/vítima numa única gravação."""
+        self._aplicar_regras_de_limpeza(instance, validated_data, sobre_furto_roubo=True)
+        return self._gravar_alteracoes(instance, validated_data)
 
 
 class IntercorrenciaSecaoFinalSerializer(IntercorrenciaSerializer):
     """Serializer para a seção final - Diretor"""
 
-    declarante = serializers.SlugRelatedField(
-        slug_field="uuid",
+    declarante = RelacionadoPorUuidField(
         queryset=Declarante.objects.all(),
         required=True,
         write_only=True,
@@ -259,9 +343,8 @@ class IntercorrenciaSecaoFinalSerializer(IntercorrenciaSerializer):
 class IntercorrenciaNaoFurtoRouboSerializer(IntercorrenciaSerializer):
     """Serializer para intercorrências que NÃO são furto/roubo/invasão/depredação."""
 
-    tipos_ocorrencia = serializers.SlugRelatedField(
+    tipos_ocorrencia = RelacionadoPorUuidField(
         many=True,
-        slug_field="uuid",
         queryset=TipoOcorrencia.objects.all(),
         required=True,
         write_only=True,
@@ -270,8 +353,7 @@ class IntercorrenciaNaoFurtoRouboSerializer(IntercorrenciaSerializer):
         many=True, read_only=True, source="tipos_ocorrencia"
     )
     descricao_ocorrencia = serializers.CharField(required=True, allow_blank=False)
-    envolvido = serializers.SlugRelatedField(
-        slug_field="uuid",
+    envolvido = RelacionadoPorUuidField(
         queryset=Envolvido.objects.all(),
         required=True,
         write_only=True,
@@ -312,38 +394,9 @@ class IntercorrenciaNaoFurtoRouboSerializer(IntercorrenciaSerializer):
         return attrs
     
     def update(self, instance, validated_data):
-        """
-        Garante que campos não aplicáveis sejam limpos quando NÃO é furto/roubo.
-        Segue padrão de 2 etapas:
-        - ETAPA 1: Remove campos não aplicáveis do validated_data ANTES do update
-        - ETAPA 2: Limpa campos na instância APÓS o update
-        """
-        
-        # # ETAPA 1: Remove campos não aplicáveis do validated_data ANTES do update
-        # # Não-furto/roubo não possui smart_sampa_situacao
-        validated_data.pop("smart_sampa_situacao", None)
-        
-        tem_info_agressor_ou_vitima = validated_data.get(
-            "tem_info_agressor_ou_vitima", instance.tem_info_agressor_ou_vitima
-        )
-        
-        campos_agressor_vitima = self._get_campos_agressor_vitima()
-        
-        if tem_info_agressor_ou_vitima != "sim":
-            for campo in campos_agressor_vitima:
-                validated_data.pop(campo, None)
-            
-        # Atualiza a instância com os dados validados
-        instance = super().update(instance, validated_data)
-        
-        # ETAPA 2: Limpa campos na instância APÓS o update
-        instance.smart_sampa_situacao = ""
-        instance.save(update_fields=["smart_sampa_situacao"])
-        
-        if tem_info_agressor_ou_vitima != "sim":
-            self._limpar_campos_agressor_vitima(instance, campos_agressor_vitima)
-
-        return instance    
+        """Não furto/roubo: grava a seção e limpa o que não se aplica numa única gravação."""
+        self._aplicar_regras_de_limpeza(instance, validated_data, sobre_furto_roubo=False)
+        return self._gravar_alteracoes(instance, validated_data)
 
 
 class IntercorrenciaInfoAgressorSerializer(IntercorrenciaSerializer):
@@ -458,19 +511,21 @@ class IntercorrenciaConclusaoDaUeSerializer(IntercorrenciaSerializer):
     responsavel_cpf = serializers.SerializerMethodField()
     responsavel_email = serializers.SerializerMethodField()
     perfil_acesso = serializers.SerializerMethodField()
+
+    campos_unidade_exibidos = ("unidade_codigo_eol", "dre_codigo_eol")
     
     def get_nome_unidade(self, obj):
-        """Obtém o nome da unidade via serviço externo."""
+        """Obtém o nome da unidade via loader de unidades da requisição."""
         try:
-            unidade = unidades_service.get_unidade(obj.unidade_codigo_eol)
+            unidade = get_loader(self.context).get(obj.unidade_codigo_eol)
             return unidade.get("nome")
         except unidades_service.ExternalServiceError:
             return None
 
     def get_nome_dre(self, obj):
-        """Obtém o nome da DRE via serviço externo."""
+        """Obtém o nome da DRE via loader de unidades da requisição."""
         try:
-            dre = unidades_service.get_unidade(obj.dre_codigo_eol)
+            dre = get_loader(self.context).get(obj.dre_codigo_eol)
             return dre.get("nome")
         except unidades_service.ExternalServiceError:
             return None
@@ -545,9 +600,10 @@ class IntercorrenciaConclusaoDaUeSerializer(IntercorrenciaSerializer):
 class IntercorrenciaDiretorCompletoListSerializer(serializers.ListSerializer):
     def to_representation(self, data):
         if isinstance(data, list) or hasattr(data, '__iter__'):
-            codigos = {obj.unidade_codigo_eol for obj in data} | {obj.dre_codigo_eol for obj in data}
-            codigos = {str(c) for c in codigos if c}
-            self.child.context["cache_unidades"] = unidades_service.get_unidades_em_lote(codigos)
+            unidades = get_loader(self.context)
+            for obj in data:
+                unidades.registrar(obj.unidade_codigo_eol, obj.dre_codigo_eol)
+            unidades.carregar()
 
         return super().to_representation(data)
     
@@ -581,24 +637,28 @@ class IntercorrenciaDiretorCompletoSerializer(serializers.ModelSerializer):
     def get_status_extra(self, obj):
         return obj.STATUS_EXTRA_LABELS.get(obj.status)
 
+    def _nome(self, codigo):
+        if not codigo:
+            return None
+        try:
+            return (get_loader(self.context).get(codigo) or {}).get("nome")
+        except unidades_service.ExternalServiceError:
+            return None
+
     def get_nome_unidade(self, obj):
-        cache = self.context.get("cache_unidades", {})
-        return cache.get(str(obj.unidade_codigo_eol), {}).get("nome")
+        return self._nome(obj.unidade_codigo_eol)
 
     def get_nome_dre(self, obj):
-        cache = self.context.get("cache_unidades", {})
-        return cache.get(str(obj.dre_codigo_eol), {}).get("nome")
+        return self._nome(obj.dre_codigo_eol)
     
     def to_representation(self, instance):
-        if "cache_unidades" not in self.context:
-            codigos = set()
-
-            if instance.unidade_codigo_eol:
-                codigos.add(str(instance.unidade_codigo_eol))
-            if instance.dre_codigo_eol:
-                codigos.add(str(instance.dre_codigo_eol))
-
-            self.context["cache_unidades"] = unidades_service.get_unidades_em_lote(codigos)
+        # Na listagem os códigos já foram carregados em lote pelo ListSerializer
+        unidades = get_loader(self.context)
+        unidades.registrar(instance.unidade_codigo_eol, instance.dre_codigo_eol)
+        try:
+            unidades.carregar()
+        except unidades_service.ExternalServiceError:
+            pass  # os nomes ficam None
 
         return super().to_representation(instance)
 
@@ -661,9 +721,8 @@ class IntercorrenciaUpdateDiretorCompletoSerializer(IntercorrenciaSerializer):
     Aceita todos os campos e aplica regras de limpeza baseadas no tipo.
     """
 
-    tipos_ocorrencia = serializers.SlugRelatedField(
+    tipos_ocorrencia = RelacionadoPorUuidField(
         many=True,
-        slug_field="uuid",
         queryset=TipoOcorrencia.objects.all(),
         required=False,
         write_only=True,
@@ -673,8 +732,7 @@ class IntercorrenciaUpdateDiretorCompletoSerializer(IntercorrenciaSerializer):
     smart_sampa_situacao = serializers.ChoiceField(
         required=False, allow_blank=True, choices=Intercorrencia.SMART_SAMPA_CHOICES
     )
-    envolvido = serializers.SlugRelatedField(
-        slug_field="uuid",
+    envolvido = RelacionadoPorUuidField(
         queryset=Envolvido.objects.all(),
         required=False,
         allow_null=True,
@@ -686,8 +744,7 @@ class IntercorrenciaUpdateDiretorCompletoSerializer(IntercorrenciaSerializer):
         required=False,
         allow_blank=True,
     )
-    declarante = serializers.SlugRelatedField(
-        slug_field="uuid",
+    declarante = RelacionadoPorUuidField(
         queryset=Declarante.objects.all(),
         required=False,
         allow_null=True,
@@ -742,50 +799,12 @@ class IntercorrenciaUpdateDiretorCompletoSerializer(IntercorrenciaSerializer):
 
     def update(self, instance, validated_data):
         """
-        Aplica regras de limpeza baseadas no tipo de intercorrência:
-        - Se É furto/roubo: limpa envolvido e tem_info_agressor_ou_vitima
-        - Se NÃO É furto/roubo: limpa smart_sampa_situacao
-        - Se tem_info != "sim": limpa campos de agressor/vítima
+        Aplica as regras de limpeza conforme o tipo de intercorrência (enviado no
+        payload ou já gravado) e grava tudo numa única instrução UPDATE.
         """
-        # Verifica se é sobre furto/roubo (pode estar em validated_data ou já na instância)
         sobre_furto_roubo = validated_data.get(
             "sobre_furto_roubo_invasao_depredacao",
             instance.sobre_furto_roubo_invasao_depredacao,
         )
-
-        campos_agressor_vitima = self._get_campos_agressor_vitima()
-
-        # ETAPA 1: Remove campos não aplicáveis do validated_data ANTES do update
-        if sobre_furto_roubo:
-            validated_data.pop("tem_info_agressor_ou_vitima", None)
-            
-            # Remove também campos agressor/vítima pois não se aplicam a furto/roubo
-            for campo in campos_agressor_vitima:
-                validated_data.pop(campo, None)
-        else:
-            validated_data.pop("smart_sampa_situacao", None)
-            
-        tem_info_agressor_ou_vitima = validated_data.get(
-            "tem_info_agressor_ou_vitima", instance.tem_info_agressor_ou_vitima
-        )
-
-        # Só verifica tem_info se NÃO for furto/roubo (já foi tratado acima)
-        if not sobre_furto_roubo and tem_info_agressor_ou_vitima != "sim":
-            for campo in campos_agressor_vitima:
-                validated_data.pop(campo, None)
-
-        # Atualiza a instância com os dados validados
-        instance = super().update(instance, validated_data)
-
-        # ETAPA 2: Após atualizar, garante que os campos foram limpos na instância
-        if sobre_furto_roubo:
-            instance.tem_info_agressor_ou_vitima = ""
-            instance.save(update_fields=["tem_info_agressor_ou_vitima"])
-        else:
-            instance.smart_sampa_situacao = ""
-            instance.save(update_fields=["smart_sampa_situacao"])
-
-        if tem_info_agressor_ou_vitima != "sim" or sobre_furto_roubo:
-            self._limpar_campos_agressor_vitima(instance, campos_agressor_vitima)
-
-        return instance
\ No newline at end of file
+        self._aplicar_regras_de_limpeza(instance, validated_data, sobre_furto_roubo)
+        return self._gravar_alteracoes(instance, validated_data)
\ No newline at end of file
@@ -23,4 +23,5 @@ class UUIDInputSerializer(serializers.Serializer):
 class VerifyIntercorrenciaSerializer(serializers.ModelSerializer):
     class Meta:
         model = Intercorrencia
-        fields = "__all__"
\ No newline at end of file
+        # busca_texto é o tsvector interno da busca textual, não um dado da intercorrência
+        exclude = ("busca_texto",)
\ No newline at end of file
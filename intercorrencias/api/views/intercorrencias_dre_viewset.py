@@ -1,5 +1,7 @@
 import logging
+from django.conf import settings
 from django.utils import timezone
+from config.settings import CODIGO_PERFIL_DRE, CODIGO_PERFIL_GIPE
 
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -8,12 +10,21 @@ from rest_framework import viewsets, mixins, status
 from rest_framework.permissions import IsAuthenticated
 
 from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.saida_de_escopo import SaidaDeEscopo
 from intercorrencias.permissions import IntercorrenciaPermission
+from intercorrencias.api.alteracoes import resposta_ndjson
+from intercorrencias.api.exportacao import resposta_csv
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+from intercorrencias.api.pagination import IntercorrenciaCursorPagination
 
 from intercorrencias.api.serializers.intercorrencia_dre_serializer import (
     IntercorrenciaDreSerializer,
     IntercorrenciaConclusaoDaDreSerializer,
 )
+from intercorrencias.api.serializers.intercorrencia_listagem_serializer import (
+    IntercorrenciaDuplicataSerializer,
+    IntercorrenciaListagemSerializer,
+)
 
 
 class IntercorrenciaDreViewSet(
@@ -25,23 +36,72 @@ class IntercorrenciaDreViewSet(
     """
     ViewSet para DRE - visualiza intercorrências da sua DRE e preenche campos próprios
     
-    GET / - Lista intercorrências da DRE
+    GET / - Lista intercorrências da DRE (paginada por cursor; filtros em IntercorrenciaFiltroBackend)
     GET {uuid}/ - Detalhes
     PUT/PATCH {uuid}/ - Atualiza campos da DRE
     POST {uuid}/enviar-para-gipe/ - Envia para GIPE
+    GET alteracoes/ - Feed NDJSON de alterações por marca d'água (atualizado_em, id), com saídas de escopo
+    GET exportar/ - CSV (em streaming) das intercorrências da DRE, com os filtros da listagem
+    GET {uuid}/duplicatas/ - Possíveis registros duplicados (mesma unidade, datas próximas, descrição parecida)
     """
     
-    queryset = Intercorrencia.objects.all()
+    queryset = Intercorrencia.objects.defer("busca_texto")
     serializer_class = IntercorrenciaDreSerializer
     permission_classes = (IsAuthenticated, IntercorrenciaPermission)
+    pagination_class = IntercorrenciaCursorPagination
+    filter_backends = (IntercorrenciaFiltroBackend,)
     lookup_field = "uuid"
 
+    # A DRE só enxerga o que o diretor já enviou (rascunhos ficam na unidade)
+    STATUS_VISIVEIS_PARA_DRE = ("enviado_para_dre", "enviado_para_gipe", "finalizada")
+
+    def get_queryset(self):
+        """
+        Na listagem, na exportação e no feed de alterações, restringe no banco às
+        intercorrências da DRE do usuário já enviadas pelo diretor (GIPE vê todas);
+        os filtros da query string ficam em IntercorrenciaFiltroBackend.
+        Nas ações de detalhe o escopo continua na permissão de objeto.
+        A listagem lê apenas as colunas da representação compacta (`.values()`);
+        os serializers de detalhe da DRE não exibem relações.
+        """
+        qs = super().get_queryset()
+        if self.action not in ("list", "exportar", "alteracoes"):
+            return qs
+
+        escopo = self._filtro_de_escopo()
+        qs = qs.filter(**escopo) if escopo is not None else qs.none()
+        if str(getattr(self.request.user, "cargo_codigo", None)) == str(CODIGO_PERFIL_DRE):
+            qs = qs.filter(status__in=self.STATUS_VISIVEIS_PARA_DRE)
+
+        if self.action != "list":
+            return qs
+        return qs.values(*IntercorrenciaListagemSerializer.CAMPOS)
+
+    def _filtro_de_escopo(self, sufixo: str = "") -> dict | None:
+        """
+        Filtro do que o usuário enxerga: a DRE (perfil DRE), a unidade (demais
+        perfis) ou tudo (GIPE, filtro vazio). None quando o usuário não tem unidade.
+        O sufixo aplica o mesmo filtro a outros campos (ex.: "_anterior" nas saídas de escopo).
+        """
+        user = self.request.user
+        cargo_str = str(getattr(user, "cargo_codigo", None))
+        user_unidade = getattr(user, "unidade_codigo_eol", None)
+
+        if cargo_str == str(CODIGO_PERFIL_GIPE):
+            return {}
+        if not user_unidade:
+            return None
+        campo = "dre_codigo_eol" if cargo_str == str(CODIGO_PERFIL_DRE) else "unidade_codigo_eol"
+        return {f"{campo}{sufixo}": user_unidade}
+
     def get_serializer_class(self):
         """
         Define dinamicamente o serializer com base na ação atual.
         """
         action_map = {
             "enviar_para_gipe": IntercorrenciaConclusaoDaDreSerializer,
+            "list": IntercorrenciaListagemSerializer,
+            "duplicatas": IntercorrenciaDuplicataSerializer,
         }
         return action_map.get(self.action, IntercorrenciaDreSerializer)
     
@@ -63,7 +123,6 @@ class IntercorrenciaDreViewSet(
                 "status": "enviado_para_gipe",
                 "finalizado_dre_em": timezone.now(),
                 "finalizado_dre_por": request.user.username,
-                "atualizado_em": timezone.now()
             }          
             
             serializer.is_valid(raise_exception=True)
@@ -75,6 +134,48 @@ class IntercorrenciaDreViewSet(
         except Exception as exc:
             return self.handle_exception(exc)
         
+    @action(detail=False, methods=['get'], url_path='exportar')
+    def exportar(self, request):
+        """GET exportar/ - Exporta em CSV as intercorrências visíveis, com os filtros da listagem"""
+
+        try:
+            return resposta_csv(self.filter_queryset(self.get_queryset()), prefixo="intercorrencias-dre")
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    @action(detail=False, methods=['get'], url_path='alteracoes')
+    def alteracoes(self, request):
+        """GET alteracoes/ - Feed NDJSON do que mudou (ou saiu do escopo) depois de `desde`/`cursor`"""
+
+        try:
+            anterior = self._filtro_de_escopo("_anterior")
+            if anterior is None:
+                saidas = SaidaDeEscopo.objects.none()
+            elif not anterior:
+                # GIPE vê todas: só a exclusão tira uma intercorrência do seu escopo
+                saidas = SaidaDeEscopo.objects.filter(motivo="excluida")
+            else:
+                # Saiu do escopo só quem não continua nele (ex.: trocou de unidade dentro da mesma DRE)
+                saidas = SaidaDeEscopo.objects.filter(**anterior).exclude(**self._filtro_de_escopo("_atual"))
+            return resposta_ndjson(self.get_queryset(), saidas, request.query_params)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    @action(detail=True, methods=['get'], url_path='duplicatas')
+    def duplicatas(self, request, uuid=None):
+        """GET {uuid}/duplicatas/ - Candidatas a duplicata, da mais parecida à menos"""
+
+        try:
+            instance = self.get_object()
+            candidatas = instance.candidatas_a_duplicata().values(*IntercorrenciaDuplicataSerializer.CAMPOS)
+            serializer = self.get_serializer(candidatas[:settings.INTERCORRENCIAS_DUPLICATAS_LIMITE], many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
     def handle_exception(self, exc):
         response = exception_handler(exc, self.get_exception_handler_context())
 
@@ -1,43 +1,110 @@
+from django.conf import settings
 from django.utils import timezone
+from config.settings import CODIGO_PERFIL_GIPE
 
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import viewsets, status, mixins
 from rest_framework.views import exception_handler
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied
 
 from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.saida_de_escopo import SaidaDeEscopo
 from intercorrencias.permissions import IntercorrenciaPermission
+from intercorrencias.api.alteracoes import resposta_ndjson
+from intercorrencias.api.exportacao import resposta_csv
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+from intercorrencias.api.pagination import IntercorrenciaCursorPagination
 from intercorrencias.choices.gipe_choices import get_values_gipe_choices
 from intercorrencias.api.serializers.intercorrencia_gipe_serializer import IntercorrenciaGipeSerializer, IntercorrenciaConclusaoGipeSerializer
+from intercorrencias.api.serializers.intercorrencia_listagem_serializer import (
+    IntercorrenciaDuplicataSerializer,
+    IntercorrenciaListagemSerializer,
+)
 
 
 class IntercorrenciaGipeViewSet(
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
+    mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
     """
     ViewSet para GIPE - visualiza intercorrências e preenche campos próprios
     
+    GET / - Lista todas as intercorrências (paginada por cursor; filtros em IntercorrenciaFiltroBackend)
     GET {uuid}/ - Detalhes
     PUT/PATCH {uuid}/ - Atualiza campos do GIPE
     PUT{uuid}/finalizar - Finaliza a intercorrência
+    GET alteracoes/ - Feed NDJSON de alterações por marca d'água (atualizado_em, id), com exclusões (apenas perfil GIPE)
+    GET exportar/ - CSV (em streaming) de todas as intercorrências, com os filtros da listagem (apenas perfil GIPE)
+    GET {uuid}/duplicatas/ - Possíveis registros duplicados (mesma unidade, datas próximas, descrição parecida)
     GET - gipe/categorias-disponiveis -> Lista todos os choices disponiveis para o GIPE
     """
-    queryset = Intercorrencia.objects.all()
+    queryset = Intercorrencia.objects.defer("busca_texto")
     serializer_class = IntercorrenciaGipeSerializer
     permission_classes = (IsAuthenticated, IntercorrenciaPermission)
+    pagination_class = IntercorrenciaCursorPagination
+    filter_backends = (IntercorrenciaFiltroBackend,)
     lookup_field = "uuid"
 
+    def get_queryset(self):
+        """
+        A listagem lê apenas as colunas da representação compacta (`.values()`).
+        Envolvido e tipos de ocorrência são exibidos pelo serializer do GIPE:
+        carregados junto da consulta, sem uma query por linha.
+        """
+        qs = super().get_queryset()
+        acao = getattr(self, "action", None)
+        if acao == "list":
+            return qs.values(*IntercorrenciaListagemSerializer.CAMPOS)
+        if acao in ("retrieve", "update", "partial_update"):
+            qs = qs.select_related("envolvido").prefetch_related("tipos_ocorrencia")
+        return qs
+
     def get_serializer_class(self):
         """
         Define dinamicamente o serializer com base na ação atual.
         """
         action_map = {
             "finalizar": IntercorrenciaConclusaoGipeSerializer,
+            "list": IntercorrenciaListagemSerializer,
+            "duplicatas": IntercorrenciaDuplicataSerializer,
         }
         return action_map.get(self.action, IntercorrenciaGipeSerializer)
+
+    def list(self, request, *args, **kwargs):
+        """GET / - Lista todas as intercorrências (apenas perfil GIPE)"""
+        self._exigir_perfil_gipe(request, "Apenas o perfil GIPE pode listar todas as intercorrências.")
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='exportar')
+    def exportar(self, request):
+        """GET exportar/ - Exporta em CSV todas as intercorrências, com os filtros da listagem"""
+
+        try:
+            self._exigir_perfil_gipe(request, "Apenas o perfil GIPE pode exportar todas as intercorrências.")
+            return resposta_csv(self.filter_queryset(self.get_queryset()), prefixo="intercorrencias-gipe")
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    @action(detail=False, methods=['get'], url_path='alteracoes')
+    def alteracoes(self, request):
+        """GET alteracoes/ - Feed NDJSON do que mudou (ou foi excluído) depois de `desde`/`cursor`"""
+
+        try:
+            self._exigir_perfil_gipe(request, "Apenas o perfil GIPE pode consultar o feed de todas as intercorrências.")
+            saidas = SaidaDeEscopo.objects.filter(motivo="excluida")
+            return resposta_ndjson(self.get_queryset(), saidas, request.query_params)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def _exigir_perfil_gipe(self, request, mensagem):
+        if str(getattr(request.user, "cargo_codigo", None)) != str(CODIGO_PERFIL_GIPE):
+            raise PermissionDenied(mensagem)
     
     @action(detail=True, methods=['put'], url_path='finalizar')
     def finalizar(self, request, uuid=None):
@@ -57,7 +124,6 @@ class IntercorrenciaGipeViewSet(
                 "status": "finalizada",
                 "finalizado_gipe_em": timezone.now(),
                 "finalizado_gipe_por": request.user.username,
-                "atualizado_em": timezone.now()
             }          
             
             serializer.is_valid(raise_exception=True)
@@ -79,6 +145,19 @@ class IntercorrenciaGipeViewSet(
         except Exception as exc:
             return self.handle_exception(exc)
         
+    @action(detail=True, methods=['get'], url_path='duplicatas')
+    def duplicatas(self, request, uuid=None):
+        """GET {uuid}/duplicatas/ - Candidatas a duplicata, da mais parecida à menos"""
+
+        try:
+            instance = self.get_object()
+            candidatas = instance.candidatas_a_duplicata().values(*IntercorrenciaDuplicataSerializer.CAMPOS)
+            serializer = self.get_serializer(candidatas[:settings.INTERCORRENCIAS_DUPLICATAS_LIMITE], many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
     def handle_exception(self, exc):
         response = exception_handler(exc, self.get_exception_handler_context())
 
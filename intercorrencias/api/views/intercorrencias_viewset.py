@@ -1,5 +1,7 @@
 import logging
 
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from config.settings import (
     CODIGO_PERFIL_DIRETOR,
@@ -7,7 +9,7 @@ from config.settings import (
     CODIGO_PERFIL_DRE
 )
 
-from rest_framework import viewsets, status, mixins
+from rest_framework import viewsets, status, mixins, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.views import exception_handler
@@ -15,6 +17,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError 
 
 from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.api.formulario import criar_em_lote, gravar_formulario
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+from intercorrencias.api.pagination import IntercorrenciaCursorPagination
 from intercorrencias.permissions import IntercorrenciaPermission
 from intercorrencias.choices.info_agressor_choices import get_values_info_agressor_choices
 from intercorrencias.api.serializers.intercorrencia_serializer import (
@@ -27,6 +32,7 @@ from intercorrencias.api.serializers.intercorrencia_serializer import (
     IntercorrenciaInfoAgressorSerializer,
     IntercorrenciaConclusaoDaUeSerializer
 )
+from intercorrencias.api.serializers.intercorrencia_listagem_serializer import IntercorrenciaListagemSerializer
 
 logger = logging.getLogger(__name__)
 MSG_INTERCORRENCIA_NAO_EDITAVEL = "Esta intercorrência não pode mais ser editada."
@@ -37,12 +43,18 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
     ViewSet especializada para o fluxo de intercorrências.
 
     GET /api-intercorrencias/v1/diretor/
-        → Retorna a listagem completa de intercorrências visíveis ao usuário autenticado.
+        → Retorna a listagem (paginada por cursor, filtros em IntercorrenciaFiltroBackend) de intercorrências visíveis ao usuário autenticado.
     GET /api-intercorrencias/v1/diretor/{uuid}/
         → Retorna os detalhes de uma intercorrência específica.
     GET /api-intercorrencias/v1/diretor/categorias-disponiveis
     POST /api-intercorrencias/v1/diretor/secao-inicial/
         → Cria uma nova intercorrência (seção inicial).
+    POST /api-intercorrencias/v1/diretor/lote/
+        → Cria várias intercorrências completas de uma vez, com os erros por item.
+    POST /api-intercorrencias/v1/diretor/formulario/
+    PUT /api-intercorrencias/v1/diretor/{uuid}/formulario/
+        → Grava o formulário completo (todas as seções) numa única requisição;
+          com `enviar_para_dre`, também conclui e envia para a DRE.
     PUT /api-intercorrencias/v1/diretor/{uuid}/secao-inicial/
         → Atualiza os dados da seção inicial de uma intercorrência existente.
     PUT /api-intercorrencias/v1/diretor/{uuid}/furto-roubo/
@@ -52,16 +64,30 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
     PUT /api-intercorrencias/v1/diretor/{uuid}/enviar-para-dre/
     """
 
-    queryset = Intercorrencia.objects.all()
+    queryset = Intercorrencia.objects.defer("busca_texto")
     permission_classes = (IsAuthenticated, IntercorrenciaPermission)
+    pagination_class = IntercorrenciaCursorPagination
+    filter_backends = (IntercorrenciaFiltroBackend,)
     lookup_field = "uuid"
 
     def get_queryset(self):
         """
         Retorna as intercorrências com base na unidade do usuário autenticado.
+
+        A listagem lê apenas as colunas da representação compacta (`.values()`).
+        Nas ações que respondem com o serializer completo, declarante, envolvido
+        e tipos de ocorrência vêm junto da consulta (sem uma query por linha).
         """
-        qs = super().get_queryset()
+        qs = self._escopo_do_usuario(super().get_queryset())
+
+        acao = getattr(self, "action", None)
+        if acao == "list":
+            return qs.values(*IntercorrenciaListagemSerializer.CAMPOS)
+        if acao in ("retrieve", "update", "partial_update"):
+            qs = qs.select_related("declarante", "envolvido").prefetch_related("tipos_ocorrencia")
+        return qs
 
+    def _escopo_do_usuario(self, qs):
         cargo_codigo = getattr(self.request.user, 'cargo_codigo', None)
 
         # Filtra apenas intercorrências da unidade do Diretor/ Assistente
@@ -94,6 +120,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
             "enviar_para_dre": IntercorrenciaConclusaoDaUeSerializer,
             "update": IntercorrenciaUpdateDiretorCompletoSerializer,
             "partial_update": IntercorrenciaUpdateDiretorCompletoSerializer,
+            "list": IntercorrenciaListagemSerializer,
         }
         return action_map.get(self.action, IntercorrenciaDiretorCompletoSerializer)
     
@@ -110,10 +137,10 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 context={"request": request}
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
             
             # Retorna com o serializer completo para mostrar todos os dados
-            response_serializer = IntercorrenciaDiretorCompletoSerializer(instance)
+            response_serializer = IntercorrenciaDiretorCompletoSerializer(instance, context={"request": request})
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         
         except Exception as exc:
@@ -124,15 +151,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
         """ POST secao-inicial/ - Cria intercorrência com seção inicial """
 
         try:
-            cargo_codigo = getattr(request.user, 'cargo_codigo', None)
-
-            cargo_str = str(cargo_codigo)
-            if cargo_str not in [str(CODIGO_PERFIL_DIRETOR), str(CODIGO_PERFIL_ASSISTENTE_DIRECAO)]:
-                raise PermissionDenied("Apenas Diretor ou Assistente de Diretor podem criar intercorrências.")
-        
-            user_unidade = getattr(request.user, "unidade_codigo_eol", None)
-            if not user_unidade:
-                raise ValidationError({"detail": "Usuário sem unidade cadastrada."})
+            user_unidade = self._exigir_diretor_com_unidade(request)
 
             serializer = self.get_serializer(data=request.data, partial=False, context={"request": request})
             serializer.is_valid(raise_exception=True)
@@ -150,6 +169,82 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
         except Exception as exc:
             return self.handle_exception(exc)
 
+    @action(detail=False, methods=["post"], url_path="lote")
+    def lote(self, request):
+        """POST lote/ - Cria intercorrências completas registradas offline; itens inválidos voltam em `erros`"""
+
+        try:
+            self._exigir_diretor_com_unidade(request)
+
+            itens = request.data
+            if not isinstance(itens, list) or not itens:
+                raise ValidationError({"detail": "Envie uma lista de intercorrências."})
+            if len(itens) > settings.INTERCORRENCIAS_LOTE_MAXIMO:
+                raise ValidationError(
+                    {"detail": f"Envie no máximo {settings.INTERCORRENCIAS_LOTE_MAXIMO} intercorrências por lote."}
+                )
+
+            criadas, erros = criar_em_lote(itens, request)
+            data = {
+                "criadas": [
+                    {"indice": indice, "uuid": intercorrencia.uuid, "status": intercorrencia.status}
+                    for indice, intercorrencia in criadas
+                ],
+                "erros": erros,
+            }
+            return Response(data, status=status.HTTP_201_CREATED if criadas else status.HTTP_400_BAD_REQUEST)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    @action(detail=False, methods=["post"], url_path="formulario")
+    def formulario_create(self, request):
+        """POST formulario/ - Cria a intercorrência com o formulário completo"""
+
+        try:
+            self._exigir_diretor_com_unidade(request)
+            return self._responder_formulario(request, None, status.HTTP_201_CREATED)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    @action(detail=True, methods=["put"], url_path="formulario")
+    def formulario_update(self, request, uuid=None):
+        """PUT {uuid}/formulario/ - Regrava todas as seções de uma intercorrência em preenchimento"""
+
+        try:
+            self._exigir_diretor_com_unidade(request)
+            instance = self.get_object()
+            return self._responder_formulario(request, instance, status.HTTP_200_OK)
+
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def _responder_formulario(self, request, instance, status_code):
+        if not isinstance(request.data, dict):
+            raise ValidationError({"detail": "Envie o formulário como um objeto."})
+        try:
+            enviar_para_dre = serializers.BooleanField().run_validation(request.data.get("enviar_para_dre", False))
+        except ValidationError as exc:
+            raise ValidationError({"detail": f"enviar_para_dre: {exc.detail[0]}"})
+        instance = gravar_formulario(request.data, request, instance, enviar_para_dre)
+
+        if enviar_para_dre:
+            response_serializer = IntercorrenciaConclusaoDaUeSerializer(instance, context={"request": request})
+        else:
+            response_serializer = IntercorrenciaDiretorCompletoSerializer(instance, context={"request": request})
+        return Response(response_serializer.data, status=status_code)
+
+    def _exigir_diretor_com_unidade(self, request):
+        cargo_str = str(getattr(request.user, 'cargo_codigo', None))
+        if cargo_str not in [str(CODIGO_PERFIL_DIRETOR), str(CODIGO_PERFIL_ASSISTENTE_DIRECAO)]:
+            raise PermissionDenied("Apenas Diretor ou Assistente de Diretor podem preencher intercorrências.")
+
+        user_unidade = getattr(request.user, "unidade_codigo_eol", None)
+        if not user_unidade:
+            raise ValidationError({"detail": "Usuário sem unidade cadastrada."})
+        return user_unidade
+
     @action(detail=True, methods=["put"], url_path="secao-inicial")
     def secao_inicial_update(self, request, uuid=None):
 
@@ -167,7 +262,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 context={"request": request},
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
 
             response_serializer = IntercorrenciaSecaoInicialSerializer(instance)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -184,7 +279,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 instance, data=request.data, partial=False, context={"request": request}
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
 
             response_serializer = IntercorrenciaFurtoRouboSerializer(instance)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -202,7 +297,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 instance, data=request.data, partial=False, context={"request": request}
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
 
             response_serializer = IntercorrenciaNaoFurtoRouboSerializer(instance)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -223,7 +318,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 context={"request": request},
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
 
             response_serializer = IntercorrenciaSecaoFinalSerializer(instance)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -245,7 +340,7 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
 
             serializer = self.get_serializer(instance, data=request.data, partial=False)
             serializer.is_valid(raise_exception=True)
-            serializer.save(atualizado_em=timezone.now())
+            serializer.save()
 
             response_serializer = IntercorrenciaInfoAgressorSerializer(instance)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -271,14 +366,24 @@ class IntercorrenciaDiretorViewSet(viewsets.GenericViewSet, mixins.ListModelMixi
                 "status": "enviado_para_dre",
                 "finalizado_diretor_em": timezone.now(),
                 "finalizado_diretor_por": request.user.username,
-                "atualizado_em": timezone.now()
             }   
             
-            if not instance.protocolo_da_intercorrencia:
-                obj_to_update["protocolo_da_intercorrencia"] = Intercorrencia.gerar_protocolo()         
-            
             serializer.is_valid(raise_exception=True)
-            serializer.save(**obj_to_update)
+
+            # Número reservado na mesma transação da gravação: sem lacunas se algo falhar
+            with transaction.atomic():
+                # Relê a linha bloqueada: envios simultâneos não reservam dois números
+                protocolo_atual = (
+                    Intercorrencia.objects.select_for_update()
+                    .filter(pk=instance.pk)
+                    .values_list("protocolo_da_intercorrencia", flat=True)
+                    .get()
+                )
+                if protocolo_atual:
+                    instance.protocolo_da_intercorrencia = protocolo_atual
+                else:
+                    obj_to_update["protocolo_da_intercorrencia"] = Intercorrencia.gerar_protocolo()
+                serializer.save(**obj_to_update)
            
             serializer = IntercorrenciaConclusaoDaUeSerializer(instance, context={"request": request})
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 class VerifyIntercorrenciaViewSet(viewsets.GenericViewSet):
     serializer_class = VerifyIntercorrenciaSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Intercorrencia.objects.all()
+    queryset = Intercorrencia.objects.defer("busca_texto")
     lookup_field = "uuid"
 
     def retrieve(self, request, *args, **kwargs):
@@ -39,7 +39,7 @@ class VerifyIntercorrenciaViewSet(viewsets.GenericViewSet):
         )
 
         try:
-            intercorrencia = get_object_or_404(Intercorrencia, uuid=kwargs.get("uuid"))
+            intercorrencia = get_object_or_404(self.queryset, uuid=kwargs.get("uuid"))
         except Http404:
             logger.warning(
                 f"Intercorrência UUID={kwargs.get('uuid')} não encontrada para o usuário '{user_name}'."
@@ -7,4 +7,6 @@ class IntercorrenciasConfig(AppConfig):
 
     def ready(self):
         # importa a extensão para registrá-la no ciclo de vida do Django
-        import intercorrencias.spectacular_ext  # noqa: F401
\ No newline at end of file
+        import intercorrencias.spectacular_ext  # noqa: F401
+        import intercorrencias.checks  # noqa: F401
+        import intercorrencias.signals  # noqa: F401
\ No newline at end of file
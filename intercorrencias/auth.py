@@ -1,16 +1,21 @@
-import time
 import requests
 import jwt
 from dataclasses import dataclass
 from django.conf import settings
-from django.core.cache import cache
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework.throttling import BaseThrottle
+from intercorrencias.services import auth_service, http_client
+from intercorrencias.services.rate_limit import TokenBucket
+from intercorrencias.services.singleflight import SingleFlight
+from intercorrencias.services.token_cache import token_cache, rejected_token_cache, token_digest
 import logging
 logger = logging.getLogger(__name__)
 
 VERIFY_URL = settings.AUTH_VERIFY_URL
 
+verificacoes_em_andamento = SingleFlight("jwt")
+
 @dataclass
 class ExternalUser:
     username: str
@@ -21,11 +26,21 @@ class ExternalUser:
     unidade_codigo_eol: str | None = None
     is_authenticated: bool = True
 
+class InvalidTokenError(AuthenticationFailed):
+    """Recusa definitiva do token (assinatura, expiração, revogação); vai para o cache negativo."""
+
+
 class RemoteJWTAuthentication(BaseAuthentication):
     """
-    Verifica o JWT chamando o serviço de Auth.
-    Decodifica o payload (sem verificar assinatura) *após* a verificação.
-    Faz cache curto para reduzir latência.
+    Verifica o JWT chamando o serviço de Auth (AUTH_VERIFY_MODE="remote") ou
+    localmente com a chave pública/JWKS em cache (AUTH_VERIFY_MODE="local").
+    No modo local, tokens com `jti` na lista de revogação são recusados.
+    Payloads verificados ficam em cache (L1 local + cache do Django) chaveado
+    pelo SHA-256 do token, compartilhado entre os workers.
+    Tokens recusados ficam em cache negativo e as verificações de cada cliente
+    são limitadas por um token-bucket, então repetições de um token inválido
+    são respondidas com 401 sem chamada de rede. Verificações simultâneas do
+    mesmo token (entre threads e entre workers) são coalescidas em uma só.
     """
 
     def authenticate(self, request):
@@ -35,7 +50,8 @@ class RemoteJWTAuthentication(BaseAuthentication):
             return None  # sem credenciais -> DRF tratará como não autenticado
 
         token = auth[1].decode("utf-8")
-        user_payload = self._verify_and_get_payload(token)  # dict
+        cliente = BaseThrottle().get_ident(request)
+        user_payload = self._verify_and_get_payload(token, cliente)  # dict
 
         logger.info("Payload do usuário: %s", user_payload)
         username = (
@@ -56,41 +72,107 @@ class RemoteJWTAuthentication(BaseAuthentication):
         )
         return (user, None)
 
-    def _verify_and_get_payload(self, token: str) -> dict:
+    def _verify_and_get_payload(self, token: str, cliente: str | None = None) -> dict:
 
-        logger.info("Verificando token no serviço A: %s", settings.AUTH_VERIFY_URL)
+        local = getattr(settings, "AUTH_VERIFY_MODE", "remote") == "local"
 
-        cache_key = f"jwtv:{hash(token)}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+        payload = token_cache.get(token)
+        if not payload:
+            # Requisições paralelas com o mesmo token compartilham uma única verificação
+            try:
+                payload = verificacoes_em_andamento.do(
+                    token_digest(token), lambda: self._verify_uncached(token, local, cliente)
+                )
+            except requests.RequestException as e:
+                # Ex.: deadline.PrazoEsgotadoError de quem esperava a verificação de outro worker
+                raise AuthenticationFailed(f"Falha ao contatar serviço de autenticação: {e}")
+
+        # A lista de revogação é consultada mesmo com o payload em cache
+        if local and payload.get("jti") and str(payload["jti"]) in auth_service.get_revogados():
+            raise InvalidTokenError("Token revogado.")
+
+        return payload
+
+    def _verify_uncached(self, token: str, local: bool, cliente: str | None) -> dict:
+        motivo = rejected_token_cache.get(token)
+        if motivo:
+            raise InvalidTokenError(motivo)
+
+        self._check_rate(cliente)
+        try:
+            payload = self._verify_locally(token) if local else self._verify_remotely(token)
+        except InvalidTokenError as e:
+            rejected_token_cache.set(token, str(e.detail))
+            raise
+        token_cache.set(token, payload)
+        return payload
+
+    def _check_rate(self, cliente: str | None):
+        """Limita as verificações (cache miss) por cliente com um token-bucket."""
+        if not cliente:
+            return
+        bucket = TokenBucket(
+            "jwtrate",
+            capacidade=getattr(settings, "AUTH_VERIFY_RATE_BURST", 20),
+            taxa=getattr(settings, "AUTH_VERIFY_RATE_PER_SECOND", 1.0),
+        )
+        espera = bucket.consumir(cliente)
+        if espera:
+            logger.warning("Limite de verificações de token excedido para o cliente %s", cliente)
+            raise Throttled(wait=espera)
+
+    def _verify_locally(self, token: str) -> dict:
+        """
+        Valida assinatura e expiração com a chave pública/JWKS em cache, sem ida à rede.
+        O serviço de Auth só é chamado se a chave não puder ser obtida e
+        AUTH_REMOTE_FALLBACK estiver habilitado.
+        """
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = auth_service.get_chave_publica(kid)
+        except jwt.PyJWTError:
+            raise InvalidTokenError("Token malformado.")
+        except auth_service.ChaveIndisponivelError as e:
+            if not getattr(settings, "AUTH_REMOTE_FALLBACK", True):
+                raise AuthenticationFailed(f"Falha ao obter chave de verificação: {e}")
+            logger.warning("Chave local indisponível (%s), usando verificação remota.", e)
+            return self._verify_remotely(token)
+
+        return self._decode(token, key)
+
+    def _verify_remotely(self, token: str) -> dict:
+
+        logger.info("Verificando token no serviço A: %s", settings.AUTH_VERIFY_URL)
 
         # 1) Verifica no serviço A
         try:
             logger.info(f"Enviando requisição para o serviço A... {VERIFY_URL}")
-            r = requests.post(VERIFY_URL, json={"token": token}, timeout=3.0)
+            r = auth_service.circuito.chamar(http_client.post, VERIFY_URL, json={"token": token}, timeout=3.0)
             logger.info("Resposta do serviço A: %s", r.status_code)
         except requests.RequestException as e:   # ✅ classe base de todas as exceções de rede do requests
             raise AuthenticationFailed(f"Falha ao contatar serviço de autenticação: {e}")
                 
+        if r.status_code >= 500:
+            # Falha do serviço, não do token: não vai para o cache negativo
+            raise AuthenticationFailed(f"Falha ao contatar serviço de autenticação: HTTP {r.status_code}")
         if r.status_code != 200:
-            raise AuthenticationFailed("Token inválido ou expirado.")
+            raise InvalidTokenError("Token inválido ou expirado.")
 
-        
+        # Use the secret or public key from settings to verify the signature
+        return self._decode(
+            token,
+            settings.AUTH_PUBLIC_KEY if hasattr(settings, "AUTH_PUBLIC_KEY") else settings.SECRET_KEY,
+        )
+
+    def _decode(self, token: str, key) -> dict:
         try:
-            # Use the secret or public key from settings to verify the signature
-            payload = jwt.decode(
+            return jwt.decode(
                 token,
-                key=settings.AUTH_PUBLIC_KEY if hasattr(settings, "AUTH_PUBLIC_KEY") else settings.SECRET_KEY,
-                algorithms=["HS256", "RS256"],  # Adjust algorithms as needed
+                key=key,
+                algorithms=getattr(settings, "AUTH_JWT_ALGORITHMS", ["HS256", "RS256"]),
                 options={"verify_signature": True}
             )
+        except jwt.ExpiredSignatureError:
+            raise InvalidTokenError("Token inválido ou expirado.")
         except jwt.PyJWTError:
-            raise AuthenticationFailed("Token malformado.")
-
-        # TTL do cache: respeite o exp do token, com teto curto
-        now = int(time.time())
-        exp = int(payload.get("exp", now + 60))
-        ttl = max(1, min(60, exp - now))  # até 60s
-        cache.set(cache_key, payload, ttl)
-        return payload
+            raise InvalidTokenError("Token malformado.")
@@ -0,0 +1,86 @@
+import jwt
+from django.conf import settings
+from django.core.checks import Error, Warning, Tags, register
+
+from intercorrencias.services import auth_service
+
+CACHES_POR_PROCESSO = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def cache_compartilhado(app_configs, **kwargs):
+    """
+    Tokens, token-buckets, locks do SingleFlight e circuit breakers dependem de um
+    cache visível por todos os workers; em memória, cada processo teria o seu.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend in CACHES_POR_PROCESSO:
+        return [
+            Warning(
+                "O cache padrão é local ao processo: limites e estados ficam por worker.",
+                hint="Configure CACHE_URL com um Redis (ex.: redis://redis:6379/1).",
+                id="intercorrencias.W001",
+            )
+        ]
+    return []
+
+
+
+@register(Tags.security)
+def limite_de_verificacoes(app_configs, **kwargs):
+    """O token-bucket das verificações de token exige taxa positiva e capacidade mínima de 1."""
+    erros = []
+    if settings.AUTH_VERIFY_RATE_PER_SECOND <= 0:
+        erros.append(
+            Error(
+                "AUTH_VERIFY_RATE_PER_SECOND deve ser maior que zero.",
+                hint="Com taxa zero, clientes limitados nunca mais teriam fichas (espera infinita).",
+                id="intercorrencias.E003",
+            )
+        )
+    if settings.AUTH_VERIFY_RATE_BURST < 1:
+        erros.append(
+            Error("AUTH_VERIFY_RATE_BURST deve ser pelo menos 1.", id="intercorrencias.E004")
+        )
+    return erros
+
+def _algoritmo_assimetrico(algoritmo: str) -> bool:
+    return algoritmo[:2] in ("RS", "PS", "ES") or algoritmo == "EdDSA"
+
+
+@register(Tags.security)
+def verificacao_local_de_tokens(app_configs, **kwargs):
+    """
+    No modo local (AUTH_VERIFY_MODE="local") o token é validado com as chaves
+    do JWKS. Se nenhuma puder ser carregada — por exemplo, chaves RSA/EC sem o
+    pacote cryptography —, cada requisição cairia em silêncio na verificação
+    remota; por isso a inicialização falha.
+    """
+    if getattr(settings, "AUTH_VERIFY_MODE", "remote") != "local":
+        return []
+
+    assimetricos = [alg for alg in settings.AUTH_JWT_ALGORITHMS if _algoritmo_assimetrico(alg)]
+    if assimetricos and not jwt.algorithms.has_crypto:
+        return [
+            Error(
+                f"AUTH_JWT_ALGORITHMS inclui {', '.join(assimetricos)}, mas o pacote cryptography não está instalado.",
+                hint="Instale PyJWT[crypto] (requirements/base.txt).",
+                id="intercorrencias.E001",
+            )
+        ]
+
+    if settings.AUTH_JWKS_URL:
+        try:
+            auth_service.carregar_chaves()
+        except auth_service.ChaveIndisponivelError as e:
+            return [
+                Error(
+                    f"Verificação local de tokens sem chave utilizável: {e}",
+                    hint="Confira AUTH_JWKS_URL e as chaves publicadas (kty/alg suportados).",
+                    id="intercorrencias.E002",
+                )
+            ]
+    return []
@@ -0,0 +1,96 @@
+import time
+import logging
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from intercorrencias.auth import ExternalUser
+from intercorrencias.models.unidade import Unidade
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.api.views.intercorrencias_dre_viewset import IntercorrenciaDreViewSet
+
+DRE_MEDIDA = "999999"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a latência de GET /dre/ enquanto cresce o volume de intercorrências de "
+        "outras DREs. Tudo roda numa transação desfeita ao final: nada é gravado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tamanhos", nargs="+", type=int, default=[1000, 10000, 50000],
+            help="Total de intercorrências de outras DREs em cada etapa.",
+        )
+        parser.add_argument("--proprias", type=int, default=200, help="Intercorrências da DRE medida.")
+        parser.add_argument("--repeticoes", type=int, default=20, help="Requisições medidas por etapa.")
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)  # os logs por requisição distorcem a medida
+        try:
+            with transaction.atomic():
+                self._executar(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def _executar(self, options):
+        # Nomes de unidade/DRE da listagem vêm do espelho local, sem ir ao serviço
+        codigos = [f"{i:06d}" for i in range(1000)] + [f"{i + 100000:06d}" for i in range(12)] + [DRE_MEDIDA]
+        Unidade.objects.bulk_create(
+            [Unidade(codigo_eol=codigo, nome=f"Unidade {codigo}") for codigo in codigos], ignore_conflicts=True
+        )
+        self._inserir(options["proprias"], dre=DRE_MEDIDA, status="enviado_para_dre")
+
+        view = IntercorrenciaDreViewSet.as_view({"get": "list"})
+        user = ExternalUser(
+            username="benchmark", cargo_codigo=int(settings.CODIGO_PERFIL_DRE), unidade_codigo_eol=DRE_MEDIDA
+        )
+        factory = APIRequestFactory()
+
+        outras = 0
+        self.stdout.write(f"{'outras DREs':>12} | {'mediana (ms)':>12} | {'p95 (ms)':>9}")
+        for tamanho in sorted(options["tamanhos"]):
+            if tamanho > outras:
+                self._inserir(tamanho - outras, dre=None, status="enviado_para_dre")
+                outras = tamanho
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Intercorrencia._meta.db_table}")
+
+            tempos = []
+            for _ in range(options["repeticoes"]):
+                request = factory.get("/api-intercorrencias/v1/dre/", {"status": "enviado_para_dre"})
+                force_authenticate(request, user=user)
+                inicio = time.perf_counter()
+                response = view(request)
+                response.render()
+                tempos.append((time.perf_counter() - inicio) * 1000)
+
+            tempos.sort()
+            p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+            self.stdout.write(f"{outras:>12} | {statistics.median(tempos):>12.1f} | {p95:>9.1f}")
+
+    def _inserir(self, quantidade: int, dre: str | None, status: str):
+        agora = timezone.now()
+        objs = [
+            Intercorrencia(
+                data_ocorrencia=agora,
+                user_username="benchmark",
+                unidade_codigo_eol=f"{i % 1000:06d}",
+                dre_codigo_eol=dre or f"{i % 12 + 100000:06d}",
+                status=status,
+            )
+            for i in range(quantidade)
+        ]
+        Intercorrencia.objects.bulk_create(objs, batch_size=5000)
@@ -0,0 +1,89 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+
+TEXTO_LONGO = "Relato detalhado da ocorrência no ambiente escolar. " * 200  # ~10 KB: vai para o TOAST
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede os bytes de WAL gerados por atualização de uma seção, gravando a linha "
+        "inteira (comportamento anterior) e só as colunas alteradas (ModeloBase.save). "
+        "Tudo roda numa transação desfeita ao final: nada é gravado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quantidade", type=int, default=200, help="Intercorrências atualizadas em cada modo.")
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+        try:
+            with transaction.atomic():
+                self._executar(options["quantidade"])
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def _executar(self, quantidade: int):
+        self._inserir(quantidade * 2)
+        objs = list(Intercorrencia.objects.defer("busca_texto").filter(user_username="benchmark"))
+        todas_as_colunas = [campo.name for campo in Intercorrencia._meta.concrete_fields if not campo.generated and not campo.primary_key]
+
+        def linha_inteira(obj):
+            obj.status = "enviado_para_dre"
+            obj.save(update_fields=todas_as_colunas)
+
+        def so_alteradas(obj):
+            obj.status = "enviado_para_dre"
+            obj.save()
+
+        def sem_alteracao(obj):
+            obj.save()
+
+        self.stdout.write(f"{'modo':>20} | {'WAL por atualização (bytes)':>28}")
+        for nome, atualizar, lote in (
+            ("linha inteira", linha_inteira, objs[:quantidade]),
+            ("só alteradas", so_alteradas, objs[quantidade:]),
+            ("sem alteração", sem_alteracao, objs[quantidade:]),
+        ):
+            inicio = self._lsn()
+            for obj in lote:
+                atualizar(obj)
+            self.stdout.write(f"{nome:>20} | {self._bytes_desde(inicio) / len(lote):>28.0f}")
+
+    def _lsn(self) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_current_wal_insert_lsn()")
+            return cursor.fetchone()[0]
+
+    def _bytes_desde(self, inicio: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)", [inicio])
+            return int(cursor.fetchone()[0])
+
+    def _inserir(self, quantidade: int):
+        agora = timezone.now()
+        Intercorrencia.objects.bulk_create(
+            [
+                Intercorrencia(
+                    data_ocorrencia=agora,
+                    user_username="benchmark",
+                    unidade_codigo_eol=f"{i % 1000:06d}",
+                    dre_codigo_eol="999999",
+                    descricao_ocorrencia=TEXTO_LONGO,
+                    interacao_ambiente_escolar=TEXTO_LONGO,
+                )
+                for i in range(quantidade)
+            ],
+            batch_size=1000,
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from intercorrencias.services import unidades_service
+
+
+class Command(BaseCommand):
+    help = "Sincroniza o espelho local de unidades (tabela Unidade) com o serviço de unidades."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--codigos",
+            nargs="+",
+            help="Sincroniza apenas os códigos EOL informados (via consulta em lote).",
+        )
+        parser.add_argument(
+            "--tamanho-lote",
+            type=int,
+            default=1000,
+            help="Quantidade de unidades gravadas por comando de upsert.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["codigos"]:
+                unidades = unidades_service._buscar_lote(options["codigos"]).values()
+            else:
+                unidades = unidades_service.listar_unidades()
+            total = unidades_service.sincronizar_unidades(unidades, tamanho_lote=options["tamanho_lote"])
+        except unidades_service.ExternalServiceError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(self.style.SUCCESS(f"{total} unidade(s) sincronizada(s)."))
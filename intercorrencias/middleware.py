@@ -0,0 +1,18 @@
+from django.conf import settings
+
+from intercorrencias.services import deadline
+
+
+class PrazoChamadasExternasMiddleware:
+    """
+    Define o orçamento de tempo (OUTBOUND_REQUEST_BUDGET, em segundos) que todas
+    as chamadas externas de uma requisição compartilham. Os timeouts de cada
+    chamada são limitados ao que resta dele.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with deadline.prazo(getattr(settings, "OUTBOUND_REQUEST_BUDGET", None)):
+            return self.get_response(request)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:51
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0018_intercorrencia_finalizado_gipe_em_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Unidade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('codigo_eol', models.CharField(max_length=6, unique=True, verbose_name='Código EOL')),
+                ('nome', models.CharField(max_length=255, verbose_name='Nome')),
+                ('dre_codigo_eol', models.CharField(blank=True, db_index=True, max_length=6, verbose_name='Código EOL da DRE')),
+                ('tipo', models.CharField(blank=True, max_length=50, verbose_name='Tipo da unidade')),
+            ],
+            options={
+                'verbose_name': 'Unidade',
+                'verbose_name_plural': 'Unidades',
+            },
+        ),
+    ]
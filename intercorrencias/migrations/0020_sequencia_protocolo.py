@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:03
+
+import re
+
+from django.db import migrations, models
+
+
+# Maior valor de um PositiveIntegerField (ultimo_numero)
+MAIOR_NUMERO = 2147483647
+
+
+def migrar_protocolos(apps, schema_editor):
+    """
+    Inicializa o contador de cada ano acima do maior número já emitido nesse
+    ano, sem alterar os protocolos existentes (já informados às unidades).
+
+    Os protocolos antigos (GIPE-AAAA/<timestamp><contador>) têm mais de 20
+    dígitos e não cabem no contador; como os novos números nunca chegam a esse
+    tamanho, não há risco de colisão e eles são ignorados aqui.
+    """
+    Intercorrencia = apps.get_model('intercorrencias', 'Intercorrencia')
+    SequenciaProtocolo = apps.get_model('intercorrencias', 'SequenciaProtocolo')
+
+    ultimos = {}
+    protocolos = (
+        Intercorrencia.objects
+        .exclude(protocolo_da_intercorrencia="")
+        .values_list("protocolo_da_intercorrencia", flat=True)
+    )
+    for protocolo in protocolos.iterator(chunk_size=2000):
+        partes = re.fullmatch(r"GIPE-(\d{4})/(\d+)", protocolo)
+        if not partes:
+            continue
+        ano, numero = int(partes.group(1)), int(partes.group(2))
+        if numero <= MAIOR_NUMERO:
+            ultimos[ano] = max(ultimos.get(ano, 0), numero)
+
+    SequenciaProtocolo.objects.bulk_create(
+        [SequenciaProtocolo(ano=ano, ultimo_numero=numero) for ano, numero in ultimos.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0019_unidade'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaProtocolo',
+            fields=[
+                ('ano', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Ano')),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, verbose_name='Último número emitido')),
+            ],
+            options={
+                'verbose_name': 'Sequência de protocolo',
+                'verbose_name_plural': 'Sequências de protocolo',
+            },
+        ),
+        migrations.RunPython(migrar_protocolos, migrations.RunPython.noop),
+    ]
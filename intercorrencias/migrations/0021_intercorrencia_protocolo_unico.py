@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0020_sequencia_protocolo'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='intercorrencia',
+            constraint=models.UniqueConstraint(condition=models.Q(('protocolo_da_intercorrencia', ''), _negated=True), fields=('protocolo_da_intercorrencia',), name='intercorrencia_protocolo_unico'),
+        ),
+    ]
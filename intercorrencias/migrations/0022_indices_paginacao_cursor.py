@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0021_intercorrencia_protocolo_unico'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='intercorrencia',
+            options={'ordering': ('-criado_em', '-id')},
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['-criado_em', '-id'], name='interc_criado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['user_username', '-criado_em', '-id'], name='interc_user_criado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['dre_codigo_eol', '-criado_em', '-id'], name='interc_dre_criado_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0022_indices_paginacao_cursor'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['dre_codigo_eol', 'status', '-criado_em', '-id'], name='interc_dre_status_criado_idx'),
+        ),
+    ]
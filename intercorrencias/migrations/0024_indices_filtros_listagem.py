@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:21
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0023_indice_dre_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['status', '-criado_em', '-id'], name='interc_status_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['data_ocorrencia'], name='interc_data_ocorrencia_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['sobre_furto_roubo_invasao_depredacao', '-criado_em', '-id'], name='interc_furto_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['motivacao_ocorrencia'], name='interc_motivacao_gin'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:23
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0024_indices_filtros_listagem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='intercorrencia',
+            name='busca_texto',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('descricao_ocorrencia', config='portuguese', weight='A'), '||', django.contrib.postgres.search.SearchVector('encaminhamentos_gipe', config='portuguese', weight='B'), django.contrib.postgres.search.SearchConfig('portuguese')), '||', django.contrib.postgres.search.SearchVector('interacao_ambiente_escolar', config='portuguese', weight='C'), django.contrib.postgres.search.SearchConfig('portuguese')), '||', django.contrib.postgres.search.SearchVector('redes_protecao_acompanhamento', config='portuguese', weight='C'), django.contrib.postgres.search.SearchConfig('portuguese')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busca_texto'], name='interc_busca_texto_gin'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Índice de trigramas da descrição, usado na busca de duplicatas. Exige a
+    extensão pg_trgm (pacote contrib do PostgreSQL): sem ela a migração falha,
+    em vez de registrar um índice que não existe no banco.
+    """
+
+    dependencies = [
+        ('intercorrencias', '0025_busca_texto'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['descricao_ocorrencia'], opclasses=['gin_trgm_ops'], name='interc_descricao_trgm_gin'
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intercorrencias', '0026_indice_trigrama_descricao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaidaDeEscopo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('intercorrencia_uuid', models.UUIDField(db_index=True, verbose_name='UUID da intercorrência')),
+                ('motivo', models.CharField(choices=[('mudou_de_escopo', 'Mudou de unidade/DRE'), ('excluida', 'Excluída')], max_length=20, verbose_name='Motivo')),
+                ('unidade_codigo_eol_anterior', models.CharField(max_length=6, verbose_name='Código EOL da unidade anterior')),
+                ('dre_codigo_eol_anterior', models.CharField(max_length=6, verbose_name='Código EOL da DRE anterior')),
+                ('unidade_codigo_eol_atual', models.CharField(blank=True, max_length=6, verbose_name='Código EOL da unidade atual')),
+                ('dre_codigo_eol_atual', models.CharField(blank=True, max_length=6, verbose_name='Código EOL da DRE atual')),
+                ('registrado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Registrado em')),
+            ],
+            options={
+                'verbose_name': 'Saída de escopo de intercorrência',
+                'verbose_name_plural': 'Saídas de escopo de intercorrências',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['atualizado_em', 'id'], name='interc_atualizado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intercorrencia',
+            index=models.Index(fields=['dre_codigo_eol', 'atualizado_em', 'id'], name='interc_dre_atualizado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saidadeescopo',
+            index=models.Index(fields=['registrado_em', 'id'], name='saida_registrado_id_idx'),
+        ),
+    ]
@@ -2,3 +2,6 @@ from .intercorrencia import Intercorrencia
 from .tipos_ocorrencia import TipoOcorrencia
 from .declarante import Declarante
 from .envolvido import Envolvido
+from .unidade import Unidade
+from .sequencia_protocolo import SequenciaProtocolo
+from .saida_de_escopo import SaidaDeEscopo
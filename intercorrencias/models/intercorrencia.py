@@ -1,6 +1,13 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField, TrigramSimilarity
 from .modelo_base import ModeloBase
+from .sequencia_protocolo import SequenciaProtocolo
 
 from intercorrencias.choices.info_agressor_choices import (
     MotivoOcorrencia,
@@ -17,6 +24,10 @@ from intercorrencias.choices.gipe_choices import (
 )
 
 
+def formatar_protocolo(ano: int, numero: int) -> str:
+    return f"GIPE-{ano}/{numero:06d}"
+
+
 class Intercorrencia(ModeloBase):
 
     STATUS_CHOICES = [
@@ -356,8 +367,48 @@ class Intercorrencia(ModeloBase):
         blank=True
     )
 
+    # Busca textual (português) nas narrativas; mantida pelo próprio PostgreSQL
+    busca_texto = models.GeneratedField(
+        expression=(
+            SearchVector("descricao_ocorrencia", config="portuguese", weight="A")
+            + SearchVector("encaminhamentos_gipe", config="portuguese", weight="B")
+            + SearchVector("interacao_ambiente_escolar", config="portuguese", weight="C")
+            + SearchVector("redes_protecao_acompanhamento", config="portuguese", weight="C")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
-        ordering = ("-criado_em",)
+        ordering = ("-criado_em", "-id")
+        indexes = [
+            # Paginação por cursor (criado_em, id) das listagens GIPE, Diretor e DRE
+            models.Index(fields=["-criado_em", "-id"], name="interc_criado_id_idx"),
+            models.Index(fields=["user_username", "-criado_em", "-id"], name="interc_user_criado_id_idx"),
+            models.Index(fields=["dre_codigo_eol", "-criado_em", "-id"], name="interc_dre_criado_id_idx"),
+            # Feed de alterações (api/alteracoes.py): keyset crescente por (atualizado_em, id)
+            models.Index(fields=["atualizado_em", "id"], name="interc_atualizado_id_idx"),
+            models.Index(fields=["dre_codigo_eol", "atualizado_em", "id"], name="interc_dre_atualizado_id_idx"),
+            # Listagem da DRE filtrada por status
+            models.Index(fields=["dre_codigo_eol", "status", "-criado_em", "-id"], name="interc_dre_status_criado_idx"),
+            # Filtros das listagens (ver api/filters.py); unidade_codigo_eol já tem db_index
+            models.Index(fields=["status", "-criado_em", "-id"], name="interc_status_criado_idx"),
+            models.Index(fields=["data_ocorrencia"], name="interc_data_ocorrencia_idx"),
+            models.Index(
+                fields=["sobre_furto_roubo_invasao_depredacao", "-criado_em", "-id"], name="interc_furto_criado_idx"
+            ),
+            GinIndex(fields=["motivacao_ocorrencia"], name="interc_motivacao_gin"),
+            GinIndex(fields=["busca_texto"], name="interc_busca_texto_gin"),
+            # Candidatas a duplicata (operador % do pg_trgm)
+            GinIndex(fields=["descricao_ocorrencia"], opclasses=["gin_trgm_ops"], name="interc_descricao_trgm_gin"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["protocolo_da_intercorrencia"],
+                condition=~models.Q(protocolo_da_intercorrencia=""),
+                name="intercorrencia_protocolo_unico",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.unidade_codigo_eol} @ {self.data_ocorrencia:%d/%m/%Y %H:%M}"
@@ -365,22 +416,34 @@ class Intercorrencia(ModeloBase):
     @staticmethod
     def gerar_protocolo():
         """
-        Gera um protocolo único no formato: GIPE-2025/XXXXXXXXXXXXX
-        onde XXXXXXXXXXXXX é um timestamp + contador sequencial para garantir unicidade.
+        Gera um protocolo único no formato GIPE-AAAA/NNNNNN, com numeração
+        sequencial por ano (ver SequenciaProtocolo). Deve ser chamado dentro da
+        transação que grava o protocolo, para não deixar lacunas na numeração.
         """
-        import time
-        from datetime import datetime
-        
-        ano_atual = datetime.now().year
-        timestamp = int(time.time() * 1000000)  # timestamp em microsegundos
-        
-        # Conta quantas intercorrências já foram criadas no banco para adicionar um contador
-        contador = Intercorrencia.objects.count() + 1
-        
-        # Gera o identificador único combinando timestamp e contador
-        identificador = f"{timestamp}{contador:05d}"
-        
-        return f"GIPE-{ano_atual}/{identificador}"
+        ano = timezone.localdate().year
+        numero = SequenciaProtocolo.proximo_numero(ano)
+        return formatar_protocolo(ano, numero)
+
+    def candidatas_a_duplicata(self):
+        """
+        Intercorrências da mesma unidade, ocorridas até INTERCORRENCIAS_DUPLICATAS_JANELA_DIAS
+        antes ou depois desta, com descrição parecida (operador % do pg_trgm, limiar em
+        pg_trgm.similarity_threshold). Anotadas com `similaridade`, da mais parecida à menos.
+        """
+        if not self.descricao_ocorrencia.strip():
+            return Intercorrencia.objects.none()
+
+        janela = timedelta(days=settings.INTERCORRENCIAS_DUPLICATAS_JANELA_DIAS)
+        return (
+            Intercorrencia.objects.filter(
+                unidade_codigo_eol=self.unidade_codigo_eol,
+                data_ocorrencia__range=(self.data_ocorrencia - janela, self.data_ocorrencia + janela),
+                descricao_ocorrencia__trigram_similar=self.descricao_ocorrencia,
+            )
+            .exclude(pk=self.pk)
+            .annotate(similaridade=TrigramSimilarity("descricao_ocorrencia", self.descricao_ocorrencia))
+            .order_by("-similaridade", "-criado_em", "-id")
+        )
 
     @property
     def pode_ser_editado_por_diretor(self):
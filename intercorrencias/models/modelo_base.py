@@ -1,3 +1,4 @@
+import copy
 import uuid
 from django.db import models
 
@@ -6,5 +7,72 @@ class ModeloBase(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
 
+    # Valores das colunas como estão no banco (attname -> valor); None enquanto a instância não foi gravada/lida
+    _valores_carregados = None
+
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._guardar_valores_carregados()
+        return instance
+
+    @property
+    def valores_carregados(self) -> dict | None:
+        return self._valores_carregados
+
+    def _campos_rastreados(self):
+        # Colunas geradas são mantidas pelo banco; a chave primária não muda
+        return [campo for campo in self._meta.concrete_fields if not campo.generated and not campo.primary_key]
+
+    def _guardar_valores_carregados(self, nomes=None):
+        campos = self._campos_rastreados()
+        if nomes:
+            nomes = set(nomes)
+            campos = [campo for campo in campos if campo.name in nomes or campo.attname in nomes]
+        if self._valores_carregados is None:
+            self._valores_carregados = {}
+        for campo in campos:
+            # Campos adiados (defer/only) ficam de fora até serem lidos ou atribuídos
+            if campo.attname in self.__dict__:
+                # Cópia: listas (ArrayField) alteradas no lugar também contam como alteração
+                self._valores_carregados[campo.attname] = copy.copy(self.__dict__[campo.attname])
+
+    def campos_alterados(self) -> list[str]:
+        """Campos cujo valor difere do que foi lido do banco (todos, se a instância nunca foi gravada)."""
+        carregados = self._valores_carregados or {}
+        return [
+            campo.name
+            for campo in self._campos_rastreados()
+            if campo.attname in self.__dict__
+            and (campo.attname not in carregados or carregados[campo.attname] != self.__dict__[campo.attname])
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Instâncias já gravadas atualizam só as colunas alteradas (mais atualizado_em)
+        e não vão ao banco quando nada mudou; assim o UPDATE não reescreve a linha
+        inteira (nem os TextFields grandes, guardados no TOAST). `update_fields`
+        explícito continua valendo como no Django.
+        """
+        rastreavel = (
+            not args
+            and not self._state.adding
+            and self._valores_carregados is not None
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        )
+        if rastreavel:
+            alterados = self.campos_alterados()
+            if not alterados:
+                return
+            kwargs["update_fields"] = [*alterados, "atualizado_em"]
+
+        super().save(*args, **kwargs)
+        self._guardar_valores_carregados(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._guardar_valores_carregados(fields)
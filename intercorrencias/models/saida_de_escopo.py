@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SaidaDeEscopo(models.Model):
+    """
+    Marca (tombstone) de uma intercorrência que deixou o escopo de unidade/DRE
+    em que estava: mudou de unidade ou foi excluída. O feed de alterações usa
+    estes registros para avisar quem já a tinha recebido.
+    """
+
+    MOTIVO_CHOICES = [
+        ("mudou_de_escopo", "Mudou de unidade/DRE"),
+        ("excluida", "Excluída"),
+    ]
+
+    intercorrencia_uuid = models.UUIDField("UUID da intercorrência", db_index=True)
+    motivo = models.CharField("Motivo", max_length=20, choices=MOTIVO_CHOICES)
+    unidade_codigo_eol_anterior = models.CharField("Código EOL da unidade anterior", max_length=6)
+    dre_codigo_eol_anterior = models.CharField("Código EOL da DRE anterior", max_length=6)
+    # Em branco quando a intercorrência foi excluída
+    unidade_codigo_eol_atual = models.CharField("Código EOL da unidade atual", max_length=6, blank=True)
+    dre_codigo_eol_atual = models.CharField("Código EOL da DRE atual", max_length=6, blank=True)
+    registrado_em = models.DateTimeField("Registrado em", default=timezone.now)
+
+    class Meta:
+        verbose_name = "Saída de escopo de intercorrência"
+        verbose_name_plural = "Saídas de escopo de intercorrências"
+        indexes = [
+            # Feed de alterações: WHERE (registrado_em, id) > (marca) ORDER BY registrado_em, id
+            models.Index(fields=["registrado_em", "id"], name="saida_registrado_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.intercorrencia_uuid} ({self.motivo})"
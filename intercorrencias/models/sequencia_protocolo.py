@@ -0,0 +1,37 @@
+from django.db import connection, models
+
+
+class SequenciaProtocolo(models.Model):
+    """
+    Contador de protocolos por ano: uma linha por ano com o último número emitido.
+    """
+
+    ano = models.PositiveIntegerField("Ano", primary_key=True)
+    ultimo_numero = models.PositiveIntegerField("Último número emitido", default=0)
+
+    class Meta:
+        verbose_name = "Sequência de protocolo"
+        verbose_name_plural = "Sequências de protocolo"
+
+    def __str__(self):
+        return f"{self.ano}: {self.ultimo_numero}"
+
+    @classmethod
+    def proximo_numero(cls, ano: int) -> int:
+        """
+        Reserva o próximo número do ano num único comando (upsert com RETURNING).
+        A linha do ano fica bloqueada até o fim da transação, então duas
+        submissões simultâneas nunca recebem o mesmo número; se a transação for
+        desfeita, o número volta a ficar disponível.
+        """
+        tabela = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {tabela} (ano, ultimo_numero) VALUES (%s, 1)
+                ON CONFLICT (ano) DO UPDATE SET ultimo_numero = {tabela}.ultimo_numero + 1
+                RETURNING ultimo_numero
+                """,
+                [ano],
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,31 @@
+from django.db import models
+from .modelo_base import ModeloBase
+
+
+class Unidade(ModeloBase):
+    """
+    Espelho local do catálogo de unidades (serviço de unidades), mantido pelo
+    comando `sincronizar_unidades`. Permite resolver nomes de unidade/DRE sem
+    chamadas HTTP.
+    """
+
+    codigo_eol = models.CharField("Código EOL", max_length=6, unique=True)
+    nome = models.CharField("Nome", max_length=255)
+    dre_codigo_eol = models.CharField("Código EOL da DRE", max_length=6, blank=True, db_index=True)
+    tipo = models.CharField("Tipo da unidade", max_length=50, blank=True)
+
+    class Meta:
+        verbose_name = "Unidade"
+        verbose_name_plural = "Unidades"
+
+    def __str__(self):
+        return f"{self.codigo_eol} - {self.nome}"
+
+    def como_dict(self) -> dict:
+        """Mesmo formato devolvido pelo serviço de unidades."""
+        return {
+            "codigo_eol": self.codigo_eol,
+            "nome": self.nome,
+            "dre_codigo_eol": self.dre_codigo_eol,
+            "tipo_unidade": self.tipo,
+        }
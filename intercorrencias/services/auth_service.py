@@ -0,0 +1,161 @@
+import time
+import logging
+
+import jwt
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from intercorrencias.services import http_client
+from intercorrencias.services.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class ChaveIndisponivelError(Exception): ...
+
+
+JWKS_CACHE_KEY = "auth:jwks"
+REVOGADOS_CACHE_KEY = "auth:revogados"
+# Intervalo mínimo entre sincronizações forçadas por `kid` desconhecido
+JWKS_INTERVALO_MINIMO = 30
+
+# Circuito do serviço de Auth: compartilhado por verificação, JWKS e revogação
+circuito = CircuitBreaker("auth")
+
+# Cópias locais do processo: evitam ir ao cache compartilhado a cada requisição.
+_jwks_local: dict = {"dados": None, "atualizado_em": 0.0, "chaves": {}, "origem": None}
+_revogados_local: dict = {"dados": None, "atualizado_em": 0.0, "conjunto": frozenset(), "origem": None}
+
+
+def limpar_estado_local():
+    """Descarta as cópias locais de JWKS e lista de revogação (usado em testes)."""
+    _jwks_local.update({"dados": None, "atualizado_em": 0.0, "chaves": {}, "origem": None})
+    _revogados_local.update({"dados": None, "atualizado_em": 0.0, "conjunto": frozenset(), "origem": None})
+
+
+def _sincronizar(local: dict, cache_key: str, intervalo: int, buscar, forcar: bool = False):
+    """
+    Retorna os dados mais recentes de uma fonte remota sincronizada periodicamente.
+
+    A ordem de consulta é: cópia local do processo -> cache compartilhado -> serviço remoto.
+    O cache guarda o último valor válido sem expiração, então, se o serviço remoto
+    falhar, o último valor conhecido continua sendo usado.
+    """
+    agora = time.time()
+    if not forcar and local["dados"] is not None and agora - local["atualizado_em"] < intervalo:
+        return local["dados"]
+
+    compartilhado = cache.get(cache_key)
+    if not forcar and compartilhado and agora - compartilhado["atualizado_em"] < intervalo:
+        local.update(dados=compartilhado["dados"], atualizado_em=compartilhado["atualizado_em"])
+        return local["dados"]
+
+    try:
+        dados = buscar()
+    except (requests.RequestException, ValueError) as e:
+        ultimo = compartilhado["dados"] if compartilhado else local["dados"]
+        if ultimo is None:
+            raise ChaveIndisponivelError(f"Falha ao sincronizar {cache_key}: {e}") from e
+        logger.warning("Falha ao sincronizar %s, usando último valor conhecido: %s", cache_key, e)
+        return ultimo
+
+    cache.set(cache_key, {"dados": dados, "atualizado_em": agora}, None)
+    local.update(dados=dados, atualizado_em=agora)
+    return dados
+
+
+def _buscar_jwks() -> dict:
+    logger.info("Sincronizando JWKS: %s", settings.AUTH_JWKS_URL)
+    r = circuito.chamar(http_client.get, settings.AUTH_JWKS_URL, timeout=3.0)
+    r.raise_for_status()
+    return r.json()
+
+
+def _buscar_revogados() -> list[str]:
+    logger.info("Sincronizando lista de revogação: %s", settings.AUTH_REVOCATION_URL)
+    r = circuito.chamar(http_client.get, settings.AUTH_REVOCATION_URL, timeout=3.0)
+    r.raise_for_status()
+    dados = r.json()
+    if isinstance(dados, dict):
+        dados = dados.get("revogados", [])
+    return [str(item) for item in dados]
+
+
+def get_jwks(forcar: bool = False) -> dict:
+    return _sincronizar(
+        _jwks_local, JWKS_CACHE_KEY, settings.AUTH_JWKS_REFRESH_SECONDS, _buscar_jwks, forcar
+    )
+
+
+def get_chave_publica(kid: str | None):
+    """
+    Retorna a chave para validar a assinatura do token.
+
+    Sem AUTH_JWKS_URL usa a chave estática (AUTH_PUBLIC_KEY ou SECRET_KEY).
+    Com JWKS, um `kid` desconhecido força uma nova sincronização (rotação de chave),
+    no máximo uma vez a cada JWKS_INTERVALO_MINIMO segundos.
+    """
+    if not settings.AUTH_JWKS_URL:
+        return getattr(settings, "AUTH_PUBLIC_KEY", settings.SECRET_KEY)
+
+    for forcar in (False, True):
+        if forcar and time.time() - _jwks_local["atualizado_em"] < JWKS_INTERVALO_MINIMO:
+            break
+
+        chaves = carregar_chaves(forcar=forcar)
+        if kid in chaves:
+            return chaves[kid]
+        if kid is None and len(chaves) == 1:
+            return next(iter(chaves.values()))
+
+    raise ChaveIndisponivelError(f"Chave '{kid}' não encontrada no JWKS.")
+
+
+def carregar_chaves(forcar: bool = False) -> dict:
+    """
+    Chaves utilizáveis do JWKS (kid -> chave). Levanta ChaveIndisponivelError se
+    o JWKS não puder ser obtido ou se nenhuma das chaves puder ser carregada.
+    """
+    dados = get_jwks(forcar=forcar)
+    if _jwks_local["origem"] is not dados:
+        _jwks_local.update(chaves=_montar_chaves(dados), origem=dados)
+    return _jwks_local["chaves"]
+
+
+def _montar_chaves(dados: dict) -> dict:
+    chaves = {}
+    recebidas = dados.get("keys", [])
+    for jwk in recebidas:
+        try:
+            chaves[jwk.get("kid")] = jwt.PyJWK(jwk).key
+        except (jwt.PyJWKError, jwt.InvalidKeyError) as e:
+            # Sem o pacote cryptography, toda chave RSA/EC cai aqui (MissingCryptographyError)
+            logger.warning("Chave do JWKS ignorada (kid=%s): %s", jwk.get("kid"), e)
+    if not chaves:
+        logger.error("Nenhuma chave utilizável no JWKS (%d recebidas).", len(recebidas))
+        raise ChaveIndisponivelError(f"Nenhuma chave utilizável no JWKS ({len(recebidas)} recebidas).")
+    return chaves
+
+
+def get_revogados() -> frozenset[str]:
+    """
+    Conjunto de identificadores (`jti`) revogados.
+    Se a lista nunca pôde ser sincronizada, considera que não há revogações.
+    """
+    if not settings.AUTH_REVOCATION_URL:
+        return frozenset()
+    try:
+        dados = _sincronizar(
+            _revogados_local,
+            REVOGADOS_CACHE_KEY,
+            settings.AUTH_REVOCATION_REFRESH_SECONDS,
+            _buscar_revogados,
+        )
+    except ChaveIndisponivelError as e:
+        logger.warning("Lista de revogação indisponível: %s", e)
+        return frozenset()
+
+    if _revogados_local["origem"] is not dados:
+        _revogados_local.update(conjunto=frozenset(dados), origem=dados)
+    return _revogados_local["conjunto"]
@@ -0,0 +1,130 @@
+import time
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+# Sentinela para diferenciar "ausente" de um valor None armazenado
+AUSENTE = object()
+
+
+class LocalLRUCache:
+    """
+    Cache em memória do processo, limitado a `maxsize` entradas (LRU),
+    com expiração por entrada. Seguro para uso entre threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._dados: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=AUSENTE):
+        with self._lock:
+            item = self._dados.get(key, AUSENTE)
+            if item is AUSENTE:
+                return default
+            valor, expira_em = item
+            if expira_em is not None and expira_em <= time.monotonic():
+                del self._dados[key]
+                return default
+            self._dados.move_to_end(key)
+            return valor
+
+    def set(self, key, valor, ttl: float | None = None):
+        expira_em = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._dados[key] = (valor, expira_em)
+            self._dados.move_to_end(key)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._dados.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self):
+        return len(self._dados)
+
+
+class TwoTierCache:
+    """
+    Cache em duas camadas: LRU local do processo (L1) na frente do cache
+    do Django (L2), que é compartilhado entre os workers.
+
+    O L1 nunca guarda uma entrada por mais de `l1_ttl` segundos, para que
+    invalidações feitas no L2 por outro worker se propaguem.
+    Mantém contadores de acertos/falhas por camada, expostos em `stats()`.
+    """
+
+    def __init__(self, prefixo: str, maxsize: int = 1024, l1_ttl: float | None = 30):
+        self.prefixo = prefixo
+        self.l1_ttl = l1_ttl
+        self.l1 = LocalLRUCache(maxsize)
+        self._contadores = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "sets": 0}
+        self._lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefixo}:{key}"
+
+    def _contar(self, nome: str):
+        with self._lock:
+            self._contadores[nome] += 1
+
+    def _ttl_l1(self, ttl):
+        if self.l1_ttl is None:
+            return ttl
+        return self.l1_ttl if ttl is None else min(ttl, self.l1_ttl)
+
+    def get(self, key: str, default=None):
+        valor = self.l1.get(key)
+        if valor is not AUSENTE:
+            self._contar("l1_hits")
+            return valor
+
+        valor = cache.get(self._key(key), AUSENTE)
+        if valor is not AUSENTE:
+            self._contar("l2_hits")
+            self.l1.set(key, valor, self.l1_ttl)
+            return valor
+
+        self._contar("misses")
+        return default
+
+    def get_compartilhado(self, key: str, default=None):
+        """Lê direto do L2 (ignorando o L1) e atualiza o L1 com o valor encontrado."""
+        valor = cache.get(self._key(key), AUSENTE)
+        if valor is AUSENTE:
+            return default
+        self.l1.set(key, valor, self.l1_ttl)
+        return valor
+
+    def set(self, key: str, valor, ttl: float | None):
+        self._contar("sets")
+        self.l1.set(key, valor, self._ttl_l1(ttl))
+        cache.set(self._key(key), valor, ttl)
+
+    def delete(self, key: str):
+        self.l1.delete(key)
+        cache.delete(self._key(key))
+
+    def limpar_local(self):
+        """Descarta apenas a camada L1 (ex.: simular outro worker em testes)."""
+        self.l1.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            dados = dict(self._contadores)
+        total = dados["l1_hits"] + dados["l2_hits"] + dados["misses"]
+        dados["hit_rate"] = (dados["l1_hits"] + dados["l2_hits"]) / total if total else 0.0
+        dados["l1_size"] = len(self.l1)
+        return dados
+
+    def reset_stats(self):
+        with self._lock:
+            for nome in self._contadores:
+                self._contadores[nome] = 0
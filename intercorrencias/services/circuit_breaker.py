@@ -0,0 +1,102 @@
+import time
+import logging
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from intercorrencias.services.deadline import PrazoEsgotadoError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitoAbertoError(requests.ConnectionError):
+    """Chamada recusada sem ir à rede: o circuito da dependência está aberto."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker com estado compartilhado entre os workers via cache do Django.
+
+    - Fechado: as chamadas passam; falhas (erros de rede e respostas 5xx) são
+      contadas numa janela de CIRCUIT_BREAKER_WINDOW segundos.
+    - Aberto: ao atingir CIRCUIT_BREAKER_FAILURES falhas, as chamadas falham na
+      hora com CircuitoAbertoError por CIRCUIT_BREAKER_OPEN_SECONDS segundos.
+    - Meio-aberto: passado esse tempo, uma única chamada de teste (entre todos
+      os workers) é liberada; sucesso fecha o circuito, falha o reabre.
+
+    CircuitoAbertoError é um `requests.ConnectionError`, então os tratamentos
+    de falha de rede já existentes (fallback para cache, último valor
+    conhecido) valem também para o circuito aberto.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._falhas_key = f"cb:{nome}:falhas"
+        self._aberto_key = f"cb:{nome}:aberto"
+        self._sonda_key = f"cb:{nome}:sonda"
+
+    @property
+    def limite_falhas(self) -> int:
+        return settings.CIRCUIT_BREAKER_FAILURES
+
+    @property
+    def tempo_aberto(self) -> float:
+        return settings.CIRCUIT_BREAKER_OPEN_SECONDS
+
+    def estado(self) -> str:
+        reabre_em = cache.get(self._aberto_key)
+        if reabre_em is None:
+            return "fechado"
+        return "aberto" if time.time() < reabre_em else "meio-aberto"
+
+    def permitir(self) -> bool:
+        reabre_em = cache.get(self._aberto_key)
+        if reabre_em is None:
+            return True
+        if time.time() < reabre_em:
+            return False
+        # Meio-aberto: só um worker faz a chamada de teste
+        return cache.add(self._sonda_key, 1, max(1, int(self.tempo_aberto)))
+
+    def registrar_sucesso(self):
+        estado = cache.get_many([self._falhas_key, self._aberto_key])
+        if not estado:
+            return  # caso comum: circuito fechado e sem falhas, nada a gravar
+        if self._aberto_key in estado:
+            logger.info("Circuito %s fechado.", self.nome)
+        cache.delete_many([self._falhas_key, self._aberto_key, self._sonda_key])
+
+    def registrar_falha(self):
+        cache.add(self._falhas_key, 0, settings.CIRCUIT_BREAKER_WINDOW)
+        try:
+            falhas = cache.incr(self._falhas_key)
+        except ValueError:  # expirou entre o add e o incr
+            cache.set(self._falhas_key, 1, settings.CIRCUIT_BREAKER_WINDOW)
+            falhas = 1
+
+        if falhas >= self.limite_falhas or self.estado() == "meio-aberto":
+            logger.warning("Circuito %s aberto após %d falha(s).", self.nome, falhas)
+            # A chave sobrevive ao período aberto para sinalizar o meio-aberto
+            cache.set(self._aberto_key, time.time() + self.tempo_aberto, int(self.tempo_aberto) * 10 + 60)
+            cache.delete(self._sonda_key)
+
+    def chamar(self, fn, *args, **kwargs):
+        """Executa a chamada HTTP `fn` sob o circuito e devolve a resposta."""
+        if not self.permitir():
+            raise CircuitoAbertoError(f"Circuito {self.nome} aberto: chamada recusada.")
+
+        try:
+            resposta = fn(*args, **kwargs)
+        except PrazoEsgotadoError:
+            raise  # o orçamento da requisição acabou; não é falha da dependência
+        except requests.RequestException:
+            self.registrar_falha()
+            raise
+
+        status = getattr(resposta, "status_code", None)
+        if isinstance(status, int) and status >= 500:
+            self.registrar_falha()
+        else:
+            self.registrar_sucesso()
+        return resposta
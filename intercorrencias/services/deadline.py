@@ -0,0 +1,58 @@
+import time
+import contextvars
+from contextlib import contextmanager
+
+import requests
+
+# Instante (time.monotonic) limite para as chamadas externas da requisição atual
+_prazo: contextvars.ContextVar[float | None] = contextvars.ContextVar("prazo_requisicao", default=None)
+
+
+class PrazoEsgotadoError(requests.Timeout):
+    """O orçamento de tempo da requisição para chamadas externas acabou."""
+
+
+@contextmanager
+def prazo(segundos: float | None):
+    """
+    Define o orçamento de tempo das chamadas externas feitas dentro do bloco.
+    Blocos aninhados nunca estendem o prazo já em vigor.
+    """
+    if not segundos:
+        yield
+        return
+
+    limite = time.monotonic() + segundos
+    atual = _prazo.get()
+    if atual is not None:
+        limite = min(limite, atual)
+
+    token = _prazo.set(limite)
+    try:
+        yield
+    finally:
+        _prazo.reset(token)
+
+
+def restante() -> float | None:
+    """Segundos restantes do orçamento (None se não houver prazo em vigor)."""
+    limite = _prazo.get()
+    if limite is None:
+        return None
+    return limite - time.monotonic()
+
+
+def limitar(timeout: float) -> float:
+    """Reduz `timeout` ao que resta do orçamento; sem orçamento, levanta PrazoEsgotadoError."""
+    sobra = restante()
+    if sobra is None:
+        return timeout
+    if sobra <= 0:
+        raise PrazoEsgotadoError("Prazo da requisição para chamadas externas esgotado.")
+    return min(timeout, sobra)
+
+
+def cabe(segundos: float) -> bool:
+    """Se ainda sobra mais que `segundos` do orçamento (sempre True sem prazo em vigor)."""
+    sobra = restante()
+    return sobra is None or sobra > segundos
@@ -0,0 +1,146 @@
+import os
+import time
+import random
+import logging
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from intercorrencias.services import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado para as chamadas a serviços externos.
+
+    - Uma `requests.Session` por processo, com pool de conexões keep-alive por host.
+    - Timeout de conexão (HTTP_CONNECT_TIMEOUT) separado do timeout de leitura,
+      informado por chamada em `timeout`. Ambos são limitados pelo prazo da
+      requisição em curso (ver `deadline`); sem prazo restante, a chamada nem
+      é feita (PrazoEsgotadoError).
+    - GETs (idempotentes) são repetidos até HTTP_GET_RETRIES vezes em falhas de
+      conexão e em 502/503/504, com backoff exponencial limitado e jitter.
+      Cada tentativa recalcula o timeout pelo prazo restante, e não há nova
+      tentativa se o backoff não couber nele. Timeouts de leitura não são
+      repetidos: o serviço está lento, e repetir só empilharia esperas.
+      POSTs nunca são repetidos automaticamente.
+    """
+
+    STATUS_REPETIVEIS = (502, 503, 504)
+
+    def __init__(self):
+        self._pid = None
+        self._session: requests.Session | None = None
+        self._lock = threading.Lock()
+
+    def _criar_session(self) -> requests.Session:
+        # As repetições de GET ficam em `get`, não no urllib3: lá cada tentativa
+        # respeita o prazo da requisição
+        adapter = HTTPAdapter(
+            pool_connections=settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+            max_retries=0,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _backoff(self, tentativa: int) -> float:
+        base = settings.HTTP_RETRY_BACKOFF
+        return min(settings.HTTP_RETRY_BACKOFF_MAX, base * (2 ** tentativa)) + random.uniform(0, base)
+
+    @property
+    def session(self) -> requests.Session:
+        # Recria a sessão após fork (workers do gunicorn não compartilham sockets)
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    self._session = self._criar_session()
+                    self._pid = os.getpid()
+        return self._session
+
+    def _timeout(self, timeout: float | None):
+        leitura = timeout if timeout is not None else settings.HTTP_READ_TIMEOUT
+        # Dentro de uma requisição, os timeouts saem do orçamento restante dela
+        leitura = deadline.limitar(leitura)
+        return (min(settings.HTTP_CONNECT_TIMEOUT, leitura), leitura)
+
+    def get(self, url: str, timeout: float | None = None, **kwargs) -> requests.Response:
+        tentativas = settings.HTTP_GET_RETRIES
+        for tentativa in range(tentativas + 1):
+            ultima = tentativa == tentativas
+            try:
+                r = self.session.get(url, timeout=self._timeout(timeout), **kwargs)
+            except deadline.PrazoEsgotadoError:
+                raise
+            except requests.ConnectionError:
+                # ConnectTimeout é ConnectionError; ReadTimeout não (não é repetido)
+                espera = self._backoff(tentativa)
+                if ultima or not deadline.cabe(espera):
+                    raise
+                logger.warning("GET %s: falha de conexão, nova tentativa em %.2fs", url, espera)
+                time.sleep(espera)
+                continue
+
+            if r.status_code not in self.STATUS_REPETIVEIS or ultima:
+                return r
+            espera = self._backoff(tentativa)
+            if not deadline.cabe(espera):
+                return r
+            logger.warning("GET %s: HTTP %s, nova tentativa em %.2fs", url, r.status_code, espera)
+            r.close()
+            time.sleep(espera)
+        return r
+
+    def post(self, url: str, json=None, timeout: float | None = None, **kwargs) -> requests.Response:
+        return self.session.post(url, json=json, timeout=self._timeout(timeout), **kwargs)
+
+    def pool_stats(self) -> dict[str, dict]:
+        """
+        Estatísticas dos pools por host, para dimensionar HTTP_POOL_MAXSIZE:
+        conexões abertas até agora, requisições feitas e conexões ociosas no pool.
+        """
+        if self._session is None:
+            return {}
+
+        stats = {}
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for chave in pools.keys():
+                pool = pools.get(chave)
+                if pool is None:
+                    continue
+                ociosas = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+                stats[f"{chave.key_scheme}://{chave.key_host}:{chave.key_port}"] = {
+                    "maxsize": pool.pool.maxsize if pool.pool else 0,
+                    "num_connections": pool.num_connections,
+                    "num_requests": pool.num_requests,
+                    "idle": ociosas,
+                }
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+
+
+client = HttpClient()
+
+
+def get(url: str, timeout: float | None = None, **kwargs) -> requests.Response:
+    return client.get(url, timeout=timeout, **kwargs)
+
+
+def post(url: str, json=None, timeout: float | None = None, **kwargs) -> requests.Response:
+    return client.post(url, json=json, timeout=timeout, **kwargs)
+
+
+def pool_stats() -> dict[str, dict]:
+    return client.pool_stats()
@@ -0,0 +1,49 @@
+import time
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Limitador token-bucket com estado no cache do Django (compartilhado entre workers).
+
+    Cada chave começa com `capacidade` fichas, que são repostas à taxa de
+    `taxa` fichas por segundo. A leitura/escrita não é atômica entre workers:
+    sob concorrência o limite pode ser ultrapassado em poucas fichas, o que é
+    aceitável para proteção contra rajadas.
+    """
+
+    def __init__(self, prefixo: str, capacidade: float, taxa: float):
+        if taxa <= 0 or capacidade < 1:
+            # Taxa zero daria espera infinita (Throttled não a representa)
+            raise ValueError("TokenBucket exige taxa > 0 e capacidade >= 1.")
+        self.prefixo = prefixo
+        self.capacidade = float(capacidade)
+        self.taxa = float(taxa)
+
+    def _key(self, chave: str) -> str:
+        return f"{self.prefixo}:{chave}"
+
+    def consumir(self, chave: str, fichas: float = 1.0) -> float:
+        """
+        Tenta consumir `fichas`. Retorna 0 se permitido, ou os segundos de
+        espera até haver fichas suficientes.
+        """
+        agora = time.time()
+        estado = cache.get(self._key(chave)) or {"fichas": self.capacidade, "ts": agora}
+
+        disponiveis = min(self.capacidade, estado["fichas"] + (agora - estado["ts"]) * self.taxa)
+        if disponiveis < fichas:
+            espera = (fichas - disponiveis) / self.taxa
+            cache.set(self._key(chave), {"fichas": disponiveis, "ts": agora}, self._ttl())
+            return espera
+
+        cache.set(self._key(chave), {"fichas": disponiveis - fichas, "ts": agora}, self._ttl())
+        return 0.0
+
+    def _ttl(self) -> int:
+        # Tempo para o balde encher de novo; depois disso o estado pode ser descartado
+        return max(1, int(self.capacidade / self.taxa) + 1)
@@ -0,0 +1,112 @@
+import time
+import logging
+import threading
+
+from django.core.cache import cache
+
+from intercorrencias.services import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class _Chamada:
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce execuções concorrentes da mesma operação (mesma `chave`).
+
+    - Entre threads do processo: só a primeira chamada executa `fn`; as demais
+      aguardam e recebem o mesmo resultado (ou a mesma exceção).
+    - Entre workers: o líder obtém um lock no cache do Django (`cache.add`) e
+      publica o resultado por `resultado_ttl` segundos. Um worker que encontra
+      o lock ocupado aguarda esse resultado por até `espera_max` segundos; se o
+      líder falhar ou demorar demais, executa `fn` por conta própria.
+
+    As duas esperas também são limitadas pelo prazo da requisição em curso (ver
+    `deadline`): esgotado o prazo, a espera termina com PrazoEsgotadoError em vez
+    de executar `fn` sem tempo para isso.
+    """
+
+    def __init__(
+        self,
+        prefixo: str,
+        lock_ttl: float = 10,
+        espera_max: float = 5,
+        intervalo: float = 0.05,
+        resultado_ttl: float = 5,
+    ):
+        self.prefixo = prefixo
+        self.lock_ttl = lock_ttl
+        self.espera_max = espera_max
+        self.intervalo = intervalo
+        self.resultado_ttl = resultado_ttl
+        self._chamadas: dict[str, _Chamada] = {}
+        self._lock = threading.Lock()
+
+    def do(self, chave: str, fn):
+        with self._lock:
+            chamada = self._chamadas.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = self._chamadas[chave] = _Chamada()
+
+        if not lider:
+            if not chamada.evento.wait(self._espera()):
+                logger.warning("SingleFlight %s: espera esgotada para %s", self.prefixo, chave)
+                return self._executar_se_houver_prazo(fn)
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = self._executar_entre_workers(chave, fn)
+            return chamada.resultado
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                self._chamadas.pop(chave, None)
+            chamada.evento.set()
+
+    def _executar_entre_workers(self, chave: str, fn):
+        lock_key = f"sf:{self.prefixo}:lock:{chave}"
+        resultado_key = f"sf:{self.prefixo}:resultado:{chave}"
+
+        if cache.add(lock_key, 1, self.lock_ttl):
+            try:
+                resultado = fn()
+                # Guardado em tupla para distinguir um resultado None de "ausente"
+                cache.set(resultado_key, (resultado,), self.resultado_ttl)
+                return resultado
+            finally:
+                cache.delete(lock_key)
+
+        # Outro worker está executando: aguarda o resultado publicado por ele
+        prazo = time.monotonic() + self._espera()
+        while time.monotonic() < prazo:
+            publicado = cache.get(resultado_key)
+            if publicado is not None:
+                return publicado[0]
+            if cache.get(lock_key) is None:
+                break  # o líder terminou sem publicar (erro): executa localmente
+            time.sleep(min(self.intervalo, max(prazo - time.monotonic(), 0)))
+
+        return self._executar_se_houver_prazo(fn)
+
+    def _espera(self) -> float:
+        """Quanto um seguidor pode esperar: espera_max, limitada ao prazo restante."""
+        sobra = deadline.restante()
+        if sobra is None:
+            return self.espera_max
+        return max(0.0, min(self.espera_max, sobra))
+
+    def _executar_se_houver_prazo(self, fn):
+        if not deadline.cabe(0):
+            raise deadline.PrazoEsgotadoError("Prazo da requisição esgotado aguardando outra chamada.")
+        return fn()
@@ -0,0 +1,93 @@
+import time
+import hashlib
+import logging
+
+from django.conf import settings
+
+from intercorrencias.services.cache_service import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 do token: chave estável entre processos (ao contrário de `hash()`)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    Cache de payloads de tokens já verificados, chaveado pelo digest do token.
+
+    O TTL de cada entrada vem do `exp` do token, limitado a AUTH_TOKEN_CACHE_MAX_TTL.
+    """
+
+    def __init__(self, maxsize: int | None = None):
+        self._cache = TwoTierCache(
+            "jwtv",
+            maxsize=maxsize or getattr(settings, "AUTH_TOKEN_CACHE_MAXSIZE", 2048),
+        )
+
+    def get(self, token: str) -> dict | None:
+        payload = self._cache.get(token_digest(token))
+        if payload and int(payload.get("exp", time.time() + 1)) <= int(time.time()):
+            return None
+        return payload
+
+    def set(self, token: str, payload: dict):
+        now = int(time.time())
+        teto = getattr(settings, "AUTH_TOKEN_CACHE_MAX_TTL", 60)
+        exp = int(payload.get("exp", now + teto))
+        ttl = min(teto, exp - now)
+        if ttl <= 0:
+            return
+        self._cache.set(token_digest(token), payload, ttl)
+
+    def delete(self, token: str):
+        self._cache.delete(token_digest(token))
+
+    def limpar_local(self):
+        self._cache.limpar_local()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def reset_stats(self):
+        self._cache.reset_stats()
+
+
+token_cache = TokenCache()
+
+
+class RejectedTokenCache:
+    """
+    Cache negativo: digests de tokens recusados, com TTL curto
+    (AUTH_NEGATIVE_CACHE_TTL). Um token repetido por um cliente com defeito
+    ou por um scanner é recusado sem nova verificação.
+    """
+
+    def __init__(self, maxsize: int | None = None):
+        self._cache = TwoTierCache(
+            "jwtneg",
+            maxsize=maxsize or getattr(settings, "AUTH_TOKEN_CACHE_MAXSIZE", 2048),
+        )
+
+    def get(self, token: str) -> str | None:
+        """Retorna o motivo da recusa, se o token foi recusado recentemente."""
+        return self._cache.get(token_digest(token))
+
+    def set(self, token: str, motivo: str):
+        ttl = getattr(settings, "AUTH_NEGATIVE_CACHE_TTL", 30)
+        if ttl > 0:
+            self._cache.set(token_digest(token), motivo, ttl)
+
+    def limpar_local(self):
+        self._cache.limpar_local()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def reset_stats(self):
+        self._cache.reset_stats()
+
+
+rejected_token_cache = RejectedTokenCache()
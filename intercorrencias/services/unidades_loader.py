@@ -0,0 +1,85 @@
+import logging
+
+from intercorrencias.services import unidades_service
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_KEY = "unidades_loader"
+
+
+class UnidadesLoader:
+    """
+    Carregador de unidades com escopo de requisição (padrão DataLoader).
+
+    Os serializers registram os códigos EOL de que a resposta vai precisar
+    (`registrar`); a primeira leitura (`get`) busca todos os pendentes de uma
+    vez e memoriza o resultado — inclusive "não encontrada" e falhas do
+    serviço — até o fim da requisição.
+    """
+
+    def __init__(self):
+        self._memo: dict = {}
+        self._erros: dict = {}
+        self._pendentes: list = []
+
+    def registrar(self, *codigos):
+        for codigo in codigos:
+            if codigo:
+                self._adicionar_pendente(str(codigo))
+
+    def _adicionar_pendente(self, codigo):
+        if codigo not in self._memo and codigo not in self._erros and codigo not in self._pendentes:
+            self._pendentes.append(codigo)
+
+    def carregar(self):
+        """Busca todos os códigos pendentes: um único código via `get_unidade`, vários em lote."""
+        if not self._pendentes:
+            return
+        codigos, self._pendentes = self._pendentes, []
+
+        try:
+            if len(codigos) == 1:
+                encontrados = {codigos[0]: unidades_service.get_unidade(codigos[0])}
+            else:
+                encontrados = unidades_service.get_unidades_em_lote(set(codigos))
+        except unidades_service.ExternalServiceError as e:
+            for codigo in codigos:
+                self._erros[codigo] = e
+            raise
+
+        for codigo in codigos:
+            self._memo[codigo] = encontrados.get(codigo)
+
+    def get(self, codigo) -> dict | None:
+        """
+        Retorna a unidade (None se não existir). Levanta ExternalServiceError
+        se o serviço falhou para este código nesta requisição.
+        """
+        chave = codigo if codigo is None else str(codigo)
+        self._adicionar_pendente(chave)
+        self.carregar()
+        if chave in self._erros:
+            raise self._erros[chave]
+        return self._memo[chave]
+
+
+def get_loader(context: dict) -> UnidadesLoader:
+    """
+    Loader do contexto do serializer. Fica preso à requisição (quando houver),
+    para ser compartilhado entre o serializer de validação e o de resposta.
+    """
+    loader = context.get(CONTEXT_KEY)
+    if loader is not None:
+        return loader
+
+    request = context.get("request")
+    if request is not None:
+        loader = getattr(request, "_unidades_loader", None)
+        if not isinstance(loader, UnidadesLoader):
+            loader = UnidadesLoader()
+            request._unidades_loader = loader
+    else:
+        loader = UnidadesLoader()
+
+    context[CONTEXT_KEY] = loader
+    return loader
@@ -1,19 +1,133 @@
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
 from django.conf import settings
+from django.core.cache import cache
 import requests
-import logging
+
+from intercorrencias.models.unidade import Unidade
+from intercorrencias.services import http_client
+from intercorrencias.services.cache_service import TwoTierCache
+from intercorrencias.services.circuit_breaker import CircuitBreaker
+from intercorrencias.services.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 class ExternalServiceError(Exception): ...
 
 BASE = settings.UNIDADES_BASE_URL.rstrip("/")
 
+consultas_em_andamento = SingleFlight("unidade")
+
+# Com o circuito aberto as consultas falham na hora; entradas vencidas do cache
+# continuam sendo servidas (ver get_unidade).
+circuito = CircuitBreaker("unidades")
+
+# Entradas: {"valor": dict | None, "atualizado_em": timestamp}. Ficam no cache por
+# UNIDADES_CACHE_STALE_TTL para servir o último valor conhecido se o serviço cair.
+unidades_cache = TwoTierCache(
+    "unidade",
+    maxsize=settings.UNIDADES_CACHE_MAXSIZE,
+    l1_ttl=settings.UNIDADES_CACHE_L1_TTL,
+)
+
+
+_revalidando: set[str] = set()
+_revalidando_lock = threading.Lock()
+
+
+def _executar_em_background(fn):
+    threading.Thread(target=fn, daemon=True).start()
+
+
+def _esta_fresca(entrada: dict) -> bool:
+    ttl = settings.UNIDADES_CACHE_TTL if entrada["valor"] is not None else settings.UNIDADES_CACHE_NEGATIVE_TTL
+    return time.time() - entrada["atualizado_em"] < ttl
+
+
+def _armazenar(codigo_eol: str, valor: dict | None):
+    unidades_cache.set(
+        codigo_eol,
+        {"valor": valor, "atualizado_em": time.time()},
+        settings.UNIDADES_CACHE_STALE_TTL,
+    )
+
+
+def _buscar_local(codigos_eol: list[str]) -> dict[str, dict]:
+    """Unidades presentes no espelho local (tabela `Unidade`)."""
+    return {u.codigo_eol: u.como_dict() for u in Unidade.objects.filter(codigo_eol__in=codigos_eol)}
+
+
+def _buscar_e_armazenar(codigo_eol: str) -> dict | None:
+    valor = _buscar_local([codigo_eol]).get(codigo_eol)
+    if valor is None:
+        valor = _buscar_unidade(codigo_eol)
+    _armazenar(codigo_eol, valor)
+    return valor
+
+
+def _agendar_revalidacao(codigo_eol: str):
+    with _revalidando_lock:
+        if codigo_eol in _revalidando:
+            return
+        _revalidando.add(codigo_eol)
+    _executar_em_background(lambda: _revalidar(codigo_eol))
+
+
+def _revalidar(codigo_eol: str):
+    """Atualiza uma entrada vencida. Só um worker por vez revalida cada código."""
+    lock_key = f"unidade:revalidando:{codigo_eol}"
+    try:
+        # Outro worker pode já ter revalidado: basta trazer o valor novo para o L1
+        entrada = unidades_cache.get_compartilhado(codigo_eol)
+        if entrada is not None and _esta_fresca(entrada):
+            return
+        if not cache.add(lock_key, 1, 30):
+            return
+        try:
+            # Vai ao serviço: o espelho local também pode estar desatualizado
+            _armazenar(codigo_eol, _buscar_unidade(codigo_eol))
+        except ExternalServiceError as e:
+            logger.warning("Falha ao revalidar unidade %s, mantendo valor anterior: %s", codigo_eol, e)
+        finally:
+            cache.delete(lock_key)
+    finally:
+        with _revalidando_lock:
+            _revalidando.discard(codigo_eol)
+
+
 def get_unidade(codigo_eol: str) -> dict | None:
+    """
+    Retorna a unidade pelo código EOL (None se não existir).
+
+    Usa cache em duas camadas (LRU local + cache do Django), inclusive para 404.
+    Na ausência de cache, consulta o espelho local (tabela `Unidade`) e só vai ao
+    serviço para códigos que não estão nele.
+    Uma entrada vencida é devolvida na hora e atualizada em segundo plano
+    (stale-while-revalidate); se o serviço estiver fora, o último valor conhecido
+    continua sendo servido. Consultas simultâneas do mesmo código na ausência de
+    cache são coalescidas em uma única chamada.
+    """
+    codigo_eol = str(codigo_eol)
+    entrada = unidades_cache.get(codigo_eol)
+    if entrada is not None:
+        if not _esta_fresca(entrada):
+            _agendar_revalidacao(codigo_eol)
+        return entrada["valor"]
+
+    return consultas_em_andamento.do(codigo_eol, lambda: _buscar_e_armazenar(codigo_eol))
+
+
+def _buscar_unidade(codigo_eol: str) -> dict | None:
 
     logger.info("Consultando unidade no serviço B: %s/%s", BASE, codigo_eol)
 
     try:
         url = f"{BASE}/{codigo_eol}/"
-        r = requests.get(url, timeout=3.0)
+        r = circuito.chamar(http_client.get, url, timeout=3.0)
         if r.status_code == 404:
             return None
         r.raise_for_status()
@@ -23,20 +137,144 @@ def get_unidade(codigo_eol: str) -> dict | None:
 
 
 def get_unidades_em_lote(codigos_eol: set[str]) -> dict[str, dict]:
+    """
+    Retorna {codigo_eol: unidade} para os códigos existentes.
 
+    Lê o cache e depois o espelho local (uma única consulta SQL); só consulta o
+    serviço para os códigos ausentes de ambos, em
+    blocos de até UNIDADES_BATCH_CHUNK_SIZE códigos buscados em paralelo. Os
+    resultados (e os códigos não encontrados) são gravados de volta no cache.
+    """
     if not codigos_eol:
         return {}
 
-    logger.info("Consultando unidades em lote (%d registros).", len(codigos_eol))
+    resultado: dict[str, dict] = {}
+    faltantes: list[str] = []
+    for codigo in codigos_eol:
+        codigo = str(codigo)
+        entrada = unidades_cache.get(codigo)
+        if entrada is None:
+            faltantes.append(codigo)
+            continue
+        if not _esta_fresca(entrada):
+            _agendar_revalidacao(codigo)
+        if entrada["valor"] is not None:
+            resultado[codigo] = entrada["valor"]
+
+    if faltantes:
+        locais = _buscar_local(faltantes)
+        for codigo, valor in locais.items():
+            _armazenar(codigo, valor)
+            resultado[codigo] = valor
+        faltantes = [codigo for codigo in faltantes if codigo not in locais]
+
+    if not faltantes:
+        return resultado
 
+    logger.info(
+        "Consultando unidades em lote (%d de %d registros fora do cache e do espelho local).",
+        len(faltantes), len(codigos_eol),
+    )
+
+    tamanho = settings.UNIDADES_BATCH_CHUNK_SIZE
+    blocos = [faltantes[i:i + tamanho] for i in range(0, len(faltantes), tamanho)]
+    if len(blocos) == 1:
+        encontrados = _buscar_lote(blocos[0])
+    else:
+        encontrados = {}
+        workers = min(len(blocos), settings.UNIDADES_BATCH_MAX_WORKERS)
+        # Cada bloco roda numa cópia do contexto atual, para respeitar o prazo da requisição
+        contextos = [contextvars.copy_context() for _ in blocos]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for parcial in executor.map(lambda ctx, bloco: ctx.run(_buscar_lote, bloco), contextos, blocos):
+                encontrados.update(parcial)
+
+    for codigo in faltantes:
+        valor = encontrados.get(codigo)
+        _armazenar(codigo, valor)
+        if valor is not None:
+            resultado[codigo] = valor
+
+    return resultado
+
+
+def _buscar_lote(codigos_eol: list[str]) -> dict[str, dict]:
     try:
         url = f"{BASE}/batch/"
-        r = requests.post(
+        r = circuito.chamar(
+            http_client.post,
             url,
-            json={"codigos": list(codigos_eol)},
+            json={"codigos": codigos_eol},
             timeout=5.0,
         )
         r.raise_for_status()
-        return r.json()
+        return {str(codigo): unidade for codigo, unidade in r.json().items()}
     except requests.RequestException as e:
-        raise ExternalServiceError(f"Falha ao consultar unidades em lote: {e}") from e
\ No newline at end of file
+        raise ExternalServiceError(f"Falha ao consultar unidades em lote: {e}") from e
+
+
+def listar_unidades():
+    """
+    Percorre o catálogo completo do serviço de unidades, seguindo a paginação
+    (`next`) quando a resposta for paginada.
+    """
+    url = f"{BASE}/"
+    while url:
+        logger.info("Listando unidades no serviço B: %s", url)
+        try:
+            r = http_client.get(url, timeout=30.0)
+            r.raise_for_status()
+            dados = r.json()
+        except requests.RequestException as e:
+            raise ExternalServiceError(f"Falha ao listar unidades: {e}") from e
+
+        if isinstance(dados, dict):
+            yield from dados.get("results", [])
+            url = dados.get("next")
+        else:
+            yield from dados
+            url = None
+
+
+def _para_modelo(unidade: dict) -> Unidade:
+    dre = unidade.get("dre_codigo_eol") or (unidade.get("dre") or {}).get("codigo_eol") or ""
+    return Unidade(
+        codigo_eol=str(unidade["codigo_eol"]),
+        nome=unidade.get("nome") or "",
+        dre_codigo_eol=str(dre),
+        tipo=unidade.get("tipo_unidade") or unidade.get("tipo") or "",
+    )
+
+
+def sincronizar_unidades(unidades, tamanho_lote: int = 1000) -> int:
+    """
+    Insere/atualiza (upsert) as unidades recebidas no espelho local, em lotes.
+    Retorna a quantidade de unidades processadas.
+    """
+    total = 0
+    # Chaveado pelo código: o upsert não aceita o mesmo código duas vezes no lote
+    lote: dict[str, Unidade] = {}
+
+    def _gravar():
+        Unidade.objects.bulk_create(
+            list(lote.values()),
+            update_conflicts=True,
+            unique_fields=["codigo_eol"],
+            update_fields=["nome", "dre_codigo_eol", "tipo", "atualizado_em"],
+        )
+
+    for unidade in unidades:
+        if not unidade.get("codigo_eol"):
+            continue
+        modelo = _para_modelo(unidade)
+        lote[modelo.codigo_eol] = modelo
+        if len(lote) >= tamanho_lote:
+            _gravar()
+            total += len(lote)
+            lote = {}
+
+    if lote:
+        _gravar()
+        total += len(lote)
+
+    return total
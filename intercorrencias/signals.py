@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.saida_de_escopo import SaidaDeEscopo
+
+
+def _escopo(instance) -> tuple[str, str]:
+    return instance.unidade_codigo_eol, instance.dre_codigo_eol
+
+
+def _escopo_carregado(instance) -> tuple[str, str] | None:
+    """Escopo lido do banco (ver ModeloBase): é o que os consumidores do feed já conhecem."""
+    carregados = instance.valores_carregados or {}
+    if "unidade_codigo_eol" not in carregados or "dre_codigo_eol" not in carregados:
+        return None
+    return carregados["unidade_codigo_eol"], carregados["dre_codigo_eol"]
+
+
+@receiver(post_save, sender=Intercorrencia)
+def registrar_mudanca_de_escopo(sender, instance, created, **kwargs):
+    # Chamado antes de ModeloBase.save atualizar os valores carregados
+    anterior, atual = _escopo_carregado(instance), _escopo(instance)
+    if not created and anterior is not None and anterior != atual:
+        SaidaDeEscopo.objects.create(
+            intercorrencia_uuid=instance.uuid,
+            motivo="mudou_de_escopo",
+            unidade_codigo_eol_anterior=anterior[0],
+            dre_codigo_eol_anterior=anterior[1],
+            unidade_codigo_eol_atual=atual[0],
+            dre_codigo_eol_atual=atual[1],
+        )
+
+
+@receiver(post_delete, sender=Intercorrencia)
+def registrar_exclusao(sender, instance, **kwargs):
+    unidade, dre = _escopo_carregado(instance) or _escopo(instance)
+    SaidaDeEscopo.objects.create(
+        intercorrencia_uuid=instance.uuid,
+        motivo="excluida",
+        unidade_codigo_eol_anterior=unidade,
+        dre_codigo_eol_anterior=dre,
+    )
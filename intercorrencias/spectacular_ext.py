@@ -1,4 +1,11 @@
-from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.extensions import OpenApiAuthenticationExtension, OpenApiSerializerExtension
+from drf_spectacular.plumbing import build_array_type, build_basic_type, build_object_type
+
+from intercorrencias.api.serializers.intercorrencia_listagem_serializer import (
+    IntercorrenciaDuplicataSerializer,
+    IntercorrenciaListagemSerializer,
+)
 
 class RemoteJWTAuthScheme(OpenApiAuthenticationExtension):
     # caminho completo da sua classe de auth
@@ -13,3 +20,47 @@ class RemoteJWTAuthScheme(OpenApiAuthenticationExtension):
             "scheme": "bearer",
             "bearerFormat": "JWT",
         }
+
+
+class IntercorrenciaListagemSerializerExtension(OpenApiSerializerExtension):
+    # a representação compacta monta dicionários à mão: o schema é descrito aqui
+    target_class = "intercorrencias.api.serializers.intercorrencia_listagem_serializer.IntercorrenciaListagemSerializer"
+
+    def map_serializer(self, auto_schema, direction):
+        texto = build_basic_type(OpenApiTypes.STR)
+        texto_opcional = {**texto, "nullable": True}
+        data_hora = build_basic_type(OpenApiTypes.DATETIME)
+        tipo = build_object_type(
+            properties={"uuid": build_basic_type(OpenApiTypes.UUID), "nome": texto},
+        )
+        return build_object_type(
+            properties={
+                "id": build_basic_type(OpenApiTypes.INT),
+                "uuid": build_basic_type(OpenApiTypes.UUID),
+                "protocolo_da_intercorrencia": texto,
+                "status": texto,
+                "status_display": texto,
+                "status_extra": texto_opcional,
+                "data_ocorrencia": {**data_hora, "nullable": True},
+                "unidade_codigo_eol": texto,
+                "nome_unidade": texto_opcional,
+                "dre_codigo_eol": texto,
+                "nome_dre": texto_opcional,
+                "sobre_furto_roubo_invasao_depredacao": build_basic_type(OpenApiTypes.BOOL),
+                "tipos_ocorrencia": build_array_type(tipo),
+                "user_username": texto,
+                "criado_em": data_hora,
+                "atualizado_em": data_hora,
+            },
+            required=list(IntercorrenciaListagemSerializer.CAMPOS),
+        )
+
+
+class IntercorrenciaDuplicataSerializerExtension(IntercorrenciaListagemSerializerExtension):
+    target_class = "intercorrencias.api.serializers.intercorrencia_listagem_serializer.IntercorrenciaDuplicataSerializer"
+
+    def map_serializer(self, auto_schema, direction):
+        schema = super().map_serializer(auto_schema, direction)
+        schema["properties"]["similaridade"] = build_basic_type(OpenApiTypes.FLOAT)
+        schema["required"] = list(IntercorrenciaDuplicataSerializer.CAMPOS)
+        return schema
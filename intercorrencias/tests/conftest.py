@@ -1,8 +1,13 @@
 import os
 import pytest
-from intercorrencias.tests.factories import IntercorrenciaFactory
+from unittest.mock import patch
+from django.core.cache import cache
+from django.utils import timezone
+from intercorrencias.models.envolvido import Envolvido
+from intercorrencias.tests.factories import DeclaranteFactory, IntercorrenciaFactory, TipoOcorrenciaFactory
 from pytest_factoryboy import register
 from django.test import Client
+from rest_framework.test import APIClient
 
 @pytest.fixture
 def client():
@@ -19,3 +24,106 @@ def _media_settings(tmp_path, settings):
     # se futuramente tiver FileFields, isola mídia nos testes
     settings.MEDIA_ROOT = tmp_path / "media"
     return settings
+
+
+@pytest.fixture(autouse=True)
+def _limpa_caches():
+    # Evita que valores em cache (Django e LRU local) vazem entre os testes
+    from intercorrencias.services.unidades_service import unidades_cache
+    from intercorrencias.services.token_cache import token_cache, rejected_token_cache
+
+    caches_locais = (unidades_cache, token_cache, rejected_token_cache)
+    cache.clear()
+    for c in caches_locais:
+        c.limpar_local()
+    yield
+    cache.clear()
+    for c in caches_locais:
+        c.limpar_local()
+
+
+def _unidade_ficticia(codigo):
+    return {"codigo_eol": codigo, "nome": f"Unidade {codigo}"}
+
+
+@pytest.fixture
+def sem_servico_de_unidades():
+    # Listagens e detalhes consultam o serviço de unidades: responde sem rede
+    with patch(
+        "intercorrencias.services.unidades_service.get_unidades_em_lote",
+        side_effect=lambda codigos: {c: _unidade_ficticia(c) for c in codigos},
+    ), patch("intercorrencias.services.unidades_service.get_unidade", side_effect=_unidade_ficticia):
+        yield
+
+
+@pytest.fixture
+def api_client_para(django_user_model):
+    """Cria um usuário com o cargo e a unidade informados e devolve um APIClient autenticado."""
+
+    def _client(cargo, unidade, username="usuario"):
+        user = django_user_model.objects.create_user(username=username)
+        user.cargo_codigo = cargo
+        user.unidade_codigo_eol = unidade
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    return _client
+
+
+@pytest.fixture
+def relacionados_do_formulario(db):
+    """Tipos de ocorrência, declarante e envolvido referenciados pelos formulários completos."""
+    return {
+        "tipos": [TipoOcorrenciaFactory(nome="Furto"), TipoOcorrenciaFactory(nome="Agressão")],
+        "declarante": DeclaranteFactory(declarante="Diretor"),
+        "envolvido": Envolvido.objects.create(perfil_dos_envolvidos="Estudante"),
+    }
+
+
+@pytest.fixture
+def formulario(relacionados_do_formulario):
+    """Payload do formulário completo do diretor (todas as seções), de furto/roubo ou não."""
+
+    def _formulario(sobre_furto=True, **extra):
+        dados = {
+            "data_ocorrencia": timezone.now().isoformat(),
+            "unidade_codigo_eol": "200237",
+            "dre_codigo_eol": "108500",
+            "sobre_furto_roubo_invasao_depredacao": True,
+            "tipos_ocorrencia": [str(relacionados_do_formulario["tipos"][0].uuid)],
+            "descricao_ocorrencia": "Furto de equipamentos",
+            "smart_sampa_situacao": "sim_sem_dano",
+            "declarante": str(relacionados_do_formulario["declarante"].uuid),
+            "comunicacao_seguranca_publica": "sim_pm",
+            "protocolo_acionado": "registro",
+        }
+        if not sobre_furto:
+            dados.update({
+                "sobre_furto_roubo_invasao_depredacao": False,
+                "tipos_ocorrencia": [str(tipo.uuid) for tipo in relacionados_do_formulario["tipos"]],
+                "descricao_ocorrencia": "Agressão no intervalo",
+                "smart_sampa_situacao": "sim_com_dano",
+                "envolvido": str(relacionados_do_formulario["envolvido"].uuid),
+                "tem_info_agressor_ou_vitima": "sim",
+                "nome_pessoa_agressora": "Fulano",
+                "idade_pessoa_agressora": 14,
+                "motivacao_ocorrencia": ["bullying"],
+                "genero_pessoa_agressora": "homem_trans",
+                "grupo_etnico_racial": "branco",
+                "etapa_escolar": "edu_infantil_emei",
+                "frequencia_escolar": "regularizada",
+                "interacao_ambiente_escolar": "Boa",
+                "redes_protecao_acompanhamento": "CRAS",
+                "notificado_conselho_tutelar": True,
+                "acompanhado_naapa": False,
+                "cep": "01001-000",
+                "logradouro": "Praça da Sé",
+                "numero_residencia": "1",
+                "bairro": "Sé",
+                "cidade": "São Paulo",
+                "estado": "SP",
+            })
+        return {**dados, **extra}
+
+    return _formulario
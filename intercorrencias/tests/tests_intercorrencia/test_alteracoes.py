@@ -0,0 +1,147 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+
+from intercorrencias.api.alteracoes import codificar_cursor, decodificar_cursor
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.saida_de_escopo import SaidaDeEscopo
+from intercorrencias.tests.factories import IntercorrenciaFactory, TipoOcorrenciaFactory
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+URL_GIPE = "/api-intercorrencias/v1/gipe/alteracoes/"
+URL_DRE = "/api-intercorrencias/v1/dre/alteracoes/"
+
+
+@pytest.fixture(autouse=True)
+def _sem_atraso(settings):
+    settings.INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS = 0
+
+
+def _ler(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    conteudo = b"".join(response.streaming_content).decode()
+    return [json.loads(linha) for linha in conteudo.splitlines()]
+
+
+def _uuids(registros):
+    return [r["dados"]["uuid"] if r["tipo"] == "intercorrencia" else r["uuid"] for r in registros]
+
+
+@pytest.fixture
+def intercorrencias():
+    a = IntercorrenciaFactory(dre_codigo_eol="DRE01", unidade_codigo_eol="000001", status="enviado_para_dre")
+    a.tipos_ocorrencia.set([TipoOcorrenciaFactory(nome="Bullying")])
+    b = IntercorrenciaFactory(dre_codigo_eol="DRE01", unidade_codigo_eol="000002", status="enviado_para_dre")
+    c = IntercorrenciaFactory(dre_codigo_eol="DRE02", unidade_codigo_eol="000003", status="enviado_para_dre")
+    return {"a": a, "b": b, "c": c}
+
+
+@pytest.mark.django_db
+class TestFeedDeAlteracoes:
+
+    def test_carga_completa_em_ordem_de_atualizacao(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        registros = _ler(client.get(URL_GIPE))
+
+        esperado = Intercorrencia.objects.order_by("atualizado_em", "id").values_list("uuid", flat=True)
+        assert _uuids(registros) == [str(u) for u in esperado]
+        a = next(r for r in registros if r["dados"]["uuid"] == str(intercorrencias["a"].uuid))
+        assert a["dados"]["tipos_ocorrencia"] == [str(intercorrencias["a"].tipos_ocorrencia.get().uuid)]
+        assert "busca_texto" not in a["dados"]
+
+    def test_retoma_pelo_cursor_apenas_o_que_mudou(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+        cursor = _ler(client.get(URL_GIPE))[-1]["cursor"]
+
+        assert _ler(client.get(URL_GIPE, {"cursor": cursor})) == []
+
+        b = intercorrencias["b"]
+        b.descricao_ocorrencia = "Atualizada"
+        b.save()
+        registros = _ler(client.get(URL_GIPE, {"cursor": cursor}))
+        assert _uuids(registros) == [str(b.uuid)]
+        assert registros[0]["dados"]["descricao_ocorrencia"] == "Atualizada"
+
+    def test_desde(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+        c = intercorrencias["c"]
+
+        registros = _ler(client.get(URL_GIPE, {"desde": (c.atualizado_em - timedelta(microseconds=1)).isoformat()}))
+
+        assert _uuids(registros) == [str(c.uuid)]
+
+    def test_folga_para_transacoes_abertas(self, api_client_para, intercorrencias, settings):
+        settings.INTERCORRENCIAS_ALTERACOES_ATRASO_SEGUNDOS = 60
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        assert _ler(client.get(URL_GIPE)) == []
+
+    def test_dre_recebe_saida_de_escopo_quando_muda_de_dre(self, api_client_para, intercorrencias):
+        client_dre01 = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01", "dre01")
+        cursor = _ler(client_dre01.get(URL_DRE))[-1]["cursor"]
+
+        a = Intercorrencia.objects.get(pk=intercorrencias["a"].pk)
+        a.unidade_codigo_eol, a.dre_codigo_eol = "000003", "DRE02"
+        a.save()
+
+        registros = _ler(client_dre01.get(URL_DRE, {"cursor": cursor}))
+        assert [(r["tipo"], r["uuid"], r["motivo"]) for r in registros] == [
+            ("saida_de_escopo", str(a.uuid), "mudou_de_escopo")
+        ]
+
+        client_dre02 = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE02", "dre02")
+        assert str(a.uuid) in _uuids(_ler(client_dre02.get(URL_DRE)))
+
+    def test_troca_de_unidade_na_mesma_dre_nao_gera_saida_para_a_dre(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+        cursor = _ler(client.get(URL_DRE))[-1]["cursor"]
+
+        b = Intercorrencia.objects.get(pk=intercorrencias["b"].pk)
+        b.unidade_codigo_eol = "000001"
+        b.save()
+
+        registros = _ler(client.get(URL_DRE, {"cursor": cursor}))
+        assert [(r["tipo"], r["dados"]["uuid"]) for r in registros] == [("intercorrencia", str(b.uuid))]
+        assert SaidaDeEscopo.objects.filter(intercorrencia_uuid=b.uuid).exists()
+
+    def test_exclusao_gera_saida_de_escopo(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+        cursor = _ler(client.get(URL_GIPE))[-1]["cursor"]
+
+        uuid = intercorrencias["c"].uuid
+        Intercorrencia.objects.get(pk=intercorrencias["c"].pk).delete()
+
+        registros = _ler(client.get(URL_GIPE, {"cursor": cursor}))
+        assert [(r["tipo"], r["uuid"], r["motivo"]) for r in registros] == [("saida_de_escopo", str(uuid), "excluida")]
+
+    @pytest.mark.parametrize("params", [{"cursor": "nao-e-cursor"}, {"desde": "ontem"}])
+    def test_parametros_invalidos(self, api_client_para, intercorrencias, params):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get(URL_GIPE, params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_feed_do_gipe_exige_perfil_gipe(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+
+        assert client.get(URL_GIPE).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_feed_usa_indice_de_atualizacao(self, intercorrencias):
+        marca = (timezone.now(), 1)
+        cursor = decodificar_cursor(codificar_cursor({"i": marca, "s": marca}))
+        assert cursor["i"] == marca
+
+        qs = Intercorrencia.objects.filter(atualizado_em__gt=marca[0]).order_by("atualizado_em", "id")
+        with connection.cursor() as c:
+            c.execute("SET LOCAL enable_seqscan = off")
+
+        assert "interc_atualizado_id_idx" in qs.explain()
@@ -1,4 +1,6 @@
+import base64
 import importlib
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 
@@ -7,7 +9,15 @@ import pytest
 import requests
 from django.core.cache import cache
 from django.test.client import RequestFactory
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+
+from intercorrencias.services import auth_service
+from intercorrencias.services.token_cache import (
+    token_cache,
+    token_digest,
+    rejected_token_cache,
+    TokenCache,
+)
 
 # Utilitário: gera Authorization header "Bearer <token>"
 def _auth_header(token: str) -> dict:
@@ -17,8 +27,15 @@ def _auth_header(token: str) -> dict:
 @pytest.fixture(autouse=True)
 def _clear_cache():
     cache.clear()
+    auth_service.limpar_estado_local()
+    token_cache.limpar_local()
+    token_cache.reset_stats()
+    rejected_token_cache.limpar_local()
     yield
     cache.clear()
+    auth_service.limpar_estado_local()
+    token_cache.limpar_local()
+    rejected_token_cache.limpar_local()
 
 
 @pytest.fixture
@@ -39,7 +56,7 @@ def _build_token(secret: str, payload_extra: dict | None = None, alg: str = "HS2
 
 
 def _patch_verify_200(monkeypatch, module, status_code=200):
-    """Parcha requests.post usado no módulo de auth para responder com status X."""
+    """Parcha http_client.post usado no módulo de auth para responder com status X."""
     class _Resp:
         def __init__(self, code):
             self.status_code = code
@@ -47,7 +64,7 @@ def _patch_verify_200(monkeypatch, module, status_code=200):
         assert abs(timeout - 3.0) < 1e-6
         assert "token" in json
         return _Resp(status_code)
-    monkeypatch.setattr(module.requests, "post", fake_post)
+    monkeypatch.setattr(module.http_client, "post", fake_post)
 
 
 @pytest.mark.django_db
@@ -120,7 +137,7 @@ def test_cache_evita_segunda_chamada_ao_verificador(settings, rf, monkeypatch):
         calls["n"] += 1
         return _Resp(200)
 
-    monkeypatch.setattr(auth.requests, "post", fake_post)
+    monkeypatch.setattr(auth.http_client, "post", fake_post)
 
     token = _build_token(settings.SECRET_KEY, {"username": "carlos"})
     request1 = rf.get("/1", **_auth_header(token))
@@ -133,6 +150,39 @@ def test_cache_evita_segunda_chamada_ao_verificador(settings, rf, monkeypatch):
     assert calls["n"] == 1
 
 
+@pytest.mark.django_db
+def test_cache_compartilhado_entre_workers(settings, rf, monkeypatch):
+    """Token verificado em um worker é acerto de cache (L2) em outro."""
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = {"n": 0}
+    class _Resp:
+        def __init__(self, code): self.status_code = code
+    def fake_post(url, json, timeout):
+        calls["n"] += 1
+        return _Resp(200)
+    monkeypatch.setattr(auth.http_client, "post", fake_post)
+
+    token = _build_token(settings.SECRET_KEY, {"username": "carlos"})
+
+    # Worker 1 verifica o token
+    auth.RemoteJWTAuthentication().authenticate(rf.get("/1", **_auth_header(token)))
+    assert cache.get(f"jwtv:{token_digest(token)}")["username"] == "carlos"
+
+    # Worker 2: processo sem L1, mesmo cache do Django
+    outro_worker = TokenCache()
+    monkeypatch.setattr(auth, "token_cache", outro_worker)
+    user, _ = auth.RemoteJWTAuthentication().authenticate(rf.get("/2", **_auth_header(token)))
+
+    assert user.username == "carlos"
+    assert calls["n"] == 1
+    assert outro_worker.stats()["l2_hits"] == 1
+    assert outro_worker.stats()["misses"] == 0
+
+
 @pytest.mark.django_db
 def test_remoto_401_gera_authfailed(settings, rf, monkeypatch):
     settings.AUTH_VERIFY_URL = "http://auth/verify/"
@@ -150,6 +200,227 @@ def test_remoto_401_gera_authfailed(settings, rf, monkeypatch):
     assert "inválido" in str(exc.value).lower() or "expirado" in str(exc.value).lower()
 
 
+def _conta_posts(monkeypatch, module, status_code=200, exc=None):
+    calls = {"n": 0}
+    class _Resp:
+        def __init__(self, code): self.status_code = code
+    def fake_post(url, json, timeout):
+        calls["n"] += 1
+        if exc:
+            raise exc
+        return _Resp(status_code)
+    monkeypatch.setattr(module.http_client, "post", fake_post)
+    return calls
+
+
+@pytest.mark.django_db
+def test_token_recusado_vai_para_cache_negativo(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = _conta_posts(monkeypatch, auth, 401)
+    token = _build_token(settings.SECRET_KEY)
+
+    # Tempestade de retentativas com o mesmo token inválido
+    for i in range(10):
+        with pytest.raises(AuthenticationFailed) as exc:
+            auth.RemoteJWTAuthentication().authenticate(rf.get(f"/{i}", **_auth_header(token)))
+        assert exc.value.status_code == 401
+        assert "inválido" in str(exc.value).lower()
+
+    assert calls["n"] == 1
+
+
+@pytest.mark.django_db
+def test_falha_de_rede_nao_vai_para_cache_negativo(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = _conta_posts(monkeypatch, auth, exc=requests.ConnectionError("boom"))
+    token = _build_token(settings.SECRET_KEY)
+
+    for i in range(2):
+        with pytest.raises(AuthenticationFailed):
+            auth.RemoteJWTAuthentication().authenticate(rf.get(f"/{i}", **_auth_header(token)))
+
+    assert calls["n"] == 2
+    assert rejected_token_cache.get(token) is None
+
+
+@pytest.mark.django_db
+def test_erro_5xx_do_servico_nao_vai_para_cache_negativo(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    _conta_posts(monkeypatch, auth, 503)
+    token = _build_token(settings.SECRET_KEY)
+
+    with pytest.raises(AuthenticationFailed) as exc:
+        auth.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert "Falha ao contatar" in str(exc.value)
+    assert rejected_token_cache.get(token) is None
+
+
+@pytest.mark.django_db
+def test_circuito_aberto_recusa_sem_chamar_o_servico(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    settings.CIRCUIT_BREAKER_FAILURES = 2
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = _conta_posts(monkeypatch, auth, exc=requests.ConnectionError("boom"))
+
+    for i in range(3):
+        token = _build_token(settings.SECRET_KEY, {"sub": f"u{i}"})
+        with pytest.raises(AuthenticationFailed):
+            auth.RemoteJWTAuthentication().authenticate(rf.get(f"/{i}", **_auth_header(token)))
+
+    assert calls["n"] == 2
+
+
+@pytest.mark.django_db
+def test_limite_de_verificacoes_por_cliente(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    settings.AUTH_VERIFY_RATE_BURST = 2
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 0.01
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = _conta_posts(monkeypatch, auth, 401)
+
+    # Scanner com tokens diferentes a cada tentativa
+    for i in range(2):
+        token = _build_token(settings.SECRET_KEY, {"username": f"u{i}"})
+        with pytest.raises(AuthenticationFailed):
+            auth.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+
+    token = _build_token(settings.SECRET_KEY, {"username": "u3"})
+    with pytest.raises(Throttled):
+        auth.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+
+    # Outro cliente não é afetado
+    token = _build_token(settings.SECRET_KEY, {"username": "u4"})
+    with pytest.raises(AuthenticationFailed):
+        auth.RemoteJWTAuthentication().authenticate(
+            rf.get("/", REMOTE_ADDR="10.0.0.2", **_auth_header(token))
+        )
+
+    assert calls["n"] == 3
+
+
+@pytest.mark.django_db
+def test_x_forwarded_for_forjado_nao_renova_o_limite(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    settings.AUTH_VERIFY_RATE_BURST = 2
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 0.01
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = _conta_posts(monkeypatch, auth, 401)
+
+    # Mesmo REMOTE_ADDR, X-Forwarded-For diferente a cada tentativa
+    for i in range(2):
+        token = _build_token(settings.SECRET_KEY, {"username": f"u{i}"})
+        with pytest.raises(AuthenticationFailed):
+            auth.RemoteJWTAuthentication().authenticate(
+                rf.get("/", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}", **_auth_header(token))
+            )
+
+    token = _build_token(settings.SECRET_KEY, {"username": "u3"})
+    with pytest.raises(Throttled):
+        auth.RemoteJWTAuthentication().authenticate(
+            rf.get("/", HTTP_X_FORWARDED_FOR="203.0.113.99", **_auth_header(token))
+        )
+    assert calls["n"] == 2
+
+
+@pytest.mark.django_db
+def test_com_proxy_confiavel_usa_endereco_anexado_pelo_proxy(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    settings.AUTH_VERIFY_RATE_BURST = 1
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 0.01
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    _conta_posts(monkeypatch, auth, 401)
+
+    def _tentar(xff, username):
+        token = _build_token(settings.SECRET_KEY, {"username": username})
+        auth.RemoteJWTAuthentication().authenticate(rf.get("/", HTTP_X_FORWARDED_FOR=xff, **_auth_header(token)))
+
+    with pytest.raises(AuthenticationFailed):
+        _tentar("forjado-1, 198.51.100.7", "a")
+    # O prefixo forjado muda, mas o endereço anexado pelo proxy é o mesmo
+    with pytest.raises(Throttled):
+        _tentar("forjado-2, 198.51.100.7", "b")
+    # Outro cliente real tem o próprio limite
+    with pytest.raises(AuthenticationFailed):
+        _tentar("forjado-3, 198.51.100.8", "c")
+
+
+@pytest.mark.django_db
+def test_token_em_cache_nao_consome_limite(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    settings.AUTH_VERIFY_RATE_BURST = 1
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 0.01
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    _conta_posts(monkeypatch, auth, 200)
+    token = _build_token(settings.SECRET_KEY, {"username": "carlos"})
+
+    for i in range(5):
+        user, _ = auth.RemoteJWTAuthentication().authenticate(rf.get(f"/{i}", **_auth_header(token)))
+        assert user.username == "carlos"
+
+
+@pytest.mark.django_db
+def test_requisicoes_paralelas_com_mesmo_token_verificam_uma_vez(settings, rf, monkeypatch):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.SECRET_KEY = "super-secret"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    calls = {"n": 0}
+    class _Resp:
+        def __init__(self, code): self.status_code = code
+    def fake_post(url, json, timeout):
+        calls["n"] += 1
+        time.sleep(0.2)
+        return _Resp(200)
+    monkeypatch.setattr(auth.http_client, "post", fake_post)
+
+    token = _build_token(settings.SECRET_KEY, {"username": "carlos"})
+    barreira = threading.Barrier(5)
+    usuarios = []
+
+    def _request(i):
+        barreira.wait()
+        user, _ = auth.RemoteJWTAuthentication().authenticate(rf.get(f"/{i}", **_auth_header(token)))
+        usuarios.append(user.username)
+
+    threads = [threading.Thread(target=_request, args=(i,)) for i in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert usuarios == ["carlos"] * 5
+    assert calls["n"] == 1
+
+
 @pytest.mark.django_db
 def test_erro_de_rede_timeout_gera_authfailed(settings, rf, monkeypatch):
     """
@@ -167,7 +438,7 @@ def test_erro_de_rede_timeout_gera_authfailed(settings, rf, monkeypatch):
     def fake_post(url, json, timeout):
         raise requests.Timeout("boom")
 
-    monkeypatch.setattr(auth.requests, "post", fake_post)
+    monkeypatch.setattr(auth.http_client, "post", fake_post)
 
     token = _build_token(settings.SECRET_KEY)
     request = rf.get("/net", **_auth_header(token))
@@ -177,6 +448,25 @@ def test_erro_de_rede_timeout_gera_authfailed(settings, rf, monkeypatch):
     assert "falha ao contatar" in str(exc.value).lower()
 
 
+@pytest.mark.django_db
+def test_prazo_esgotado_esperando_outro_worker_gera_authfailed(settings, rf, monkeypatch):
+    from intercorrencias.services.deadline import PrazoEsgotadoError
+
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+
+    def fake_do(chave, funcao):
+        raise PrazoEsgotadoError("prazo esgotado aguardando a verificação em andamento")
+
+    monkeypatch.setattr(auth.verificacoes_em_andamento, "do", fake_do)
+
+    token = _build_token("qualquer-segredo-com-tamanho-suficiente")
+    with pytest.raises(AuthenticationFailed) as exc:
+        auth.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert "falha ao contatar" in str(exc.value).lower()
+
+
 @pytest.mark.django_db
 def test_token_mal_assinado_gera_authfailed(settings, rf, monkeypatch):
     settings.AUTH_VERIFY_URL = "http://auth/verify/"
@@ -213,3 +503,149 @@ def test_payload_sem_username_sub_userid_gera_authfailed(settings, rf, monkeypat
     with pytest.raises(AuthenticationFailed) as exc:
         auth.RemoteJWTAuthentication().authenticate(request)
     assert "username" in str(exc.value).lower() or "sub" in str(exc.value).lower()
+
+
+# ---------------------------------------------------------------------------
+# Modo de verificação local (chave pública/JWKS em cache)
+# ---------------------------------------------------------------------------
+
+def _jwks_oct(secret: str, kid: str = "k1") -> dict:
+    k = base64.urlsafe_b64encode(secret.encode()).rstrip(b"=").decode()
+    return {"keys": [{"kty": "oct", "k": k, "kid": kid, "alg": "HS256"}]}
+
+
+class _JsonResp:
+    def __init__(self, data, code=200):
+        self._data = data
+        self.status_code = code
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+def _proibe_post(monkeypatch, module):
+    def fake_post(url, json, timeout):
+        raise AssertionError("não deveria chamar o serviço de Auth no modo local")
+    monkeypatch.setattr(module.http_client, "post", fake_post)
+
+
+@pytest.fixture
+def modo_local(settings):
+    settings.AUTH_VERIFY_URL = "http://auth/verify/"
+    settings.AUTH_VERIFY_MODE = "local"
+    settings.AUTH_JWKS_URL = ""
+    settings.AUTH_REVOCATION_URL = ""
+    settings.AUTH_REMOTE_FALLBACK = True
+    settings.SECRET_KEY = "super-secret-com-tamanho-suficiente-32b"
+    import intercorrencias.auth as auth
+    importlib.reload(auth)
+    return auth
+
+
+@pytest.mark.django_db
+def test_local_chave_estatica_nao_chama_servico(settings, rf, monkeypatch, modo_local):
+    _proibe_post(monkeypatch, modo_local)
+
+    token = _build_token(settings.SECRET_KEY, {"username": "joao"})
+    user, _ = modo_local.RemoteJWTAuthentication().authenticate(rf.get("/ok", **_auth_header(token)))
+    assert user.username == "joao"
+
+
+@pytest.mark.django_db
+def test_local_jwks_sincronizado_uma_vez(settings, rf, monkeypatch, modo_local):
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    secret = "chave-do-jwks-com-tamanho-suficiente"
+    _proibe_post(monkeypatch, modo_local)
+
+    calls = {"n": 0}
+    def fake_get(url, timeout):
+        calls["n"] += 1
+        return _JsonResp(_jwks_oct(secret))
+    monkeypatch.setattr(auth_service.http_client, "get", fake_get)
+
+    for nome in ("ana", "bia", "caio"):
+        token = jwt.encode(
+            {"username": nome, "exp": int(time.time()) + 60}, secret, algorithm="HS256", headers={"kid": "k1"}
+        )
+        user, _ = modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+        assert user.username == nome
+
+    assert calls["n"] == 1
+
+
+@pytest.mark.django_db
+def test_local_token_revogado_gera_authfailed(settings, rf, monkeypatch, modo_local):
+    settings.AUTH_REVOCATION_URL = "http://auth/revogados/"
+    _proibe_post(monkeypatch, modo_local)
+    monkeypatch.setattr(
+        auth_service.http_client, "get", lambda url, timeout: _JsonResp({"revogados": ["jti-1"]})
+    )
+
+    token = _build_token(settings.SECRET_KEY, {"jti": "jti-1"})
+    with pytest.raises(AuthenticationFailed) as exc:
+        modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert "revogado" in str(exc.value).lower()
+
+
+@pytest.mark.django_db
+def test_local_token_expirado_gera_authfailed(settings, rf, monkeypatch, modo_local):
+    _proibe_post(monkeypatch, modo_local)
+
+    token = _build_token(settings.SECRET_KEY, {"exp": int(time.time()) - 10})
+    with pytest.raises(AuthenticationFailed) as exc:
+        modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert "expirado" in str(exc.value).lower()
+
+
+@pytest.mark.django_db
+def test_local_jwks_indisponivel_usa_fallback_remoto(settings, rf, monkeypatch, modo_local):
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    settings.AUTH_PUBLIC_KEY = settings.SECRET_KEY
+
+    def fake_get(url, timeout):
+        raise requests.ConnectionError("fora do ar")
+    monkeypatch.setattr(auth_service.http_client, "get", fake_get)
+    _patch_verify_200(monkeypatch, modo_local, 200)
+
+    token = _build_token(settings.SECRET_KEY, {"username": "remoto"})
+    user, _ = modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert user.username == "remoto"
+
+
+@pytest.mark.django_db
+def test_local_jwks_indisponivel_sem_fallback_gera_authfailed(settings, rf, monkeypatch, modo_local):
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    settings.AUTH_REMOTE_FALLBACK = False
+
+    def fake_get(url, timeout):
+        raise requests.ConnectionError("fora do ar")
+    monkeypatch.setattr(auth_service.http_client, "get", fake_get)
+    _proibe_post(monkeypatch, modo_local)
+
+    token = _build_token(settings.SECRET_KEY)
+    with pytest.raises(AuthenticationFailed) as exc:
+        modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert "chave" in str(exc.value).lower()
+
+
+@pytest.mark.django_db
+def test_local_jwks_rsa_nao_chama_servico(settings, rf, monkeypatch, modo_local):
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    settings.AUTH_JWT_ALGORITHMS = ["RS256"]
+    _proibe_post(monkeypatch, modo_local)
+
+    chave = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = {**jwt.algorithms.RSAAlgorithm.to_jwk(chave.public_key(), as_dict=True), "kid": "rsa-1", "alg": "RS256"}
+    monkeypatch.setattr(auth_service.http_client, "get", lambda url, timeout: _JsonResp({"keys": [jwk]}))
+
+    token = jwt.encode(
+        {"username": "rsa", "exp": int(time.time()) + 60}, chave, algorithm="RS256", headers={"kid": "rsa-1"}
+    )
+    user, _ = modo_local.RemoteJWTAuthentication().authenticate(rf.get("/", **_auth_header(token)))
+    assert user.username == "rsa"
@@ -0,0 +1,126 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.tests.factories import IntercorrenciaFactory
+
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+
+@pytest.fixture
+def intercorrencias():
+    return {
+        "descricao": IntercorrenciaFactory(
+            dre_codigo_eol="DRE01",
+            status="enviado_para_dre",
+            descricao_ocorrencia="Estudantes brigaram no pátio durante o intervalo."
+        ),
+        "redes": IntercorrenciaFactory(
+            dre_codigo_eol="DRE01",
+            status="enviado_para_dre",
+            redes_protecao_acompanhamento="Conselho tutelar acompanha a briga entre famílias."
+        ),
+        "encaminhamento": IntercorrenciaFactory(
+            dre_codigo_eol="DRE02", encaminhamentos_gipe="Encaminhado ao NAAPA após nova briga."
+        ),
+        "sem_relacao": IntercorrenciaFactory(
+            dre_codigo_eol="DRE01",
+            status="enviado_para_dre",
+            descricao_ocorrencia="Câmera danificada no portão."
+        ),
+    }
+
+
+def _nomes_por_uuid(intercorrencias):
+    return {str(obj.uuid): nome for nome, obj in intercorrencias.items()}
+
+
+def _nomes(response, intercorrencias):
+    por_uuid = _nomes_por_uuid(intercorrencias)
+    return [por_uuid[r["uuid"]] for r in response.data["results"]]
+
+
+def _percorrer(client, params, intercorrencias, max_paginas=10):
+    vistos, url = [], "/api-intercorrencias/v1/gipe/"
+    for _ in range(max_paginas):
+        response = client.get(url, params)
+        vistos += _nomes(response, intercorrencias)
+        url, params = response.data["next"], None
+        if not url:
+            return vistos, response
+    raise AssertionError(f"paginação não terminou: {vistos}")
+
+
+@pytest.mark.django_db
+class TestBuscaTextual:
+
+    def test_busca_com_radical_em_portugues_ordenada_por_relevancia(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/", {"search": "brigas"})
+
+        assert response.status_code == status.HTTP_200_OK
+        # peso A (descrição) > B (encaminhamentos GIPE) > C (redes de proteção)
+        assert _nomes(response, intercorrencias) == ["descricao", "encaminhamento", "redes"]
+
+    def test_busca_respeita_escopo_da_dre(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+
+        response = client.get("/api-intercorrencias/v1/dre/", {"search": "briga"})
+
+        assert set(_nomes(response, intercorrencias)) == {"descricao", "redes"}
+
+    def test_sintaxe_de_buscador(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/", {"search": "briga -conselho"})
+
+        assert set(_nomes(response, intercorrencias)) == {"descricao", "encaminhamento"}
+
+    def test_pagina_resultados_ranqueados_sem_repetir(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        vistos, response = _percorrer(client, {"search": "briga", "page_size": 1}, intercorrencias)
+
+        assert vistos == ["descricao", "encaminhamento", "redes"]
+
+        anterior = client.get(response.data["previous"])
+        assert _nomes(anterior, intercorrencias) == ["encaminhamento"]
+
+    def test_pagina_empates_de_relevancia_pelo_criado_em(self, api_client_para):
+        empatadas = {
+            f"empate{i}": IntercorrenciaFactory(descricao_ocorrencia="Briga no pátio.") for i in range(4)
+        }
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        vistos, _ = _percorrer(client, {"search": "briga", "page_size": 1}, empatadas)
+
+        esperado = Intercorrencia.objects.order_by("-criado_em", "-id").values_list("uuid", flat=True)
+        assert vistos == [_nomes_por_uuid(empatadas)[str(u)] for u in esperado]
+
+    def test_coluna_mantida_pelo_banco_ao_atualizar(self, api_client_para, intercorrencias):
+        obj = intercorrencias["sem_relacao"]
+        obj.descricao_ocorrencia = "Houve briga no portão."
+        obj.save()
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/", {"search": "portão"})
+
+        assert _nomes(response, intercorrencias) == ["sem_relacao"]
+
+    def test_busca_usa_indice_gin(self, intercorrencias):
+        class _View:
+            action = "list"
+
+        request = Request(APIRequestFactory().get("/", {"search": "briga"}))
+        qs = IntercorrenciaFiltroBackend().filter_queryset(request, Intercorrencia.objects.all(), _View())
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        assert "interc_busca_texto_gin" in qs.explain()
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from intercorrencias.checks import cache_compartilhado, limite_de_verificacoes, verificacao_local_de_tokens
+from intercorrencias.services import auth_service
+
+
+def test_cache_local_ao_processo_gera_aviso(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+    (aviso,) = cache_compartilhado(None)
+
+    assert aviso.id == "intercorrencias.W001"
+
+
+def test_cache_redis_sem_aviso(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://redis:6379/1"}
+    }
+
+    assert cache_compartilhado(None) == []
+
+
+@pytest.fixture
+def verificacao_local(settings):
+    settings.AUTH_VERIFY_MODE = "local"
+    settings.AUTH_JWT_ALGORITHMS = ["RS256"]
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    auth_service.limpar_estado_local()
+    yield settings
+    auth_service.limpar_estado_local()
+
+
+def test_modo_remoto_nao_verifica_chaves(settings):
+    settings.AUTH_VERIFY_MODE = "remote"
+
+    assert verificacao_local_de_tokens(None) == []
+
+
+def test_modo_local_rsa_sem_cryptography_gera_erro(verificacao_local):
+    with patch.object(jwt.algorithms, "has_crypto", False):
+        (erro,) = verificacao_local_de_tokens(None)
+
+    assert erro.id == "intercorrencias.E001"
+
+
+def test_modo_local_sem_chave_utilizavel_gera_erro(verificacao_local):
+    with patch.object(
+        auth_service, "get_jwks", return_value={"keys": [{"kty": "RSA", "kid": "quebrada"}]}
+    ):
+        (erro,) = verificacao_local_de_tokens(None)
+
+    assert erro.id == "intercorrencias.E002"
+
+
+def test_modo_local_com_chave_utilizavel_sem_erro(verificacao_local):
+    with patch.object(auth_service, "carregar_chaves", return_value={"k1": object()}):
+        assert verificacao_local_de_tokens(None) == []
+
+
+def test_taxa_de_verificacoes_zero_gera_erro(settings):
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 0
+    settings.AUTH_VERIFY_RATE_BURST = 20
+
+    (erro,) = limite_de_verificacoes(None)
+
+    assert erro.id == "intercorrencias.E003"
+
+
+def test_limite_de_verificacoes_valido_sem_erro(settings):
+    settings.AUTH_VERIFY_RATE_PER_SECOND = 1.0
+    settings.AUTH_VERIFY_RATE_BURST = 20
+
+    assert limite_de_verificacoes(None) == []
@@ -0,0 +1,86 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from intercorrencias.models.envolvido import Envolvido
+from intercorrencias.tests.factories import (
+    IntercorrenciaFactory,
+    TipoOcorrenciaFactory,
+    DeclaranteFactory,
+)
+
+USERNAME = "diretor"
+UNIDADE = "200237"
+DRE = "108500"
+
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+
+@pytest.fixture
+def relacionados():
+    return {
+        "tipos": [TipoOcorrenciaFactory(nome="Agressão"), TipoOcorrenciaFactory(nome="Ameaça")],
+        "declarante": DeclaranteFactory(declarante="Diretor"),
+        "envolvido": Envolvido.objects.create(perfil_dos_envolvidos="Estudante"),
+    }
+
+
+def _criar(relacionados, quantidade):
+    for _ in range(quantidade):
+        obj = IntercorrenciaFactory(
+            user_username=USERNAME,
+            unidade_codigo_eol=UNIDADE,
+            dre_codigo_eol=DRE,
+            status="enviado_para_dre",
+            declarante=relacionados["declarante"],
+            envolvido=relacionados["envolvido"],
+        )
+        obj.tipos_ocorrencia.set(relacionados["tipos"])
+
+
+def _contar_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), len(response.data["results"])
+
+
+@pytest.mark.django_db
+class TestQuantidadeDeQueriesNaListagem:
+    """O número de queries de cada listagem não pode crescer com o número de linhas."""
+
+    @pytest.mark.parametrize(
+        "url, cargo, unidade",
+        [
+            ("/api-intercorrencias/v1/diretor/", "CODIGO_PERFIL_DIRETOR", UNIDADE),
+            ("/api-intercorrencias/v1/dre/", "CODIGO_PERFIL_DRE", DRE),
+            ("/api-intercorrencias/v1/gipe/", "CODIGO_PERFIL_GIPE", "GIPE01"),
+        ],
+    )
+    def test_queries_constantes(self, api_client_para, relacionados, url, cargo, unidade):
+        client = api_client_para(getattr(settings, cargo), unidade, USERNAME)
+
+        _criar(relacionados, 2)
+        poucas, linhas = _contar_queries(client, url)
+        assert linhas == 2
+
+        _criar(relacionados, 8)
+        muitas, linhas = _contar_queries(client, url)
+        assert linhas == 10
+
+        assert muitas == poucas
+
+    def test_listagem_diretor_exibe_tipos_e_detalhe_exibe_relacionados(self, api_client_para, relacionados):
+        client = api_client_para(settings.CODIGO_PERFIL_DIRETOR, UNIDADE, USERNAME)
+        _criar(relacionados, 1)
+
+        (item,) = client.get("/api-intercorrencias/v1/diretor/").data["results"]
+        assert [t["nome"] for t in item["tipos_ocorrencia"]] == ["Agressão", "Ameaça"]
+
+        detalhe = client.get(f"/api-intercorrencias/v1/diretor/{item['uuid']}/").data
+        assert {t["nome"] for t in detalhe["tipos_ocorrencia"]} == {"Agressão", "Ameaça"}
+        assert detalhe["declarante_detalhes"]["declarante"] == "Diretor"
+        assert detalhe["envolvido"]["perfil_dos_envolvidos"] == "Estudante"
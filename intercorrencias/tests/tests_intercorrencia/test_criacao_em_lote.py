@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+URL = "/api-intercorrencias/v1/diretor/lote/"
+
+
+@pytest.fixture
+def client(api_client_para):
+    return api_client_para(settings.CODIGO_PERFIL_DIRETOR, "200237", username="diretor")
+
+
+@pytest.mark.django_db
+class TestCriacaoEmLote:
+
+    def test_cria_itens_validos_e_reporta_erros_por_item(self, client, relacionados_do_formulario, formulario):
+        itens = [
+            formulario(envolvido=str(relacionados_do_formulario["envolvido"].uuid)),
+            formulario(declarante="00000000-0000-0000-0000-000000000000"),
+            formulario(sobre_furto=False),
+            "não é um objeto",
+        ]
+
+        response = client.post(URL, itens, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item["indice"] for item in response.data["criadas"]] == [0, 2]
+        assert [erro["indice"] for erro in response.data["erros"]] == [1, 3]
+        assert response.data["erros"][0]["detail"].startswith("declarante:")
+
+        furto = Intercorrencia.objects.get(uuid=response.data["criadas"][0]["uuid"])
+        assert furto.status == "em_preenchimento_diretor"
+        assert furto.user_username == "diretor"
+        assert furto.unidade_codigo_eol == "200237"
+        assert furto.declarante == relacionados_do_formulario["declarante"]
+        assert list(furto.tipos_ocorrencia.all()) == relacionados_do_formulario["tipos"][:1]
+
+        nao_furto = Intercorrencia.objects.get(uuid=response.data["criadas"][1]["uuid"])
+        assert nao_furto.smart_sampa_situacao == ""
+        assert nao_furto.envolvido == relacionados_do_formulario["envolvido"]
+        assert nao_furto.nome_pessoa_agressora == "Fulano"
+        assert nao_furto.motivacao_ocorrencia == ["bullying"]
+        assert set(nao_furto.tipos_ocorrencia.all()) == set(relacionados_do_formulario["tipos"])
+
+    def test_aplica_regras_de_limpeza_das_secoes(self, client, relacionados_do_formulario, formulario):
+        itens = [
+            formulario(tem_info_agressor_ou_vitima="sim", nome_pessoa_agressora="Fulano"),
+            formulario(sobre_furto=False, tem_info_agressor_ou_vitima="nao", idade_pessoa_agressora=None),
+        ]
+
+        response = client.post(URL, itens, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        furto, nao_furto = (Intercorrencia.objects.get(uuid=item["uuid"]) for item in response.data["criadas"])
+        assert furto.tem_info_agressor_ou_vitima == ""
+        assert furto.nome_pessoa_agressora == ""
+        assert nao_furto.tem_info_agressor_ou_vitima == "nao"
+        assert nao_furto.nome_pessoa_agressora == ""
+        assert nao_furto.idade_pessoa_agressora is None
+
+    def test_consultas_e_chamadas_ao_servico_nao_crescem_com_o_lote(self, client, relacionados_do_formulario, formulario):
+        def _enviar(quantidade):
+            with patch(
+                "intercorrencias.services.unidades_service.get_unidades_em_lote",
+                side_effect=lambda codigos: {c: {"codigo_eol": c} for c in codigos},
+            ) as mock_lote, CaptureQueriesContext(connection) as consultas:
+                response = client.post(URL, [formulario(sobre_furto=False) for _ in range(quantidade)], format="json")
+            assert response.status_code == status.HTTP_201_CREATED
+            assert len(response.data["criadas"]) == quantidade
+            mock_lote.assert_called_once_with({"200237", "108500"})
+            return len(consultas)
+
+        assert _enviar(2) == _enviar(8)
+        assert Intercorrencia.objects.count() == 10
+
+    def test_todos_invalidos_retorna_400_sem_gravar(self, client, formulario):
+        response = client.post(URL, [formulario(tipos_ocorrencia=[])], format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["criadas"] == []
+        assert response.data["erros"][0]["indice"] == 0
+        assert not Intercorrencia.objects.exists()
+
+    @pytest.mark.parametrize("corpo", [{}, []])
+    def test_corpo_deve_ser_lista_nao_vazia(self, client, corpo):
+        response = client.post(URL, corpo, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"] == "Envie uma lista de intercorrências."
+
+    def test_limite_de_itens_por_lote(self, client, formulario, settings):
+        settings.INTERCORRENCIAS_LOTE_MAXIMO = 1
+
+        response = client.post(URL, [formulario()] * 2, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "no máximo 1" in response.data["detail"]
+        assert not Intercorrencia.objects.exists()
+
+    def test_perfil_dre_nao_cria_em_lote(self, api_client_para, formulario):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "108500", username="dre")
+
+        response = client.post(URL, [formulario()], format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
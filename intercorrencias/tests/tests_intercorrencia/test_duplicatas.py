@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.tests.factories import IntercorrenciaFactory
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+DESCRICAO = "Dois estudantes brigaram no pátio durante o intervalo e um deles se machucou."
+
+
+def _data(dia):
+    return timezone.make_aware(datetime(2025, 3, dia, 10))
+
+
+@pytest.fixture
+def intercorrencias(db):
+    def criar(**kwargs):
+        dados = {"unidade_codigo_eol": "000001", "dre_codigo_eol": "DRE01", "data_ocorrencia": _data(10)}
+        return IntercorrenciaFactory(**{**dados, **kwargs})
+
+    return {
+        "original": criar(descricao_ocorrencia=DESCRICAO),
+        "repetida": criar(descricao_ocorrencia=DESCRICAO.replace("Dois", "2"), data_ocorrencia=_data(11)),
+        "parecida": criar(descricao_ocorrencia="Estudantes brigaram no pátio no intervalo."),
+        "outra_unidade": criar(descricao_ocorrencia=DESCRICAO, unidade_codigo_eol="000002"),
+        "fora_da_janela": criar(descricao_ocorrencia=DESCRICAO, data_ocorrencia=_data(25)),
+        "sem_relacao": criar(descricao_ocorrencia="Câmera de segurança danificada no portão."),
+    }
+
+
+def _nomes(response, intercorrencias):
+    por_uuid = {str(obj.uuid): nome for nome, obj in intercorrencias.items()}
+    return [por_uuid[r["uuid"]] for r in response.data]
+
+
+@pytest.mark.django_db
+class TestCandidatasADuplicata:
+
+    def test_mesma_unidade_na_janela_ordenadas_por_similaridade(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get(f"/api-intercorrencias/v1/gipe/{intercorrencias['original'].uuid}/duplicatas/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert _nomes(response, intercorrencias) == ["repetida", "parecida"]
+        similaridades = [r["similaridade"] for r in response.data]
+        assert similaridades == sorted(similaridades, reverse=True)
+
+    def test_limite_de_candidatas(self, api_client_para, intercorrencias, settings):
+        settings.INTERCORRENCIAS_DUPLICATAS_LIMITE = 1
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+
+        response = client.get(f"/api-intercorrencias/v1/dre/{intercorrencias['original'].uuid}/duplicatas/")
+
+        assert _nomes(response, intercorrencias) == ["repetida"]
+
+    def test_dre_nao_consulta_intercorrencia_de_outra_dre(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE02")
+
+        response = client.get(f"/api-intercorrencias/v1/dre/{intercorrencias['original'].uuid}/duplicatas/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_busca_usa_indice_de_trigramas(self, intercorrencias):
+        qs = Intercorrencia.objects.filter(descricao_ocorrencia__trigram_similar=DESCRICAO)
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        assert "interc_descricao_trgm_gin" in qs.explain()
+
+    def test_sem_descricao_nao_ha_candidatas(self):
+        obj = IntercorrenciaFactory(descricao_ocorrencia="  ")
+
+        assert not obj.candidatas_a_duplicata().exists()
@@ -0,0 +1,116 @@
+import csv
+import io
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from intercorrencias.api.exportacao import COLUNAS, linhas_csv
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.services import unidades_service
+from intercorrencias.tests.factories import IntercorrenciaFactory, TipoOcorrenciaFactory
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+
+def _ler(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    conteudo = b"".join(response.streaming_content).decode("utf-8-sig")
+    cabecalho, *linhas = csv.reader(io.StringIO(conteudo), delimiter=";")
+    return cabecalho, [dict(zip(cabecalho, linha)) for linha in linhas]
+
+
+@pytest.fixture
+def intercorrencias():
+    bullying = TipoOcorrenciaFactory(nome="Bullying")
+    a = IntercorrenciaFactory(
+        dre_codigo_eol="DRE01", unidade_codigo_eol="000001", status="enviado_para_dre",
+        protocolo_da_intercorrencia="GIPE-2025/000001", sobre_furto_roubo_invasao_depredacao=True,
+        descricao_ocorrencia='Janela quebrada; "pedra" no pátio',
+    )
+    a.tipos_ocorrencia.set([bullying, TipoOcorrenciaFactory(nome="Agressão")])
+    b = IntercorrenciaFactory(dre_codigo_eol="DRE01", unidade_codigo_eol="000002", status="enviado_para_gipe")
+    c = IntercorrenciaFactory(dre_codigo_eol="DRE02", unidade_codigo_eol="000003")
+    return {"a": a, "b": b, "c": c}
+
+
+@pytest.mark.django_db
+class TestExportacaoCsv:
+
+    def test_gipe_exporta_todas_com_nomes_e_tipos(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/exportar/")
+
+        cabecalho, linhas = _ler(response)
+        assert "attachment" in response["Content-Disposition"]
+        assert cabecalho == [titulo for _, titulo in COLUNAS]
+        assert [linha["Código EOL da unidade"] for linha in linhas] == ["000003", "000002", "000001"]
+        a = linhas[-1]
+        assert a["Protocolo"] == "GIPE-2025/000001"
+        assert a["Unidade"] == "Unidade 000001"
+        assert a["DRE"] == "Unidade DRE01"
+        assert a["Tipos de ocorrência"] == "Agressão, Bullying"
+        assert a["Furto, roubo, invasão ou depredação"] == "Sim"
+        assert a["Descrição da ocorrência"] == 'Janela quebrada; "pedra" no pátio'
+
+    def test_exportacao_aplica_filtros_da_listagem(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        _, linhas = _ler(client.get("/api-intercorrencias/v1/gipe/exportar/", {"status": "enviado_para_gipe"}))
+
+        assert [linha["Código EOL da unidade"] for linha in linhas] == ["000002"]
+
+    def test_filtro_invalido(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/exportar/", {"status": "inexistente"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_dre_exporta_apenas_a_propria_dre(self, api_client_para, intercorrencias):
+        IntercorrenciaFactory(dre_codigo_eol="DRE01", unidade_codigo_eol="000004", status="em_preenchimento_diretor")
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+
+        _, linhas = _ler(client.get("/api-intercorrencias/v1/dre/exportar/"))
+
+        assert {linha["Código EOL da unidade"] for linha in linhas} == {"000001", "000002"}
+
+    def test_exportacao_do_gipe_exige_perfil_gipe(self, api_client_para, intercorrencias):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "DRE01")
+
+        response = client.get("/api-intercorrencias/v1/gipe/exportar/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestLinhasCsv:
+
+    def test_consultas_e_lotes_de_unidades_por_bloco(self, intercorrencias):
+        for i in range(2):
+            IntercorrenciaFactory(dre_codigo_eol="DRE01", unidade_codigo_eol=f"10000{i}")
+
+        with CaptureQueriesContext(connection) as ctx, \
+                patch.object(unidades_service, "get_unidades_em_lote", return_value={}) as mock_lote:
+            linhas = list(linhas_csv(Intercorrencia.objects.all(), chunk_size=2))
+
+        assert len(linhas) == 1 + 5
+        # 5 linhas em blocos de 2: uma consulta de tipos e um lote de unidades por bloco
+        consultas_de_tipos = [q for q in ctx.captured_queries if "tipoocorrencia" in q["sql"]]
+        assert len(consultas_de_tipos) == 3
+        assert mock_lote.call_count == 3
+
+    def test_falha_do_servico_de_unidades_deixa_nomes_em_branco(self, intercorrencias):
+        with patch.object(
+            unidades_service, "get_unidades_em_lote", side_effect=unidades_service.ExternalServiceError("fora")
+        ):
+            conteudo = "".join(linhas_csv(Intercorrencia.objects.all()))
+
+        _, *linhas = csv.reader(io.StringIO(conteudo.lstrip("\ufeff")), delimiter=";")
+        assert len(linhas) == 3
+        assert {linha[4] for linha in linhas} == {""}
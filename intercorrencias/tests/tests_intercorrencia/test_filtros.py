@@ -0,0 +1,133 @@
+from datetime import datetime
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from intercorrencias.api.filters import IntercorrenciaFiltroBackend
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.tests.factories import IntercorrenciaFactory, TipoOcorrenciaFactory
+
+URL = "/api-intercorrencias/v1/gipe/"
+
+
+def _data(dia, hora=12):
+    return timezone.make_aware(datetime(2025, 3, dia, hora))
+
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+
+@pytest.fixture
+def client(api_client_para):
+    return api_client_para(settings.CODIGO_PERFIL_GIPE, "GIPE01")
+
+
+@pytest.fixture
+def intercorrencias():
+    bullying = TipoOcorrenciaFactory(nome="Bullying")
+    furto = TipoOcorrenciaFactory(nome="Furto")
+    a = IntercorrenciaFactory(
+        unidade_codigo_eol="000001", status="enviado_para_dre", data_ocorrencia=_data(1),
+        sobre_furto_roubo_invasao_depredacao=False, motivacao_ocorrencia=["bullying", "racismo"],
+    )
+    a.tipos_ocorrencia.set([bullying])
+    b = IntercorrenciaFactory(
+        unidade_codigo_eol="000002", status="enviado_para_gipe", data_ocorrencia=_data(10),
+        sobre_furto_roubo_invasao_depredacao=True, motivacao_ocorrencia=[],
+    )
+    b.tipos_ocorrencia.set([furto, bullying])
+    c = IntercorrenciaFactory(
+        unidade_codigo_eol="000003", status="em_preenchimento_diretor", data_ocorrencia=_data(20),
+        sobre_furto_roubo_invasao_depredacao=False, motivacao_ocorrencia=["homofobia"],
+    )
+    return {"a": a, "b": b, "c": c, "bullying": bullying, "furto": furto}
+
+
+@pytest.mark.django_db
+class TestIntercorrenciaFiltroBackend:
+
+    def _listar(self, client, intercorrencias, params):
+        response = client.get(URL, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        por_uuid = {str(v.uuid): k for k, v in intercorrencias.items() if isinstance(v, Intercorrencia)}
+        return {por_uuid[r["uuid"]] for r in response.data["results"]}
+
+    @pytest.mark.parametrize(
+        "params, esperado",
+        [
+            ({}, {"a", "b", "c"}),
+            ({"status": ["enviado_para_dre", "enviado_para_gipe"]}, {"a", "b"}),
+            ({"data_ocorrencia_inicio": "2025-03-10"}, {"b", "c"}),
+            ({"data_ocorrencia_fim": "2025-03-10"}, {"a", "b"}),
+            ({"data_ocorrencia_fim": "2025-03-10T11:00:00"}, {"a"}),
+            ({"data_ocorrencia_inicio": "2025-03-02", "data_ocorrencia_fim": "2025-03-19"}, {"b"}),
+            ({"unidade_codigo_eol": ["000001", "000003"]}, {"a", "c"}),
+            ({"sobre_furto_roubo_invasao_depredacao": "true"}, {"b"}),
+            ({"sobre_furto_roubo_invasao_depredacao": "false"}, {"a", "c"}),
+            ({"motivacao_ocorrencia": ["racismo", "homofobia"]}, {"a", "c"}),
+            ({"status": "enviado_para_gipe", "sobre_furto_roubo_invasao_depredacao": "false"}, set()),
+        ],
+    )
+    def test_filtros(self, client, intercorrencias, params, esperado):
+        assert self._listar(client, intercorrencias, params) == esperado
+
+    def test_filtro_por_tipos_nao_duplica_linhas(self, client, intercorrencias):
+        params = {"tipos_ocorrencia": [str(intercorrencias["bullying"].uuid), str(intercorrencias["furto"].uuid)]}
+        response = client.get(URL, params)
+        assert len(response.data["results"]) == 2
+        assert self._listar(client, intercorrencias, params) == {"a", "b"}
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"status": "inexistente"},
+            {"data_ocorrencia_inicio": "ontem"},
+            {"data_ocorrencia_fim": "2025-13-40"},
+            {"tipos_ocorrencia": "nao-e-uuid"},
+            {"sobre_furto_roubo_invasao_depredacao": "talvez"},
+            {"motivacao_ocorrencia": "inexistente"},
+        ],
+    )
+    def test_parametros_invalidos(self, client, intercorrencias, params):
+        response = client.get(URL, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_filtros_ignorados_fora_da_listagem(self, client, intercorrencias):
+        response = client.get(f"{URL}{intercorrencias['a'].uuid}/", {"status": "finalizada"})
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestIndicesDosFiltros:
+    """Cada filtro deve ter um caminho por índice (seq scan desabilitado: tabela pequena no teste)."""
+
+    class _View:
+        action = "list"
+
+    def _plano(self, params):
+        request = Request(APIRequestFactory().get(URL, params))
+        qs = IntercorrenciaFiltroBackend().filter_queryset(request, Intercorrencia.objects.all(), self._View())
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return qs.explain()
+
+    @pytest.mark.parametrize(
+        "params, indice",
+        [
+            ({"status": "enviado_para_dre"}, "interc_status_criado_idx"),
+            ({"data_ocorrencia_inicio": "2025-01-01", "data_ocorrencia_fim": "2025-01-31"}, "interc_data_ocorrencia_idx"),
+            ({"unidade_codigo_eol": "000001"}, "unidade_codigo_eol"),
+            ({"sobre_furto_roubo_invasao_depredacao": "true"}, "interc_furto_criado_idx"),
+            ({"motivacao_ocorrencia": "bullying"}, "interc_motivacao_gin"),
+            ({"tipos_ocorrencia": "8b0c8c3e-6a3e-4d59-9a3e-0f1f6c2b7a10"}, "tipoocorrencia_id"),
+        ],
+    )
+    def test_filtro_usa_indice(self, intercorrencias, params, indice):
+        plano = self._plano(params)
+        linhas_com_indice = [linha for linha in plano.splitlines() if "Index" in linha and indice in linha]
+        assert linhas_com_indice, plano
@@ -0,0 +1,166 @@
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.tests.factories import IntercorrenciaFactory
+
+pytestmark = pytest.mark.usefixtures("sem_servico_de_unidades")
+
+URL = "/api-intercorrencias/v1/diretor/formulario/"
+TABELA = Intercorrencia._meta.db_table
+
+
+@pytest.fixture
+def client(api_client_para):
+    return api_client_para(settings.CODIGO_PERFIL_DIRETOR, "200237", username="diretor")
+
+
+@pytest.fixture
+def rascunho(relacionados_do_formulario):
+    intercorrencia = IntercorrenciaFactory(
+        unidade_codigo_eol="200237",
+        dre_codigo_eol="108500",
+        user_username="diretor",
+        sobre_furto_roubo_invasao_depredacao=True,
+        smart_sampa_situacao="sim_sem_dano",
+        descricao_ocorrencia="Rascunho",
+    )
+    intercorrencia.tipos_ocorrencia.set(relacionados_do_formulario["tipos"][:1])
+    return intercorrencia
+
+
+def _escritas(consultas, instrucao):
+    return [q["sql"] for q in consultas.captured_queries if q["sql"].startswith(f'{instrucao} "{TABELA}"')]
+
+
+@pytest.mark.django_db
+class TestFormularioCompleto:
+
+    def test_cria_com_uma_insercao_e_uma_consulta_de_unidades(self, client, formulario, relacionados_do_formulario):
+        with patch(
+            "intercorrencias.services.unidades_service.get_unidades_em_lote",
+            side_effect=lambda codigos: {c: {"codigo_eol": c, "nome": f"Unidade {c}"} for c in codigos},
+        ) as mock_lote, patch("intercorrencias.services.unidades_service.get_unidade") as mock_get, \
+                CaptureQueriesContext(connection) as consultas:
+            response = client.post(URL, formulario(sobre_furto=False), format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        assert len(_escritas(consultas, "INSERT INTO")) == 1
+        assert not _escritas(consultas, "UPDATE")
+        mock_get.assert_not_called()
+        assert mock_lote.call_count == 1
+
+        intercorrencia = Intercorrencia.objects.get(uuid=response.data["uuid"])
+        assert intercorrencia.status == "em_preenchimento_diretor"
+        assert intercorrencia.user_username == "diretor"
+        assert intercorrencia.smart_sampa_situacao == ""
+        assert intercorrencia.nome_pessoa_agressora == "Fulano"
+        assert set(intercorrencia.tipos_ocorrencia.all()) == set(relacionados_do_formulario["tipos"])
+        assert response.data["nome_unidade"] == "Unidade 200237"
+
+    def test_cria_e_envia_para_dre(self, client, formulario):
+        response = client.post(
+            URL, formulario(enviar_para_dre=True, motivo_encerramento_ue="Registro concluído"), format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        intercorrencia = Intercorrencia.objects.get(uuid=response.data["uuid"])
+        assert intercorrencia.status == "enviado_para_dre"
+        assert intercorrencia.finalizado_diretor_por == "diretor"
+        assert intercorrencia.protocolo_da_intercorrencia.startswith("GIPE-")
+        assert response.data["protocolo_da_intercorrencia"] == intercorrencia.protocolo_da_intercorrencia
+
+    def test_envio_sem_motivo_nao_grava(self, client, formulario):
+        response = client.post(URL, formulario(enviar_para_dre=True), format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"].startswith("motivo_encerramento_ue:")
+        assert not Intercorrencia.objects.exists()
+
+    def test_secao_invalida_nao_grava(self, client, formulario):
+        response = client.post(URL, formulario(sobre_furto=False, tem_info_agressor_ou_vitima="sim", cep=""), format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"].startswith("cep:")
+        assert not Intercorrencia.objects.exists()
+
+    def test_atualiza_trocando_o_tipo_com_um_update(self, client, formulario, rascunho, relacionados_do_formulario):
+        with CaptureQueriesContext(connection) as consultas:
+            response = client.put(
+                f"/api-intercorrencias/v1/diretor/{rascunho.uuid}/formulario/", formulario(sobre_furto=False), format="json"
+            )
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert len(_escritas(consultas, "UPDATE")) == 1
+        rascunho.refresh_from_db()
+        assert rascunho.sobre_furto_roubo_invasao_depredacao is False
+        assert rascunho.smart_sampa_situacao == ""
+        assert rascunho.tem_info_agressor_ou_vitima == "sim"
+        assert rascunho.envolvido == relacionados_do_formulario["envolvido"]
+        assert set(rascunho.tipos_ocorrencia.all()) == set(relacionados_do_formulario["tipos"])
+
+    def test_atualiza_e_envia_reaproveitando_protocolo(self, client, formulario, rascunho):
+        Intercorrencia.objects.filter(pk=rascunho.pk).update(protocolo_da_intercorrencia="GIPE-2025/000007")
+
+        response = client.put(
+            f"/api-intercorrencias/v1/diretor/{rascunho.uuid}/formulario/",
+            formulario(enviar_para_dre=True, motivo_encerramento_ue="Concluído"),
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        rascunho.refresh_from_db()
+        assert rascunho.status == "enviado_para_dre"
+        assert rascunho.protocolo_da_intercorrencia == "GIPE-2025/000007"
+
+    def test_nao_atualiza_intercorrencia_ja_enviada(self, client, formulario, rascunho):
+        Intercorrencia.objects.filter(pk=rascunho.pk).update(status="enviado_para_dre")
+
+        response = client.put(f"/api-intercorrencias/v1/diretor/{rascunho.uuid}/formulario/", formulario(), format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_enviar_para_dre_invalido(self, client, formulario):
+        response = client.post(URL, formulario(enviar_para_dre="talvez"), format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"].startswith("enviar_para_dre:")
+
+    def test_perfil_dre_nao_cria(self, api_client_para, formulario):
+        client = api_client_para(settings.CODIGO_PERFIL_DRE, "108500", username="dre")
+
+        response = client.post(URL, formulario(), format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize("cargo, unidade", [
+        (settings.CODIGO_PERFIL_DRE, "108500"),
+        (settings.CODIGO_PERFIL_GIPE, "GIPE01"),
+    ])
+    def test_perfis_dre_e_gipe_nao_regravam_rascunho(self, api_client_para, formulario, rascunho, cargo, unidade):
+        client = api_client_para(cargo, unidade, username="outro")
+
+        response = client.put(
+            f"/api-intercorrencias/v1/diretor/{rascunho.uuid}/formulario/",
+            formulario(enviar_para_dre=True, motivo_encerramento_ue="Concluído"),
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        rascunho.refresh_from_db()
+        assert rascunho.status == "em_preenchimento_diretor"
+        assert rascunho.descricao_ocorrencia == "Rascunho"
+
+    @pytest.mark.parametrize("corpo", [["não é um objeto"], "texto"])
+    def test_corpo_deve_ser_objeto(self, client, rascunho, corpo):
+        for response in (
+            client.post(URL, corpo, format="json"),
+            client.put(f"/api-intercorrencias/v1/diretor/{rascunho.uuid}/formulario/", corpo, format="json"),
+        ):
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.data["detail"] == "Envie o formulário como um objeto."
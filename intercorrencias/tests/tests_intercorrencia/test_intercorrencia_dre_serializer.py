@@ -57,11 +57,11 @@ class TestIntercorrenciaDreSerializer:
     @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
     def test_dre_nao_pode_atualizar_unidade_de_outra_dre(self, mock_get_unidade):
         """DRE não deve conseguir atualizar intercorrências de unidades de outra DRE"""
-        # Mock retorna unidade de DRE diferente
-        mock_get_unidade.return_value = {"codigo_eol": "123456", "dre_codigo_eol": "999999"}
+        # Troca de unidade; o mock retorna a unidade em DRE diferente
+        mock_get_unidade.return_value = {"codigo_eol": "123457", "dre_codigo_eol": "999999"}
         serializer = IntercorrenciaDreSerializer(
             instance=self.intercorrencia,
-            data=self.valid_data,
+            data={**self.valid_data, "unidade_codigo_eol": "123457"},
             context={"request": self.request},
             partial=True
         )
@@ -70,6 +70,36 @@ class TestIntercorrenciaDreSerializer:
         assert "DRE informada não corresponde à DRE da unidade." in str(serializer.errors["detail"])
     
 
+    @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
+    def test_unidade_inalterada_nao_consulta_servico(self, mock_get_unidade):
+        """Sem unidade/DRE no payload (ou iguais às gravadas) não há chamada ao serviço"""
+        for data in (
+            {"acionamento_seguranca_publica": True, "interlocucao_sts": False},
+            self.valid_data,
+        ):
+            serializer = IntercorrenciaDreSerializer(
+                instance=self.intercorrencia,
+                data=data,
+                context={"request": self.request},
+                partial=True
+            )
+            assert serializer.is_valid(), serializer.errors
+        mock_get_unidade.assert_not_called()
+
+    @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
+    def test_unidade_inalterada_confere_usuario_pelos_valores_gravados(self, mock_get_unidade):
+        """A unidade do usuário é conferida contra os códigos já gravados"""
+        self.request.user = MagicMock(unidade_codigo_eol="111111")
+        serializer = IntercorrenciaDreSerializer(
+            instance=self.intercorrencia,
+            data={"acionamento_seguranca_publica": True},
+            context={"request": self.request},
+            partial=True
+        )
+        assert not serializer.is_valid()
+        assert "A unidade não pertence ao usuário autenticado." in str(serializer.errors["detail"])
+        mock_get_unidade.assert_not_called()
+
     @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
     def test_campos_booleanos_obrigatorios(self, mock_get_unidade):
         """Testa que campos booleanos funcionam corretamente quando enviados"""
@@ -427,11 +457,10 @@ class TestIntercorrenciaConclusaoDaDreSerializer:
         assert "detail" in serializer.errors
         assert str(serializer.errors["detail"]).strip() == "motivo_encerramento_dre: Este campo é obrigatório."
 
-    @patch("intercorrencias.api.serializers.intercorrencia_dre_serializer.unidades_service.get_unidade")
-    def test_validacao_campo_motivo_encerramento_dre_valido(self, mock_get_unidade):
-        mock_get_unidade.return_value = {
-            "codigo_eol": "123456",
-            "dre_codigo_eol": "654321"
+    @patch("intercorrencias.api.serializers.intercorrencia_dre_serializer.unidades_service.get_unidades_em_lote")
+    def test_validacao_campo_motivo_encerramento_dre_valido(self, mock_get_lote):
+        mock_get_lote.return_value = {
+            "123456": {"codigo_eol": "123456", "dre_codigo_eol": "654321"},
         }
 
         self.request.user.unidade_codigo_eol = "123456"
@@ -1,6 +1,11 @@
 import pytest
 import secrets
+from io import StringIO
 from unittest.mock import patch
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -48,9 +53,10 @@ class TestIntercorrenciaDreViewSet:
         return client.put(url, data, format="json")
 
     @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
-    def test_enviar_para_gipe_sucesso(self, mock_get_unidade, client, dre_user, intercorrencia_dre):
+    @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidades_em_lote")
+    def test_enviar_para_gipe_sucesso(self, mock_get_lote, mock_get_unidade, client, dre_user, intercorrencia_dre):
         client.force_authenticate(user=dre_user)
-        mock_get_unidade.return_value = {"codigo_eol": "200237", "dre_codigo_eol": "DRE01"}
+        mock_get_unidade.return_value = {"codigo_eol": dre_user.unidade_codigo_eol, "nome": "DRE Teste"}
 
         url = f"/api-intercorrencias/v1/dre/{intercorrencia_dre.uuid}/enviar-para-gipe/"
         data = {
@@ -61,6 +67,10 @@ class TestIntercorrenciaDreViewSet:
         response = client.put(url, data, format="json")
         assert response.status_code == status.HTTP_200_OK
         assert response.data["motivo_encerramento_dre"] == "Encerramento concluído com sucesso"
+        assert response.data["nome_dre"] == "DRE Teste"
+        # Unidade e DRE iguais às gravadas: só a DRE exibida é buscada
+        mock_get_unidade.assert_called_once_with(dre_user.unidade_codigo_eol)
+        mock_get_lote.assert_not_called()
 
     @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
     def test_enviar_para_gipe_erro_validacao(self, mock_get_unidade, client, dre_user, intercorrencia_dre):
@@ -97,4 +107,72 @@ class TestIntercorrenciaDreViewSet:
         exc = ValidationError({"detail": ["Erro de validação único"]})
         response = viewset.handle_exception(exc)
         
-        assert response.data["detail"] == "Erro de validação único"
\ No newline at end of file
+        assert response.data["detail"] == "Erro de validação único"
+
+@pytest.mark.django_db
+class TestIntercorrenciaDreListagem:
+    URL = "/api-intercorrencias/v1/dre/"
+
+    @pytest.fixture
+    def client(self, django_user_model):
+        user = django_user_model.objects.create_user(username="dre")
+        user.cargo_codigo = settings.CODIGO_PERFIL_DRE
+        user.unidade_codigo_eol = "DRE01"
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def intercorrencias(self):
+        def _criar(dre, status_):
+            return Intercorrencia.objects.create(
+                unidade_codigo_eol="200237",
+                dre_codigo_eol=dre,
+                status=status_,
+                data_ocorrencia=timezone.now(),
+                user_username="diretor",
+            )
+        return {
+            "propria_enviada": _criar("DRE01", "enviado_para_dre"),
+            "propria_rascunho": _criar("DRE01", "em_preenchimento_diretor"),
+            "outra_dre": _criar("DRE02", "enviado_para_dre"),
+        }
+
+    def _uuids(self, response):
+        return {r["uuid"] for r in response.data["results"]}
+
+    def test_lista_apenas_enviadas_da_propria_dre(self, client, intercorrencias):
+        response = client.get(self.URL)
+        assert response.status_code == status.HTTP_200_OK
+        assert self._uuids(response) == {str(intercorrencias["propria_enviada"].uuid)}
+
+    def test_rascunho_nao_aparece_nem_filtrando_por_status(self, client, intercorrencias):
+        response = client.get(self.URL, {"status": "em_preenchimento_diretor"})
+        assert response.status_code == status.HTTP_200_OK
+        assert self._uuids(response) == set()
+
+    def test_filtro_por_status(self, client, intercorrencias):
+        response = client.get(self.URL, {"status": "enviado_para_dre"})
+        assert self._uuids(response) == {str(intercorrencias["propria_enviada"].uuid)}
+
+    def test_filtro_por_status_invalido(self, client, intercorrencias):
+        response = client.get(self.URL, {"status": "inexistente"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "inexistente" in response.data["detail"]
+
+    def test_consulta_usa_escopo_no_banco(self, client, intercorrencias):
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(self.URL, {"status": "enviado_para_dre"})
+        sql = next(q["sql"] for q in ctx.captured_queries if "intercorrencias_intercorrencia" in q["sql"])
+        assert '"dre_codigo_eol" = ' in sql
+        assert '"status" IN' in sql
+
+
+@pytest.mark.django_db
+def test_benchmark_listagem_dre_nao_grava_dados():
+    out = StringIO()
+    call_command("benchmark_listagem_dre", "--tamanhos", "5", "10", "--proprias", "3", "--repeticoes", "2", stdout=out)
+
+    linhas = out.getvalue().strip().splitlines()
+    assert len(linhas) == 3
+    assert Intercorrencia.objects.count() == 0
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.services.unidades_service import ExternalServiceError
+from intercorrencias.tests.factories import IntercorrenciaFactory, TipoOcorrenciaFactory
+from intercorrencias.api.serializers.intercorrencia_listagem_serializer import IntercorrenciaListagemSerializer
+from intercorrencias.api.serializers.intercorrencia_serializer import IntercorrenciaDiretorCompletoSerializer
+
+
+def _unidades_em_lote(codigos):
+    return {c: {"codigo_eol": c, "nome": f"Unidade {c}"} for c in codigos}
+
+
+def _linhas():
+    return Intercorrencia.objects.order_by("-criado_em", "-id").values(*IntercorrenciaListagemSerializer.CAMPOS)
+
+
+@pytest.mark.django_db
+class TestIntercorrenciaListagemSerializer:
+
+    @pytest.fixture
+    def intercorrencia(self):
+        obj = IntercorrenciaFactory(
+            unidade_codigo_eol="200237",
+            dre_codigo_eol="108500",
+            status="enviado_para_dre",
+            descricao_ocorrencia="texto longo " * 100,
+        )
+        obj.tipos_ocorrencia.set([TipoOcorrenciaFactory(nome="Bullying"), TipoOcorrenciaFactory(nome="Agressão")])
+        return obj
+
+    @patch("intercorrencias.services.unidades_service.get_unidades_em_lote", side_effect=_unidades_em_lote)
+    def test_campos_iguais_ao_serializer_completo(self, mock_lote, intercorrencia):
+        (item,) = IntercorrenciaListagemSerializer(_linhas(), many=True, context={}).data
+        completo = IntercorrenciaDiretorCompletoSerializer(intercorrencia, context={}).data
+
+        for campo in item.keys() - {"tipos_ocorrencia", "protocolo_da_intercorrencia"}:
+            assert item[campo] == completo[campo], campo
+        assert item["tipos_ocorrencia"] == sorted(completo["tipos_ocorrencia"], key=lambda t: t["nome"])
+        assert item["nome_unidade"] == "Unidade 200237"
+        assert item["status_extra"] == "Em andamento"
+        assert "descricao_ocorrencia" not in item
+
+    @patch("intercorrencias.services.unidades_service.get_unidades_em_lote", side_effect=_unidades_em_lote)
+    def test_consulta_nao_le_colunas_de_texto(self, mock_lote, intercorrencia):
+        with CaptureQueriesContext(connection) as ctx:
+            IntercorrenciaListagemSerializer(_linhas(), many=True, context={}).data
+
+        assert len(ctx.captured_queries) == 2  # linhas + tipos de ocorrência
+        assert "descricao_ocorrencia" not in ctx.captured_queries[0]["sql"]
+        mock_lote.assert_called_once()
+
+    @patch(
+        "intercorrencias.services.unidades_service.get_unidades_em_lote",
+        side_effect=ExternalServiceError("fora do ar"),
+    )
+    def test_servico_de_unidades_indisponivel(self, mock_lote, intercorrencia):
+        (item,) = IntercorrenciaListagemSerializer(_linhas(), many=True, context={}).data
+
+        assert item["nome_unidade"] is None
+        assert item["nome_dre"] is None
+        assert item["uuid"] == str(intercorrencia.uuid)
+
+    def test_lista_vazia(self):
+        assert IntercorrenciaListagemSerializer(_linhas(), many=True, context={}).data == []
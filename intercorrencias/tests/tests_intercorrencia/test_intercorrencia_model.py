@@ -1,11 +1,17 @@
+import importlib
+import threading
+
 import pytest
 from datetime import datetime
 
 from freezegun import freeze_time
+from django.apps import apps as django_apps
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.models.sequencia_protocolo import SequenciaProtocolo
 from intercorrencias.tests.factories import IntercorrenciaFactory
 from intercorrencias.choices.info_agressor_choices import (
     MotivoOcorrencia,
@@ -440,4 +446,157 @@ class TestIntercorrencia:
 
     def test_pode_ser_editado_por_gipe_com_status_finalizada(self, intercorrencia_factory):
         obj = intercorrencia_factory(status="finalizada")
-        assert obj.pode_ser_editado_por_gipe is True
\ No newline at end of file
+        assert obj.pode_ser_editado_por_gipe is True
+
+@pytest.mark.django_db
+class TestProtocolo:
+
+    @freeze_time("2025-06-01 12:00:00")
+    def test_gerar_protocolo_sequencial_por_ano(self):
+        assert Intercorrencia.gerar_protocolo() == "GIPE-2025/000001"
+        assert Intercorrencia.gerar_protocolo() == "GIPE-2025/000002"
+
+        with freeze_time("2026-01-02 12:00:00"):
+            assert Intercorrencia.gerar_protocolo() == "GIPE-2026/000001"
+        assert SequenciaProtocolo.objects.get(ano=2025).ultimo_numero == 2
+
+    @freeze_time("2025-06-01 12:00:00")
+    def test_numero_de_transacao_desfeita_e_reaproveitado(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Intercorrencia.gerar_protocolo()
+                raise RuntimeError("falha ao gravar")
+        assert Intercorrencia.gerar_protocolo() == "GIPE-2025/000001"
+
+    def test_protocolo_unico(self, intercorrencia_factory):
+        intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2025/000001")
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2025/000001")
+
+    def test_protocolo_em_branco_nao_conflita(self, intercorrencia_factory):
+        intercorrencia_factory(protocolo_da_intercorrencia="")
+        intercorrencia_factory(protocolo_da_intercorrencia="")
+        assert Intercorrencia.objects.filter(protocolo_da_intercorrencia="").count() == 2
+
+    def test_migracao_preserva_protocolos_e_inicializa_contador(self, intercorrencia_factory):
+        migracao = importlib.import_module("intercorrencias.migrations.0020_sequencia_protocolo")
+        antigo = intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2025/176000000000000000001")
+        intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2025/000041")
+        intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2025/000007")
+        intercorrencia_factory(protocolo_da_intercorrencia="GIPE-2024/175000000000000000002")
+        intercorrencia_factory(protocolo_da_intercorrencia="")
+
+        migracao.migrar_protocolos(django_apps, None)
+
+        antigo.refresh_from_db()
+        assert antigo.protocolo_da_intercorrencia == "GIPE-2025/176000000000000000001"
+        assert SequenciaProtocolo.objects.get(ano=2025).ultimo_numero == 41
+        assert not SequenciaProtocolo.objects.filter(ano=2024).exists()
+
+        with freeze_time("2025-06-01 12:00:00"):
+            assert Intercorrencia.gerar_protocolo() == "GIPE-2025/000042"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_gerar_protocolo_concorrente_nao_repete():
+    resultados = []
+
+    def _gerar():
+        try:
+            with transaction.atomic():
+                resultados.append(Intercorrencia.gerar_protocolo())
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=_gerar) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(resultados) == 8
+    assert len(set(resultados)) == 8
+
+
+@pytest.mark.django_db
+class TestGravacaoDasColunasAlteradas:
+    """ModeloBase.save grava só as colunas alteradas (mais atualizado_em)."""
+
+    def _updates(self, ctx):
+        tabela = Intercorrencia._meta.db_table
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(f'UPDATE "{tabela}"')]
+
+    def test_grava_apenas_colunas_alteradas(self):
+        from django.test.utils import CaptureQueriesContext
+
+        obj = Intercorrencia.objects.get(pk=IntercorrenciaFactory(descricao_ocorrencia="Texto longo").pk)
+        atualizado_em = obj.atualizado_em
+        obj.status = "enviado_para_dre"
+
+        with CaptureQueriesContext(connection) as ctx:
+            obj.save()
+
+        (update,) = self._updates(ctx)
+        assert '"status"' in update and '"atualizado_em"' in update
+        assert '"descricao_ocorrencia"' not in update
+        obj.refresh_from_db()
+        assert obj.status == "enviado_para_dre"
+        assert obj.atualizado_em > atualizado_em
+
+    def test_nao_grava_quando_nada_mudou(self):
+        from django.test.utils import CaptureQueriesContext
+
+        obj = Intercorrencia.objects.get(pk=IntercorrenciaFactory().pk)
+        obj.status = obj.status
+
+        with CaptureQueriesContext(connection) as ctx:
+            obj.save()
+
+        assert self._updates(ctx) == []
+
+    def test_lista_alterada_no_lugar_conta_como_alteracao(self):
+        obj = Intercorrencia.objects.get(pk=IntercorrenciaFactory(motivacao_ocorrencia=["bullying"]).pk)
+        obj.motivacao_ocorrencia.append("racismo")
+
+        assert obj.campos_alterados() == ["motivacao_ocorrencia"]
+        obj.save()
+        assert obj.campos_alterados() == []
+        obj.refresh_from_db()
+        assert obj.motivacao_ocorrencia == ["bullying", "racismo"]
+
+    def test_refresh_from_db_atualiza_valores_carregados(self):
+        obj = Intercorrencia.objects.get(pk=IntercorrenciaFactory(status="em_preenchimento_diretor").pk)
+        Intercorrencia.objects.filter(pk=obj.pk).update(status="enviado_para_dre")
+        obj.refresh_from_db()
+
+        obj.status = "em_preenchimento_diretor"
+        obj.save()
+
+        obj.refresh_from_db()
+        assert obj.status == "em_preenchimento_diretor"
+
+    def test_update_fields_explicito_continua_valendo(self):
+        obj = Intercorrencia.objects.get(pk=IntercorrenciaFactory(descricao_ocorrencia="Antes").pk)
+        obj.descricao_ocorrencia = "Depois"
+        obj.status = "enviado_para_dre"
+
+        obj.save(update_fields=["status"])
+
+        obj.refresh_from_db()
+        assert obj.status == "enviado_para_dre"
+        assert obj.descricao_ocorrencia == "Antes"
+
+
+@pytest.mark.django_db
+def test_benchmark_wal_atualizacao_nao_grava_dados():
+    from io import StringIO
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command("benchmark_wal_atualizacao", "--quantidade", "3", stdout=out)
+
+    linhas = out.getvalue().splitlines()
+    assert [linha.split("|")[0].strip() for linha in linhas[1:]] == ["linha inteira", "só alteradas", "sem alteração"]
+    assert int(linhas[-1].split("|")[1]) == 0
+    assert not Intercorrencia.objects.filter(user_username="benchmark").exists()
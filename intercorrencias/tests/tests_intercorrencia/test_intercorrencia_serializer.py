@@ -159,9 +159,9 @@ class TestIntercorrenciaDiretorCompletoSerializer:
         serializer = IntercorrenciaDiretorCompletoSerializer()
         assert serializer.get_status_extra(intercorrencia) == "Concluído"
 
-    @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
-    def test_serializer_fields(self, mock_get_unidade):
-        mock_get_unidade.return_value = {"nome": "Unidade Teste"}
+    @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidades_em_lote")
+    def test_serializer_fields(self, mock_get_lote):
+        mock_get_lote.return_value = {"123": {"nome": "Unidade Teste"}, "456": {"nome": "Unidade Teste"}}
 
         intercorrencia = Intercorrencia.objects.create(
             data_ocorrencia=timezone.now(),
@@ -171,14 +171,14 @@ class TestIntercorrenciaDiretorCompletoSerializer:
             sobre_furto_roubo_invasao_depredacao=True,
         )
 
-        cache = {"123": {"nome": "Unidade Teste"}, "456": {"nome": "Unidade Teste"}}
-        serializer = IntercorrenciaDiretorCompletoSerializer(intercorrencia, context={"cache_unidades": cache})
+        serializer = IntercorrenciaDiretorCompletoSerializer(intercorrencia)
         data = serializer.data
 
         assert "status_display" in data
         assert "status_extra" in data
         assert data["nome_unidade"] == "Unidade Teste"
         assert data["nome_dre"] == "Unidade Teste"
+        mock_get_lote.assert_called_once_with({"123", "456"})
 
     @patch("intercorrencias.api.serializers.intercorrencia_serializer.unidades_service.get_unidade")
     def test_get_nome_unidade_quando_servico_lanca_erro(self, mock_get_unidade):
@@ -520,7 +520,7 @@ class TestIntercorrenciaSecaoFinalSerializer:
             "comunicacao_seguranca_publica": Intercorrencia.SEGURANCA_PUBLICA_CHOICES[0][0],
             "protocolo_acionado": Intercorrencia.PROTOCOLO_CHOICES[0][0],
             "unidade_codigo_eol": "123",
-            "dre_codigo_eol": "456",
+            "dre_codigo_eol": "789",
         }
         
         serializer = IntercorrenciaSecaoFinalSerializer(
@@ -906,8 +906,12 @@ class TestIntercorrenciaConclusaoDaUeSerializer:
         }
         
     @patch("intercorrencias.services.unidades_service.get_unidade")
-    def test_serializer_conclusao_ue_valido(self, mock_get_unidade):
-        mock_get_unidade.return_value = {"codigo_eol": "123456", "dre_codigo_eol": "654321"}
+    @patch("intercorrencias.services.unidades_service.get_unidades_em_lote")
+    def test_serializer_conclusao_ue_valido(self, mock_get_lote, mock_get_unidade):
+        mock_get_lote.return_value = {
+            "123456": {"codigo_eol": "123456", "dre_codigo_eol": "654321", "nome": "EMEF"},
+            "654321": {"codigo_eol": "654321", "nome": "DRE"},
+        }
         serializer = IntercorrenciaConclusaoDaUeSerializer(
             instance=self.intercorrencia, data=self.valid_data, context={"request": self.request}
         )
@@ -915,6 +919,12 @@ class TestIntercorrenciaConclusaoDaUeSerializer:
         obj = serializer.save()
         assert obj.motivo_encerramento_ue == "Este é o motivo do encerramento da UE"
 
+        # Validação e resposta compartilham o loader da requisição: um único lote
+        resposta = IntercorrenciaConclusaoDaUeSerializer(obj, context={"request": self.request}).data
+        assert (resposta["nome_unidade"], resposta["nome_dre"]) == ("EMEF", "DRE")
+        mock_get_lote.assert_called_once_with({"123456", "654321"})
+        mock_get_unidade.assert_not_called()
+
 
     @patch("intercorrencias.services.unidades_service.get_unidade")
     def test_validate_dre_incorreta(self, mock_get, intercorrencia_data, request):
@@ -1345,4 +1355,113 @@ class TestIntercorrenciaUpdateDiretorCompletoSerializer:
         instance.refresh_from_db()
         
         # Verifica que smart_sampa_situacao foi limpo
-        assert instance.smart_sampa_situacao == ""
\ No newline at end of file
+        assert instance.smart_sampa_situacao == ""
+
+@pytest.mark.django_db
+class TestGravacaoUnicaDasSecoes:
+    """As seções gravam numa única instrução UPDATE, já com os campos limpos, dentro de uma transação."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.tipo = TipoOcorrencia.objects.create(nome=f"Tipo {uuid4()}")
+        self.envolvido = Envolvido.objects.create(perfil_dos_envolvidos="Estudante")
+
+    def _intercorrencia(self, **kwargs):
+        dados = {
+            "data_ocorrencia": timezone.now(),
+            "user_username": "diretor1",
+            "unidade_codigo_eol": "123456",
+            "dre_codigo_eol": "654321",
+            "tem_info_agressor_ou_vitima": "sim",
+            "nome_pessoa_agressora": "João da Silva",
+            "idade_pessoa_agressora": 17,
+            "notificado_conselho_tutelar": True,
+            "acompanhado_naapa": True,
+            "smart_sampa_situacao": "sim_com_dano",
+        }
+        return Intercorrencia.objects.create(**{**dados, **kwargs})
+
+    def _salvar(self, serializer_class, instance, data, **contexto):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        serializer = serializer_class(instance=instance, data=data, partial=True, context=contexto)
+        assert serializer.is_valid(), serializer.errors
+        with CaptureQueriesContext(connection) as ctx:
+            serializer.save()
+        tabela = Intercorrencia._meta.db_table
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(f'UPDATE "{tabela}"')]
+
+    def test_furto_roubo(self):
+        obj = self._intercorrencia(sobre_furto_roubo_invasao_depredacao=True)
+        data = {
+            "tipos_ocorrencia": [str(self.tipo.uuid)],
+            "descricao_ocorrencia": "Roubo de equipamentos",
+            "smart_sampa_situacao": "sim_sem_dano",
+        }
+
+        updates = self._salvar(IntercorrenciaFurtoRouboSerializer, obj, data)
+
+        assert len(updates) == 1
+        assert '"nome_pessoa_agressora"' not in updates[0]
+        obj.refresh_from_db()
+        assert obj.tem_info_agressor_ou_vitima == ""
+        assert obj.idade_pessoa_agressora is None
+        assert obj.notificado_conselho_tutelar is None
+        assert obj.smart_sampa_situacao == "sim_sem_dano"
+        assert list(obj.tipos_ocorrencia.all()) == [self.tipo]
+
+    def test_nao_furto_roubo_sem_info_de_agressor(self):
+        obj = self._intercorrencia(sobre_furto_roubo_invasao_depredacao=False)
+        data = {
+            "tipos_ocorrencia": [str(self.tipo.uuid)],
+            "descricao_ocorrencia": "Briga no recreio",
+            "envolvido": str(self.envolvido.uuid),
+            "tem_info_agressor_ou_vitima": "nao",
+        }
+
+        updates = self._salvar(IntercorrenciaNaoFurtoRouboSerializer, obj, data)
+
+        assert len(updates) == 1
+        obj.refresh_from_db()
+        assert obj.smart_sampa_situacao == ""
+        assert obj.tem_info_agressor_ou_vitima == "nao"
+        assert obj.acompanhado_naapa is None
+        assert obj.envolvido == self.envolvido
+
+    @patch("intercorrencias.services.unidades_service.get_unidade")
+    def test_update_completo_mantem_agressor_com_info(self, mock_get_unidade, request_factory):
+        from intercorrencias.api.serializers.intercorrencia_serializer import (
+            IntercorrenciaUpdateDiretorCompletoSerializer,
+        )
+
+        mock_get_unidade.return_value = {"codigo_eol": "123456", "dre_codigo_eol": "654321"}
+        request = request_factory.put("/fake-url/")
+        request.user = MagicMock(unidade_codigo_eol="123456")
+        obj = self._intercorrencia(sobre_furto_roubo_invasao_depredacao=False)
+        data = {"unidade_codigo_eol": "123456", "dre_codigo_eol": "654321", "descricao_ocorrencia": "Nova"}
+
+        updates = self._salvar(IntercorrenciaUpdateDiretorCompletoSerializer, obj, data, request=request)
+
+        assert len(updates) == 1
+        obj.refresh_from_db()
+        assert obj.smart_sampa_situacao == ""
+        assert obj.idade_pessoa_agressora == 17
+        assert obj.descricao_ocorrencia == "Nova"
+
+    def test_falha_nos_tipos_desfaz_a_gravacao(self):
+        obj = self._intercorrencia(sobre_furto_roubo_invasao_depredacao=True, descricao_ocorrencia="Original")
+        serializer = IntercorrenciaFurtoRouboSerializer(
+            instance=obj,
+            data={"tipos_ocorrencia": [str(self.tipo.uuid)], "descricao_ocorrencia": "Alterada",
+                  "smart_sampa_situacao": "sim_sem_dano"},
+            partial=True,
+        )
+        assert serializer.is_valid(), serializer.errors
+
+        with patch.object(type(obj.tipos_ocorrencia), "set", side_effect=RuntimeError), pytest.raises(RuntimeError):
+            serializer.save()
+
+        obj.refresh_from_db()
+        assert obj.descricao_ocorrencia == "Original"
+        assert obj.tem_info_agressor_ou_vitima == "sim"
@@ -1,5 +1,7 @@
 import pytest
 import secrets
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from unittest.mock import PropertyMock, patch, Mock, MagicMock
 
@@ -207,6 +209,22 @@ class TestIntercorrenciaDiretorViewSet:
         response = self._api_call(client, diretor_user, 'put', url, data)
         assert response.status_code == status.HTTP_200_OK
 
+    def test_furto_roubo_sem_alteracao_nao_grava(self, client, diretor_user, intercorrencia, tipos_ocorrencia):
+        data = {"tipos_ocorrencia": [str(tipos_ocorrencia[0].uuid)], "descricao_ocorrencia": "Teste", "smart_sampa_situacao": "sim_com_dano"}
+        url = f"/api-intercorrencias/v1/diretor/{intercorrencia.uuid}/furto-roubo/"
+        assert self._api_call(client, diretor_user, 'put', url, data).status_code == status.HTTP_200_OK
+        intercorrencia.refresh_from_db()
+        atualizado_em = intercorrencia.atualizado_em
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self._api_call(client, diretor_user, 'put', url, data)
+
+        assert response.status_code == status.HTTP_200_OK
+        tabela = Intercorrencia._meta.db_table
+        assert not [q for q in consultas.captured_queries if q["sql"].startswith(f'UPDATE "{tabela}"')]
+        intercorrencia.refresh_from_db()
+        assert intercorrencia.atualizado_em == atualizado_em
+
     def test_furto_roubo_bloqueado(self, client, diretor_user, intercorrencia, tipos_ocorrencia):
         type(intercorrencia).pode_ser_editado_por_diretor = PropertyMock(return_value=False)
         data = {"unidade_codigo_eol": "200237", "dre_codigo_eol": "108500", "tipos_ocorrencia": [str(tipos_ocorrencia[0].uuid)], "descricao_ocorrencia": "Teste bloqueado", "smart_sampa_situacao": "sim_com_dano"}
@@ -464,6 +482,43 @@ class TestIntercorrenciaDiretorViewSet:
         response = self._api_call(client, diretor_user, 'put', url, data)
         assert response.status_code == status.HTTP_200_OK
         
+    def test_enviar_para_dre_busca_unidades_em_um_unico_lote(self, client, diretor_user, intercorrencia):
+        type(intercorrencia).pode_ser_editado_por_diretor = PropertyMock(return_value=True)
+        data = {"unidade_codigo_eol": "200237", "dre_codigo_eol": "108500", "motivo_encerramento_ue": "Encerramento teste",}
+        url = f"/api-intercorrencias/v1/diretor/{intercorrencia.uuid}/enviar-para-dre/"
+
+        with patch(
+            "intercorrencias.services.unidades_service.get_unidades_em_lote",
+            return_value={
+                "200237": {"codigo_eol": "200237", "dre_codigo_eol": "108500", "nome": "Unidade 200237"},
+                "108500": {"codigo_eol": "108500", "nome": "DRE 108500"},
+            },
+        ) as mock_lote, patch("intercorrencias.services.unidades_service.get_unidade") as mock_get:
+            response = self._api_call(client, diretor_user, 'put', url, data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["nome_unidade"] == "Unidade 200237"
+        assert response.data["nome_dre"] == "DRE 108500"
+        mock_lote.assert_called_once_with({"200237", "108500"})
+        mock_get.assert_not_called()
+
+    def test_enviar_para_dre_reusa_protocolo_gravado_por_envio_concorrente(self, client, diretor_user, intercorrencia):
+        type(intercorrencia).pode_ser_editado_por_diretor = PropertyMock(return_value=True)
+        # Outro envio já gravou o protocolo depois que esta requisição leu a linha
+        Intercorrencia.objects.filter(pk=intercorrencia.pk).update(protocolo_da_intercorrencia="GIPE-2025/000007")
+        intercorrencia.protocolo_da_intercorrencia = ""
+        data = {"unidade_codigo_eol": "200237", "dre_codigo_eol": "108500", "motivo_encerramento_ue": "Encerramento teste",}
+        url = f"/api-intercorrencias/v1/diretor/{intercorrencia.uuid}/enviar-para-dre/"
+
+        with patch.object(IntercorrenciaDiretorViewSet, "get_object", return_value=intercorrencia), \
+                patch.object(Intercorrencia, "gerar_protocolo") as mock_gerar:
+            response = self._api_call(client, diretor_user, 'put', url, data)
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_gerar.assert_not_called()
+        intercorrencia.refresh_from_db()
+        assert intercorrencia.protocolo_da_intercorrencia == "GIPE-2025/000007"
+
     def test_enviar_para_dre_nao_editavel(self, client, diretor_user, intercorrencia, declarante):
         client.force_authenticate(user=diretor_user)
         type(intercorrencia).pode_ser_editado_por_diretor = PropertyMock(return_value=False)
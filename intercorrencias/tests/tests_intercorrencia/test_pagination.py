@@ -0,0 +1,83 @@
+import secrets
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from intercorrencias.models.intercorrencia import Intercorrencia
+from intercorrencias.tests.factories import IntercorrenciaFactory
+
+URL = "/api-intercorrencias/v1/gipe/"
+
+
+@pytest.mark.django_db
+class TestIntercorrenciaCursorPagination:
+
+    @pytest.fixture
+    def client(self, django_user_model):
+        user = django_user_model.objects.create_user(username="gipe", password=secrets.token_urlsafe(16))
+        user.cargo_codigo = settings.CODIGO_PERFIL_GIPE
+        user.unidade_codigo_eol = "GIPE01"
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def intercorrencias(self):
+        objs = IntercorrenciaFactory.create_batch(7)
+        agora = timezone.now()
+        # Três registros com o mesmo criado_em: o desempate é pelo id
+        for i, obj in enumerate(objs):
+            Intercorrencia.objects.filter(pk=obj.pk).update(criado_em=agora - timedelta(minutes=min(i, 3)))
+        return list(Intercorrencia.objects.order_by("-criado_em", "-id").values_list("uuid", flat=True))
+
+    def _uuids(self, response):
+        return [r["uuid"] for r in response.data["results"]]
+
+    def test_percorre_todas_as_paginas_sem_repetir(self, client, intercorrencias, settings):
+        settings.INTERCORRENCIAS_PAGE_SIZE = 3
+
+        vistos, url = [], URL
+        while url:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            vistos += self._uuids(response)
+            url = response.data["next"]
+
+        assert vistos == [str(u) for u in intercorrencias]
+
+    def test_volta_pela_pagina_anterior(self, client, intercorrencias, settings):
+        settings.INTERCORRENCIAS_PAGE_SIZE = 3
+
+        primeira = client.get(URL)
+        segunda = client.get(primeira.data["next"])
+        terceira = client.get(segunda.data["next"])
+        assert terceira.data["next"] is None
+
+        assert self._uuids(client.get(terceira.data["previous"])) == self._uuids(segunda)
+        voltou = client.get(segunda.data["previous"])
+        assert self._uuids(voltou) == self._uuids(primeira)
+        assert voltou.data["previous"] is None
+        assert primeira.data["previous"] is None
+
+    def test_page_size_configuravel_e_limitado(self, client, intercorrencias, settings):
+        settings.INTERCORRENCIAS_MAX_PAGE_SIZE = 4
+
+        assert len(client.get(URL, {"page_size": 2}).data["results"]) == 2
+        assert len(client.get(URL, {"page_size": 100}).data["results"]) == 4
+
+    def test_cursor_invalido(self, client, intercorrencias):
+        response = client.get(URL, {"cursor": "nao-e-um-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_listagem_gipe_restrita_ao_perfil_gipe(self, django_user_model, intercorrencias):
+        user = django_user_model.objects.create_user(username="diretor")
+        user.cargo_codigo = settings.CODIGO_PERFIL_DIRETOR
+        user.unidade_codigo_eol = "200237"
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        assert client.get(URL).status_code == status.HTTP_403_FORBIDDEN
@@ -19,3 +19,16 @@ def test_remotejwt_scheme_definition_unitario():
     assert definition2["scheme"] == "bearer"
     assert definition2["type"] == "http"
     assert definition2.get("bearerFormat") == "JWT" 
+
+
+def test_schema_da_listagem_compacta():
+    schema = ext.IntercorrenciaListagemSerializerExtension(target=None).map_serializer(None, "response")
+    assert schema["type"] == "object"
+    assert set(schema["properties"]) >= set(ext.IntercorrenciaListagemSerializer.CAMPOS)
+    assert schema["properties"]["tipos_ocorrencia"]["type"] == "array"
+
+
+def test_schema_das_duplicatas_inclui_similaridade():
+    schema = ext.IntercorrenciaDuplicataSerializerExtension(target=None).map_serializer(None, "response")
+    assert schema["properties"]["similaridade"]["type"] == "number"
+    assert "similaridade" in schema["required"]
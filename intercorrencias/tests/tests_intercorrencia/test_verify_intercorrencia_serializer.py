@@ -35,4 +35,9 @@ class TestUUIDInputSerializer:
         error_data = excinfo.value.detail
         assert isinstance(error_data, dict)
         assert "detail" in error_data
-        assert "uuid" in error_data["detail"]
\ No newline at end of file
+        assert "uuid" in error_data["detail"]
+
+def test_verify_nao_expoe_vetor_de_busca():
+    from intercorrencias.api.serializers.verify_intercorrencia_serializer import VerifyIntercorrenciaSerializer
+
+    assert "busca_texto" not in VerifyIntercorrenciaSerializer().fields
@@ -0,0 +1,152 @@
+import base64
+import json
+
+import jwt
+import pytest
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import cache
+
+from intercorrencias.services import auth_service
+from intercorrencias.services.auth_service import ChaveIndisponivelError
+
+
+def _jwk(secret: str, kid: str) -> dict:
+    k = base64.urlsafe_b64encode(secret.encode()).rstrip(b"=").decode()
+    return {"kty": "oct", "k": k, "kid": kid, "alg": "HS256"}
+
+
+def _jwk_rsa(chave_privada, kid: str) -> dict:
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(chave_privada.public_key()))
+    return {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+@pytest.fixture(scope="module")
+def chave_rsa():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _resp(data):
+    r = MagicMock()
+    r.json.return_value = data
+    r.raise_for_status.return_value = None
+    return r
+
+
+@pytest.fixture(autouse=True)
+def _estado_limpo(settings):
+    settings.AUTH_JWKS_URL = "http://auth/jwks/"
+    settings.AUTH_JWKS_REFRESH_SECONDS = 300
+    settings.AUTH_REVOCATION_URL = "http://auth/revogados/"
+    settings.AUTH_REVOCATION_REFRESH_SECONDS = 60
+    cache.clear()
+    auth_service.limpar_estado_local()
+    yield
+    cache.clear()
+    auth_service.limpar_estado_local()
+
+
+class TestChavePublica:
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_jwks_compartilhado_entre_processos(self, mock_get):
+        mock_get.return_value = _resp({"keys": [_jwk("segredo-um", "k1")]})
+
+        assert auth_service.get_chave_publica("k1") == b"segredo-um"
+
+        # Outro worker: sem cópia local, mas com o JWKS no cache compartilhado
+        auth_service.limpar_estado_local()
+        assert auth_service.get_chave_publica("k1") == b"segredo-um"
+        mock_get.assert_called_once()
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_kid_desconhecido_forca_sincronizacao(self, mock_get, monkeypatch):
+        mock_get.side_effect = [
+            _resp({"keys": [_jwk("segredo-um", "k1")]}),
+            _resp({"keys": [_jwk("segredo-um", "k1"), _jwk("segredo-dois", "k2")]}),
+        ]
+        auth_service.get_chave_publica("k1")
+
+        monkeypatch.setattr(auth_service, "JWKS_INTERVALO_MINIMO", 0)
+        assert auth_service.get_chave_publica("k2") == b"segredo-dois"
+        assert mock_get.call_count == 2
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_kid_desconhecido_respeita_intervalo_minimo(self, mock_get):
+        mock_get.return_value = _resp({"keys": [_jwk("segredo-um", "k1")]})
+        auth_service.get_chave_publica("k1")
+
+        with pytest.raises(ChaveIndisponivelError):
+            auth_service.get_chave_publica("k-inexistente")
+        mock_get.assert_called_once()
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_falha_na_sincronizacao_usa_ultimo_jwks(self, mock_get, settings):
+        mock_get.return_value = _resp({"keys": [_jwk("segredo-um", "k1")]})
+        auth_service.get_chave_publica("k1")
+
+        settings.AUTH_JWKS_REFRESH_SECONDS = 0
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        assert auth_service.get_chave_publica("k1") == b"segredo-um"
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_sem_jwks_disponivel_gera_erro(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        with pytest.raises(ChaveIndisponivelError):
+            auth_service.get_chave_publica("k1")
+
+    def test_sem_jwks_url_usa_chave_estatica(self, settings):
+        settings.AUTH_JWKS_URL = ""
+        settings.AUTH_PUBLIC_KEY = "chave-estatica"
+        assert auth_service.get_chave_publica(None) == "chave-estatica"
+
+
+class TestChavesRsa:
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_jwks_rsa_carrega_chave_publica(self, mock_get, chave_rsa):
+        mock_get.return_value = _resp({"keys": [_jwk_rsa(chave_rsa, "rsa-1")]})
+
+        chave = auth_service.get_chave_publica("rsa-1")
+
+        token = jwt.encode({"username": "ana"}, chave_rsa, algorithm="RS256", headers={"kid": "rsa-1"})
+        assert jwt.decode(token, chave, algorithms=["RS256"])["username"] == "ana"
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_nenhuma_chave_utilizavel_gera_erro(self, mock_get, chave_rsa):
+        mock_get.return_value = _resp({"keys": [_jwk_rsa(chave_rsa, "rsa-1")]})
+
+        # Como fica sem o pacote cryptography: toda chave RSA é recusada pelo PyJWT
+        with patch.object(
+            auth_service.jwt, "PyJWK", side_effect=jwt.exceptions.MissingCryptographyError("sem cryptography")
+        ):
+            with pytest.raises(ChaveIndisponivelError, match="Nenhuma chave utilizável"):
+                auth_service.carregar_chaves()
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_chaves_invalidas_sao_ignoradas(self, mock_get, chave_rsa):
+        mock_get.return_value = _resp({"keys": [{"kty": "RSA", "kid": "quebrada"}, _jwk_rsa(chave_rsa, "rsa-1")]})
+
+        assert set(auth_service.carregar_chaves()) == {"rsa-1"}
+
+
+class TestRevogados:
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_lista_sincronizada_periodicamente(self, mock_get):
+        mock_get.return_value = _resp(["a", "b"])
+
+        assert auth_service.get_revogados() == frozenset({"a", "b"})
+        assert auth_service.get_revogados() == frozenset({"a", "b"})
+        mock_get.assert_called_once()
+
+    @patch("intercorrencias.services.auth_service.http_client.get")
+    def test_lista_indisponivel_retorna_vazio(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        assert auth_service.get_revogados() == frozenset()
+
+    def test_sem_url_retorna_vazio(self, settings):
+        settings.AUTH_REVOCATION_URL = ""
+        assert auth_service.get_revogados() == frozenset()
@@ -0,0 +1,91 @@
+import time
+import hashlib
+
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+
+from intercorrencias.services.cache_service import LocalLRUCache, TwoTierCache, AUSENTE
+from intercorrencias.services.token_cache import TokenCache, token_digest
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestLocalLRUCache:
+
+    def test_descarta_menos_usado_ao_exceder_limite(self):
+        lru = LocalLRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("a") == 1
+        assert lru.get("b") is AUSENTE
+        assert lru.get("c") == 3
+        assert len(lru) == 2
+
+    def test_entrada_expirada_nao_e_retornada(self, monkeypatch):
+        lru = LocalLRUCache()
+        agora = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: agora)
+        lru.set("a", 1, ttl=10)
+
+        monkeypatch.setattr(time, "monotonic", lambda: agora + 11)
+        assert lru.get("a", None) is None
+
+
+class TestTwoTierCache:
+
+    def test_contadores_por_camada(self):
+        worker_1 = TwoTierCache("teste")
+        worker_2 = TwoTierCache("teste")
+
+        assert worker_1.get("k") is None
+        worker_1.set("k", {"v": 1}, ttl=60)
+        assert worker_1.get("k") == {"v": 1}
+        assert worker_2.get("k") == {"v": 1}
+        assert worker_2.get("k") == {"v": 1}
+
+        assert worker_1.stats()["misses"] == 1
+        assert worker_1.stats()["l1_hits"] == 1
+        assert worker_2.stats()["l2_hits"] == 1
+        assert worker_2.stats()["l1_hits"] == 1
+        assert worker_2.stats()["hit_rate"] == 1.0
+
+    def test_delete_remove_das_duas_camadas(self):
+        c = TwoTierCache("teste")
+        c.set("k", 1, ttl=60)
+        c.delete("k")
+        assert c.get("k") is None
+        assert cache.get("teste:k") is None
+
+
+class TestTokenCache:
+
+    def test_chave_e_sha256_do_token(self):
+        assert token_digest("abc") == hashlib.sha256(b"abc").hexdigest()
+
+    def test_ttl_respeita_exp_do_token(self, settings):
+        settings.AUTH_TOKEN_CACHE_MAX_TTL = 300
+        tc = TokenCache()
+        payload = {"username": "x", "exp": int(time.time()) + 5}
+
+        with patch("intercorrencias.services.cache_service.cache") as mock_cache:
+            tc.set("tok", payload)
+
+        chave, valor, ttl = mock_cache.set.call_args.args
+        assert chave == f"jwtv:{token_digest('tok')}"
+        assert valor == payload
+        assert 0 < ttl <= 5
+
+    def test_token_expirado_nao_e_armazenado(self):
+        tc = TokenCache()
+        tc.set("tok", {"username": "x", "exp": int(time.time()) - 1})
+        assert tc.get("tok") is None
+        assert cache.get(f"jwtv:{token_digest('tok')}") is None
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+
+from intercorrencias.services.circuit_breaker import CircuitBreaker, CircuitoAbertoError
+from intercorrencias.services.deadline import PrazoEsgotadoError
+
+
+def _resposta(status_code):
+    r = MagicMock()
+    r.status_code = status_code
+    return r
+
+
+@pytest.fixture
+def circuito(settings):
+    settings.CIRCUIT_BREAKER_FAILURES = 3
+    settings.CIRCUIT_BREAKER_WINDOW = 30
+    settings.CIRCUIT_BREAKER_OPEN_SECONDS = 30
+    cache.clear()
+    yield CircuitBreaker("teste")
+    cache.clear()
+
+
+def _vencer_periodo_aberto(circuito):
+    cache.set(circuito._aberto_key, time.time() - 1, 600)
+
+
+def _falhar(circuito, vezes):
+    for _ in range(vezes):
+        with pytest.raises(requests.ConnectionError):
+            circuito.chamar(MagicMock(side_effect=requests.ConnectionError("fora do ar")))
+
+
+class TestCircuitBreaker:
+
+    def test_abre_apos_limite_de_falhas(self, circuito):
+        _falhar(circuito, 3)
+        assert circuito.estado() == "aberto"
+
+        fn = MagicMock()
+        with pytest.raises(CircuitoAbertoError):
+            circuito.chamar(fn)
+        fn.assert_not_called()
+
+    def test_respostas_5xx_contam_como_falha(self, circuito):
+        for _ in range(3):
+            assert circuito.chamar(lambda: _resposta(503)).status_code == 503
+        assert circuito.estado() == "aberto"
+
+    def test_sucesso_zera_as_falhas(self, circuito):
+        _falhar(circuito, 2)
+        circuito.chamar(lambda: _resposta(404))
+        _falhar(circuito, 2)
+        assert circuito.estado() == "fechado"
+
+    def test_estado_compartilhado_entre_workers(self, circuito):
+        _falhar(circuito, 3)
+        assert CircuitBreaker("teste").estado() == "aberto"
+
+    def test_meio_aberto_libera_uma_chamada_de_teste(self, circuito):
+        _falhar(circuito, 3)
+        _vencer_periodo_aberto(circuito)
+
+        assert circuito.estado() == "meio-aberto"
+        assert circuito.permitir() is True
+        assert circuito.permitir() is False
+
+        circuito.registrar_sucesso()
+        assert circuito.estado() == "fechado"
+
+    def test_falha_no_meio_aberto_reabre(self, circuito):
+        _falhar(circuito, 3)
+        _vencer_periodo_aberto(circuito)
+
+        _falhar(circuito, 1)
+        assert circuito.estado() == "aberto"
+
+    def test_prazo_esgotado_nao_conta_como_falha(self, circuito):
+        for _ in range(3):
+            with pytest.raises(PrazoEsgotadoError):
+                circuito.chamar(MagicMock(side_effect=PrazoEsgotadoError()))
+        assert circuito.estado() == "fechado"
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from intercorrencias.middleware import PrazoChamadasExternasMiddleware
+from intercorrencias.services import deadline
+from intercorrencias.services.http_client import HttpClient
+
+
+class TestDeadline:
+
+    def test_sem_prazo_nao_limita(self):
+        assert deadline.restante() is None
+        assert deadline.limitar(3.0) == 3.0
+
+    def test_limita_ao_restante(self):
+        with deadline.prazo(1.0):
+            assert deadline.limitar(3.0) <= 1.0
+            assert deadline.limitar(0.5) == 0.5
+        assert deadline.restante() is None
+
+    def test_prazo_aninhado_nao_estende(self):
+        with deadline.prazo(1.0):
+            with deadline.prazo(10.0):
+                assert deadline.restante() <= 1.0
+
+    def test_prazo_esgotado(self):
+        with deadline.prazo(0.01):
+            time.sleep(0.02)
+            with pytest.raises(deadline.PrazoEsgotadoError):
+                deadline.limitar(3.0)
+
+    def test_http_client_usa_orcamento_da_requisicao(self, settings):
+        settings.HTTP_CONNECT_TIMEOUT = 1.0
+        client = HttpClient()
+        with patch("requests.Session.get") as mock_get, deadline.prazo(0.5):
+            client.get("http://servico/x/", timeout=3.0)
+        conexao, leitura = mock_get.call_args.kwargs["timeout"]
+        assert leitura <= 0.5 and conexao <= 0.5
+
+    def test_http_client_nao_chama_sem_orcamento(self):
+        client = HttpClient()
+        with patch("requests.Session.get") as mock_get, deadline.prazo(0.01):
+            time.sleep(0.02)
+            with pytest.raises(deadline.PrazoEsgotadoError):
+                client.get("http://servico/x/")
+        mock_get.assert_not_called()
+
+
+class TestPrazoChamadasExternasMiddleware:
+
+    def test_define_prazo_durante_a_requisicao(self, settings):
+        settings.OUTBOUND_REQUEST_BUDGET = 2.0
+        vistos = []
+
+        def view(request):
+            vistos.append(deadline.restante())
+            return HttpResponse()
+
+        PrazoChamadasExternasMiddleware(view)(RequestFactory().get("/"))
+
+        assert 0 < vistos[0] <= 2.0
+        assert deadline.restante() is None
+
+    def test_desligado_sem_orcamento(self, settings):
+        settings.OUTBOUND_REQUEST_BUDGET = 0
+        vistos = []
+
+        def view(request):
+            vistos.append(deadline.restante())
+            return HttpResponse()
+
+        PrazoChamadasExternasMiddleware(view)(RequestFactory().get("/"))
+        assert vistos == [None]
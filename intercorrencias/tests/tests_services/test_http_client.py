@@ -0,0 +1,152 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from intercorrencias.services import deadline
+from intercorrencias.services.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # mantém a conexão aberta (keep-alive)
+    respostas: list[int] = []
+    recebidas: list[str] = []
+    atraso = 0.0
+
+    def _responder(self):
+        self.recebidas.append(self.command)
+        time.sleep(self.atraso)
+        status = self.respostas.pop(0) if self.respostas else 200
+        corpo = json.dumps({"ok": status == 200}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        self._responder()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._responder()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    _Handler.respostas = []
+    _Handler.recebidas = []
+    _Handler.atraso = 0.0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(settings):
+    settings.HTTP_GET_RETRIES = 2
+    settings.HTTP_RETRY_BACKOFF = 0
+    c = HttpClient()
+    yield c
+    c.close()
+
+
+class TestHttpClient:
+
+    def test_reutiliza_conexao_keep_alive(self, client, servidor):
+        for _ in range(3):
+            assert client.get(f"{servidor}/x/", timeout=2).status_code == 200
+
+        (stats,) = client.pool_stats().values()
+        assert stats["num_connections"] == 1
+        assert stats["num_requests"] == 3
+        assert stats["idle"] == 1
+
+    def test_get_repete_em_503(self, client, servidor):
+        _Handler.respostas = [503, 200]
+
+        r = client.get(f"{servidor}/x/", timeout=2)
+
+        assert r.status_code == 200
+        assert _Handler.recebidas == ["GET", "GET"]
+
+    def test_get_retentativas_sao_limitadas(self, client, servidor):
+        _Handler.respostas = [503, 503, 503, 503]
+
+        r = client.get(f"{servidor}/x/", timeout=2)
+
+        assert r.status_code == 503
+        assert len(_Handler.recebidas) == 3  # 1 + HTTP_GET_RETRIES
+
+    def test_post_nao_e_repetido(self, client, servidor):
+        _Handler.respostas = [503, 200]
+
+        r = client.post(f"{servidor}/x/", json={"a": 1}, timeout=2)
+
+        assert r.status_code == 503
+        assert _Handler.recebidas == ["POST"]
+
+    def test_timeouts_de_conexao_e_leitura_separados(self, client, settings):
+        settings.HTTP_CONNECT_TIMEOUT = 0.5
+        with patch("requests.Session.get") as mock_get:
+            client.get("http://servico/x/", timeout=3.0)
+        assert mock_get.call_args.kwargs["timeout"] == (0.5, 3.0)
+
+    def test_sessao_recriada_apos_fork(self, client, monkeypatch):
+        primeira = client.session
+        monkeypatch.setattr("os.getpid", lambda: -1)
+        assert client.session is not primeira
+
+    def test_pool_stats_vazio_sem_requisicoes(self, client):
+        assert client.pool_stats() == {}
+
+    def test_timeout_de_leitura_nao_e_repetido(self, client, servidor):
+        _Handler.atraso = 0.3
+
+        with pytest.raises(requests.ReadTimeout):
+            client.get(f"{servidor}/x/", timeout=0.1)
+        assert _Handler.recebidas == ["GET"]
+
+    def test_falha_de_conexao_e_repetida(self, client):
+        ok = MagicMock(status_code=200)
+        with patch("requests.Session.get", side_effect=[requests.ConnectionError("reset"), ok]) as mock_get:
+            assert client.get("http://servico/x/", timeout=1) is ok
+        assert mock_get.call_count == 2
+
+    def test_nao_repete_se_o_backoff_nao_cabe_no_prazo(self, client, servidor, settings):
+        settings.HTTP_RETRY_BACKOFF = 1.0
+        _Handler.respostas = [503, 200]
+
+        with deadline.prazo(0.5):
+            r = client.get(f"{servidor}/x/", timeout=2)
+
+        assert r.status_code == 503
+        assert _Handler.recebidas == ["GET"]
+
+    def test_cada_tentativa_recalcula_o_timeout_pelo_prazo(self, client, settings):
+        settings.HTTP_RETRY_BACKOFF = 0.01
+        ok = MagicMock(status_code=200)
+        timeouts = []
+
+        def _get(url, timeout, **kwargs):
+            timeouts.append(timeout[1])
+            if len(timeouts) == 1:
+                time.sleep(0.2)
+                raise requests.ConnectionError("reset")
+            return ok
+
+        with patch("requests.Session.get", side_effect=_get), deadline.prazo(1.0):
+            client.get("http://servico/x/", timeout=3)
+
+        assert timeouts[0] <= 1.0
+        assert timeouts[1] <= timeouts[0] - 0.2
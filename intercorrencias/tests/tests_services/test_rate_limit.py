@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from django.core.cache import cache
+
+from intercorrencias.services.rate_limit import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestTokenBucket:
+
+    def test_permite_rajada_ate_a_capacidade(self):
+        bucket = TokenBucket("teste", capacidade=3, taxa=1)
+
+        assert [bucket.consumir("cliente") for _ in range(3)] == [0, 0, 0]
+        assert bucket.consumir("cliente") > 0
+
+    def test_repoe_fichas_com_o_tempo(self, monkeypatch):
+        agora = time.time()
+        monkeypatch.setattr(time, "time", lambda: agora)
+        bucket = TokenBucket("teste", capacidade=1, taxa=2)
+
+        assert bucket.consumir("cliente") == 0
+        assert bucket.consumir("cliente") == pytest.approx(0.5)
+
+        monkeypatch.setattr(time, "time", lambda: agora + 0.5)
+        assert bucket.consumir("cliente") == 0
+
+    def test_clientes_tem_baldes_independentes(self):
+        bucket = TokenBucket("teste", capacidade=1, taxa=0.01)
+
+        assert bucket.consumir("a") == 0
+        assert bucket.consumir("a") > 0
+        assert bucket.consumir("b") == 0
+
+    def test_estado_compartilhado_pelo_cache(self):
+        worker_1 = TokenBucket("teste", capacidade=1, taxa=0.01)
+        worker_2 = TokenBucket("teste", capacidade=1, taxa=0.01)
+
+        assert worker_1.consumir("cliente") == 0
+        assert worker_2.consumir("cliente") > 0
+
+    @pytest.mark.parametrize("taxa, capacidade", [(0, 3), (-1, 3), (1, 0)])
+    def test_recusa_taxa_ou_capacidade_invalidas(self, taxa, capacidade):
+        with pytest.raises(ValueError):
+            TokenBucket("teste", capacidade=capacidade, taxa=taxa)
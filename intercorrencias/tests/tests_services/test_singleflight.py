@@ -0,0 +1,133 @@
+import time
+import threading
+
+import pytest
+from django.core.cache import cache
+
+from intercorrencias.services import deadline
+from intercorrencias.services.singleflight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def _limpa_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _em_paralelo(n, alvo):
+    barreira = threading.Barrier(n)
+    resultados, erros = [], []
+
+    def _run():
+        barreira.wait()
+        try:
+            resultados.append(alvo())
+        except Exception as e:
+            erros.append(e)
+
+    threads = [threading.Thread(target=_run) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return resultados, erros
+
+
+class TestSingleFlight:
+
+    def test_threads_compartilham_uma_execucao(self):
+        sf = SingleFlight("teste")
+        chamadas = {"n": 0}
+
+        def lento():
+            chamadas["n"] += 1
+            time.sleep(0.2)
+            return {"ok": True}
+
+        resultados, erros = _em_paralelo(6, lambda: sf.do("k", lento))
+
+        assert chamadas["n"] == 1
+        assert erros == []
+        assert resultados == [{"ok": True}] * 6
+
+    def test_erro_do_lider_e_propagado_aos_seguidores(self):
+        sf = SingleFlight("teste")
+        chamadas = {"n": 0}
+
+        def falha():
+            chamadas["n"] += 1
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        resultados, erros = _em_paralelo(4, lambda: sf.do("k", falha))
+
+        assert chamadas["n"] == 1
+        assert resultados == []
+        assert len(erros) == 4 and all(isinstance(e, ValueError) for e in erros)
+
+    def test_chaves_diferentes_nao_sao_coalescidas(self):
+        sf = SingleFlight("teste")
+        assert sf.do("a", lambda: 1) == 1
+        assert sf.do("b", lambda: 2) == 2
+
+    def test_aguarda_resultado_de_outro_worker(self):
+        sf = SingleFlight("teste", espera_max=2, intervalo=0.01)
+
+        # Outro worker detém o lock e publica o resultado logo depois
+        cache.add("sf:teste:lock:k", 1, 10)
+
+        def outro_worker():
+            time.sleep(0.1)
+            cache.set("sf:teste:resultado:k", ({"de": "outro"},), 5)
+            cache.delete("sf:teste:lock:k")
+
+        threading.Thread(target=outro_worker).start()
+
+        def nao_deveria_executar():
+            raise AssertionError("deveria usar o resultado do outro worker")
+
+        assert sf.do("k", nao_deveria_executar) == {"de": "outro"}
+
+    def test_executa_localmente_se_outro_worker_falhar(self):
+        sf = SingleFlight("teste", espera_max=2, intervalo=0.01)
+        cache.add("sf:teste:lock:k", 1, 10)
+
+        def outro_worker_falha():
+            time.sleep(0.05)
+            cache.delete("sf:teste:lock:k")
+
+        threading.Thread(target=outro_worker_falha).start()
+
+        assert sf.do("k", lambda: "local") == "local"
+
+    def test_resultado_none_e_publicado(self):
+        sf = SingleFlight("teste")
+        assert sf.do("k", lambda: None) is None
+        assert cache.get("sf:teste:resultado:k") == (None,)
+
+    def test_espera_por_outro_worker_limitada_pelo_prazo(self):
+        sf = SingleFlight("teste", espera_max=5, intervalo=0.01)
+        cache.add("sf:teste:lock:k", 1, 10)  # outro worker preso
+
+        inicio = time.monotonic()
+        with deadline.prazo(0.1), pytest.raises(deadline.PrazoEsgotadoError):
+            sf.do("k", lambda: "nao deveria executar")
+
+        assert time.monotonic() - inicio < 1
+
+    def test_espera_pelo_lider_no_mesmo_processo_limitada_pelo_prazo(self):
+        sf = SingleFlight("teste", espera_max=5)
+        liberar = threading.Event()
+        lider = threading.Thread(target=lambda: sf.do("k", lambda: liberar.wait(5)))
+        lider.start()
+        time.sleep(0.05)
+
+        inicio = time.monotonic()
+        try:
+            with deadline.prazo(0.1), pytest.raises(deadline.PrazoEsgotadoError):
+                sf.do("k", lambda: "nao deveria executar")
+            assert time.monotonic() - inicio < 1
+        finally:
+            liberar.set()
+            lider.join()
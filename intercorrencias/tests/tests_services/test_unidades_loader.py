@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+from intercorrencias.services.unidades_loader import UnidadesLoader, get_loader
+from intercorrencias.services.unidades_service import ExternalServiceError
+
+
+class TestUnidadesLoader:
+
+    @patch("intercorrencias.services.unidades_service.get_unidade")
+    @patch("intercorrencias.services.unidades_service.get_unidades_em_lote")
+    def test_registrados_sao_buscados_em_um_lote_e_memorizados(self, mock_lote, mock_get):
+        mock_lote.return_value = {"1": {"nome": "U1"}}
+        loader = UnidadesLoader()
+        loader.registrar("1", "2", None, "")
+
+        assert loader.get("1") == {"nome": "U1"}
+        assert loader.get("2") is None
+        assert loader.get(1) == {"nome": "U1"}
+
+        mock_lote.assert_called_once_with({"1", "2"})
+        mock_get.assert_not_called()
+
+    @patch("intercorrencias.services.unidades_service.get_unidade")
+    def test_codigo_isolado_usa_get_unidade(self, mock_get):
+        mock_get.return_value = {"nome": "U1"}
+        loader = UnidadesLoader()
+
+        assert loader.get("1") == {"nome": "U1"}
+        assert loader.get("1") == {"nome": "U1"}
+        mock_get.assert_called_once_with("1")
+
+    @patch("intercorrencias.services.unidades_service.get_unidades_em_lote")
+    def test_falha_do_servico_e_memorizada(self, mock_lote):
+        mock_lote.side_effect = ExternalServiceError("fora do ar")
+        loader = UnidadesLoader()
+        loader.registrar("1", "2")
+
+        for codigo in ("1", "2", "1"):
+            with pytest.raises(ExternalServiceError):
+                loader.get(codigo)
+        mock_lote.assert_called_once()
+
+
+class TestGetLoader:
+
+    def test_compartilhado_pela_requisicao(self):
+        request = MagicMock()
+        primeiro = get_loader({"request": request})
+        assert get_loader({"request": request}) is primeiro
+
+    def test_sem_requisicao_fica_no_contexto(self):
+        contexto = {}
+        loader = get_loader(contexto)
+        assert get_loader(contexto) is loader
+        assert get_loader({}) is not loader
@@ -1,16 +1,21 @@
+import time
+import threading
+
 import pytest
 import requests
 from unittest.mock import patch, MagicMock
 
 from django.conf import settings
+from django.db import connection
 
 from intercorrencias.services import unidades_service
+from intercorrencias.models.unidade import Unidade
 from intercorrencias.services.unidades_service import ExternalServiceError
 
 @pytest.mark.django_db
 class TestUnidadesService:
 
-    @patch("intercorrencias.services.unidades_service.requests.get")
+    @patch("intercorrencias.services.unidades_service.http_client.get")
     def test_get_unidade_sucesso(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -21,7 +26,7 @@ class TestUnidadesService:
         assert result == {"codigo_eol": "123", "dre_codigo_eol": "456"}
         mock_get.assert_called_once_with(f"{settings.UNIDADES_BASE_URL.rstrip('/')}/123/", timeout=3.0)
 
-    @patch("intercorrencias.services.unidades_service.requests.get")
+    @patch("intercorrencias.services.unidades_service.http_client.get")
     def test_get_unidade_404(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -30,7 +35,7 @@ class TestUnidadesService:
         result = unidades_service.get_unidade("123")
         assert result is None
 
-    @patch("intercorrencias.services.unidades_service.requests.get")
+    @patch("intercorrencias.services.unidades_service.http_client.get")
     def test_get_unidade_request_exception(self, mock_get):
         mock_get.side_effect = requests.RequestException("Erro de conexão")
 
@@ -38,11 +43,130 @@ class TestUnidadesService:
             unidades_service.get_unidade("123")
         assert "Falha ao consultar unidade" in str(exc.value)
 
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_get_unidade_consultas_simultaneas_sao_coalescidas(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"codigo_eol": "123", "dre_codigo_eol": "456"}
+
+        def lento(*args, **kwargs):
+            time.sleep(0.2)
+            return mock_response
+        mock_get.side_effect = lento
+
+        barreira = threading.Barrier(4)
+        resultados = []
+
+        def _consulta():
+            barreira.wait()
+            try:
+                resultados.append(unidades_service.get_unidade("123"))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=_consulta) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert resultados == [{"codigo_eol": "123", "dre_codigo_eol": "456"}] * 4
+        assert mock_get.call_count == 1
+
+
+def _resposta(status_code=200, data=None):
+    r = MagicMock()
+    r.status_code = status_code
+    r.json.return_value = data
+    if status_code >= 400 and status_code != 404:
+        r.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return r
+
+
+@pytest.fixture
+def revalidacao_sincrona(monkeypatch):
+    monkeypatch.setattr(unidades_service, "_executar_em_background", lambda fn: fn())
+
+
+@pytest.mark.django_db
+class TestUnidadesServiceCache:
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_segunda_consulta_usa_cache(self, mock_get):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "EMEF A"})
+
+        assert unidades_service.get_unidade("123")["nome"] == "EMEF A"
+        assert unidades_service.get_unidade("123")["nome"] == "EMEF A"
+        assert mock_get.call_count == 1
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_cache_compartilhado_entre_workers(self, mock_get):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "EMEF A"})
+        unidades_service.get_unidade("123")
+
+        unidades_service.unidades_cache.limpar_local()
+        assert unidades_service.get_unidade("123")["nome"] == "EMEF A"
+        assert mock_get.call_count == 1
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_404_e_armazenado_como_entrada_negativa(self, mock_get):
+        mock_get.return_value = _resposta(404)
+
+        assert unidades_service.get_unidade("999") is None
+        assert unidades_service.get_unidade("999") is None
+        assert mock_get.call_count == 1
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_entrada_vencida_e_servida_e_revalidada(self, mock_get, settings, revalidacao_sincrona):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "Antigo"})
+        unidades_service.get_unidade("123")
+
+        settings.UNIDADES_CACHE_TTL = 0
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "Novo"})
+
+        # Valor vencido é devolvido imediatamente; a revalidação atualiza o cache
+        assert unidades_service.get_unidade("123")["nome"] == "Antigo"
+        settings.UNIDADES_CACHE_TTL = 3600
+        assert unidades_service.get_unidade("123")["nome"] == "Novo"
+        assert mock_get.call_count == 2
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_servico_fora_serve_ultimo_valor_conhecido(self, mock_get, settings, revalidacao_sincrona):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "EMEF A"})
+        unidades_service.get_unidade("123")
+
+        settings.UNIDADES_CACHE_TTL = 0
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+
+        assert unidades_service.get_unidade("123")["nome"] == "EMEF A"
+        assert unidades_service.get_unidade("123")["nome"] == "EMEF A"
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_servico_fora_sem_cache_gera_erro(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        with pytest.raises(ExternalServiceError):
+            unidades_service.get_unidade("123")
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_revalidacao_usa_valor_ja_atualizado_por_outro_worker(self, mock_get, settings, revalidacao_sincrona):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "Antigo"})
+        unidades_service.get_unidade("123")
+
+        # Outro worker já gravou um valor novo no cache compartilhado
+        unidades_service.unidades_cache.l1.set(
+            "123", {"valor": {"codigo_eol": "123", "nome": "Antigo"}, "atualizado_em": 0}
+        )
+        settings.UNIDADES_CACHE_TTL = 3600
+
+        assert unidades_service.get_unidade("123")["nome"] == "Antigo"
+        assert unidades_service.get_unidade("123")["nome"] == "Antigo"
+        assert mock_get.call_count == 1
+
 
 @pytest.mark.django_db
 class TestUnidadesServiceLote:
 
-    @patch("intercorrencias.services.unidades_service.requests.post")
+    @patch("intercorrencias.services.unidades_service.http_client.post")
     def test_get_unidades_em_lote_sucesso(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -64,7 +188,7 @@ class TestUnidadesServiceLote:
             timeout=5.0
         )
 
-    @patch("intercorrencias.services.unidades_service.requests.post")
+    @patch("intercorrencias.services.unidades_service.http_client.post")
     def test_get_unidades_em_lote_request_exception(self, mock_post):
         mock_post.side_effect = requests.RequestException("Erro de conexão")
 
@@ -75,4 +199,190 @@ class TestUnidadesServiceLote:
 
     def test_get_unidades_em_lote_vazio(self):
         result = unidades_service.get_unidades_em_lote(set())
-        assert result == {}
\ No newline at end of file
+        assert result == {}
+
+@pytest.mark.django_db
+class TestUnidadesServiceLoteCache:
+
+    @staticmethod
+    def _batch(json, timeout):
+        codigos = json["codigos"]
+        return _resposta(data={c: {"codigo_eol": c, "nome": f"U{c}"} for c in codigos if c != "000"})
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_regime_permanente_sem_chamadas(self, mock_post):
+        mock_post.side_effect = lambda url, json, timeout: self._batch(json, timeout)
+        codigos = {str(c) for c in range(100, 400)}
+
+        primeiro = unidades_service.get_unidades_em_lote(codigos)
+        mock_post.reset_mock()
+        segundo = unidades_service.get_unidades_em_lote(codigos)
+
+        assert primeiro == segundo
+        assert len(segundo) == 300
+        mock_post.assert_not_called()
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_busca_apenas_codigos_fora_do_cache(self, mock_get, mock_post):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "U123"})
+        unidades_service.get_unidade("123")
+        mock_post.side_effect = lambda url, json, timeout: self._batch(json, timeout)
+
+        result = unidades_service.get_unidades_em_lote({"123", "456"})
+
+        assert set(result) == {"123", "456"}
+        assert mock_post.call_args.kwargs["json"] == {"codigos": ["456"]}
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_divide_em_blocos(self, mock_post, settings):
+        settings.UNIDADES_BATCH_CHUNK_SIZE = 2
+        mock_post.side_effect = lambda url, json, timeout: self._batch(json, timeout)
+
+        result = unidades_service.get_unidades_em_lote({"1", "2", "3", "4", "5"})
+
+        assert set(result) == {"1", "2", "3", "4", "5"}
+        assert mock_post.call_count == 3
+        assert all(len(c.kwargs["json"]["codigos"]) <= 2 for c in mock_post.call_args_list)
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_codigo_inexistente_fica_em_cache_negativo(self, mock_post):
+        mock_post.side_effect = lambda url, json, timeout: self._batch(json, timeout)
+
+        assert unidades_service.get_unidades_em_lote({"000", "123"}) == {
+            "123": {"codigo_eol": "123", "nome": "U123"}
+        }
+        assert unidades_service.get_unidades_em_lote({"000"}) == {}
+        assert mock_post.call_count == 1
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_resultado_do_lote_atende_get_unidade(self, mock_post, mock_get):
+        mock_post.side_effect = lambda url, json, timeout: self._batch(json, timeout)
+        unidades_service.get_unidades_em_lote({"123"})
+
+        assert unidades_service.get_unidade("123") == {"codigo_eol": "123", "nome": "U123"}
+        mock_get.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestUnidadesServiceEspelhoLocal:
+
+    @pytest.fixture(autouse=True)
+    def _espelho(self):
+        Unidade.objects.create(codigo_eol="123", nome="EMEF Local", dre_codigo_eol="108100", tipo="EMEF")
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_get_unidade_le_espelho_sem_rede(self, mock_get):
+        assert unidades_service.get_unidade("123") == {
+            "codigo_eol": "123",
+            "nome": "EMEF Local",
+            "dre_codigo_eol": "108100",
+            "tipo_unidade": "EMEF",
+        }
+        mock_get.assert_not_called()
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_get_unidade_desconhecida_vai_ao_servico(self, mock_get):
+        mock_get.return_value = _resposta(data={"codigo_eol": "999", "nome": "Remota"})
+        assert unidades_service.get_unidade("999")["nome"] == "Remota"
+        mock_get.assert_called_once()
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_lote_busca_no_servico_apenas_codigos_desconhecidos(self, mock_post):
+        mock_post.return_value = _resposta(data={"999": {"codigo_eol": "999", "nome": "Remota"}})
+
+        result = unidades_service.get_unidades_em_lote({"123", "999"})
+
+        assert result["123"]["nome"] == "EMEF Local"
+        assert result["999"]["nome"] == "Remota"
+        assert mock_post.call_args.kwargs["json"] == {"codigos": ["999"]}
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_lote_todo_no_espelho_nao_chama_servico(self, mock_post):
+        assert set(unidades_service.get_unidades_em_lote({"123"})) == {"123"}
+        mock_post.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSincronizarUnidades:
+
+    def test_upsert_insere_e_atualiza(self):
+        Unidade.objects.create(codigo_eol="123", nome="Nome antigo")
+
+        total = unidades_service.sincronizar_unidades([
+            {"codigo_eol": "123", "nome": "Nome novo", "dre": {"codigo_eol": "108100"}, "tipo_unidade": "EMEF"},
+            {"codigo_eol": "456", "nome": "CEI", "dre_codigo_eol": "108200", "tipo": "CEI"},
+            {"nome": "sem código"},
+        ], tamanho_lote=1)
+
+        assert total == 2
+        u = Unidade.objects.get(codigo_eol="123")
+        assert (u.nome, u.dre_codigo_eol, u.tipo) == ("Nome novo", "108100", "EMEF")
+        assert Unidade.objects.get(codigo_eol="456").tipo == "CEI"
+
+    def test_codigo_repetido_no_lote(self):
+        total = unidades_service.sincronizar_unidades([
+            {"codigo_eol": "123", "nome": "A"},
+            {"codigo_eol": "123", "nome": "B"},
+        ])
+        assert total == 1
+        assert Unidade.objects.get().nome == "B"
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_listar_unidades_segue_paginacao(self, mock_get):
+        mock_get.side_effect = [
+            _resposta(data={"results": [{"codigo_eol": "1"}], "next": "http://b/?page=2"}),
+            _resposta(data={"results": [{"codigo_eol": "2"}], "next": None}),
+        ]
+        assert [u["codigo_eol"] for u in unidades_service.listar_unidades()] == ["1", "2"]
+        assert mock_get.call_args.args[0] == "http://b/?page=2"
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_listar_unidades_resposta_em_lista(self, mock_get):
+        mock_get.return_value = _resposta(data=[{"codigo_eol": "1"}])
+        assert list(unidades_service.listar_unidades()) == [{"codigo_eol": "1"}]
+
+
+@pytest.mark.django_db
+class TestUnidadesServiceCircuito:
+
+    @pytest.fixture(autouse=True)
+    def _circuito(self, settings):
+        settings.CIRCUIT_BREAKER_FAILURES = 2
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_circuito_aberto_falha_sem_chamar_o_servico(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        for codigo in ("1", "2"):
+            with pytest.raises(ExternalServiceError):
+                unidades_service.get_unidade(codigo)
+        mock_get.reset_mock()
+
+        with pytest.raises(ExternalServiceError, match="aberto"):
+            unidades_service.get_unidade("3")
+        mock_get.assert_not_called()
+
+    @patch("intercorrencias.services.unidades_service.http_client.get")
+    def test_circuito_aberto_serve_valor_em_cache(self, mock_get, settings, revalidacao_sincrona):
+        mock_get.return_value = _resposta(data={"codigo_eol": "123", "nome": "Antigo"})
+        unidades_service.get_unidade("123")
+
+        settings.UNIDADES_CACHE_TTL = 0
+        mock_get.side_effect = requests.ConnectionError("fora do ar")
+        for _ in range(2):
+            assert unidades_service.get_unidade("123")["nome"] == "Antigo"
+        mock_get.reset_mock()
+
+        assert unidades_service.circuito.estado() == "aberto"
+        assert unidades_service.get_unidade("123")["nome"] == "Antigo"
+        mock_get.assert_not_called()
+
+    @patch("intercorrencias.services.unidades_service.http_client.post")
+    def test_lote_respostas_5xx_abrem_o_circuito(self, mock_post):
+        mock_post.return_value = _resposta(status_code=503)
+        for codigos in ({"1", "2"}, {"3", "4"}):
+            with pytest.raises(ExternalServiceError):
+                unidades_service.get_unidades_em_lote(codigos)
+
+        assert unidades_service.circuito.estado() == "aberto"
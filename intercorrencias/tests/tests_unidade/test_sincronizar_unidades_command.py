@@ -0,0 +1,49 @@
+import pytest
+import requests
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from intercorrencias.models.unidade import Unidade
+
+pytestmark = pytest.mark.django_db
+
+
+def _resposta(data):
+    r = MagicMock()
+    r.status_code = 200
+    r.json.return_value = data
+    return r
+
+
+@patch("intercorrencias.services.unidades_service.http_client.get")
+def test_sincroniza_catalogo_completo(mock_get):
+    mock_get.return_value = _resposta([
+        {"codigo_eol": "1", "nome": "U1", "dre_codigo_eol": "9"},
+        {"codigo_eol": "2", "nome": "U2", "dre_codigo_eol": "9"},
+    ])
+    out = StringIO()
+
+    call_command("sincronizar_unidades", stdout=out)
+
+    assert Unidade.objects.count() == 2
+    assert "2 unidade(s) sincronizada(s)." in out.getvalue()
+
+
+@patch("intercorrencias.services.unidades_service.http_client.post")
+def test_sincroniza_codigos_informados(mock_post):
+    mock_post.return_value = _resposta({"1": {"codigo_eol": "1", "nome": "U1"}})
+
+    call_command("sincronizar_unidades", "--codigos", "1", "2", stdout=StringIO())
+
+    assert list(Unidade.objects.values_list("codigo_eol", flat=True)) == ["1"]
+    assert mock_post.call_args.kwargs["json"] == {"codigos": ["1", "2"]}
+
+
+@patch("intercorrencias.services.unidades_service.http_client.get")
+def test_falha_no_servico_gera_command_error(mock_get):
+    mock_get.side_effect = requests.ConnectionError("fora do ar")
+    with pytest.raises(CommandError):
+        call_command("sincronizar_unidades", stdout=StringIO())
@@ -0,0 +1,19 @@
+import pytest
+from intercorrencias.models.unidade import Unidade
+
+pytestmark = pytest.mark.django_db
+
+def test_criar_unidade():
+    unidade = Unidade.objects.create(codigo_eol="123456", nome="EMEF Teste", dre_codigo_eol="108100", tipo="EMEF")
+    assert str(unidade) == "123456 - EMEF Teste"
+    assert unidade.como_dict() == {
+        "codigo_eol": "123456",
+        "nome": "EMEF Teste",
+        "dre_codigo_eol": "108100",
+        "tipo_unidade": "EMEF",
+    }
+
+def test_codigo_eol_deve_ser_unico():
+    Unidade.objects.create(codigo_eol="123456", nome="A")
+    with pytest.raises(Exception):
+        Unidade.objects.create(codigo_eol="123456", nome="B")